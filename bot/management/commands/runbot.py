@@ -1,11 +1,24 @@
-from typing import Callable, Any
+import asyncio
+import signal
+import time
+from typing import Callable, Any, ContextManager, TypeVar
+from django.conf import settings
 from django.core.management import BaseCommand
+from django.db import InterfaceError, OperationalError, close_old_connections, connection
 
 from pydantic import BaseModel
 from bot.models import TgUser
+from bot.runner import BotRunner
 from bot.tg.client import TgClient
 from bot.tg.schemas import Message
 from goals.models import Goal, GoalCategory
+from todolist.db_router import use_replica
+
+DB_RETRY_DELAY = 1
+DB_RETRY_MAX_DELAY = 30
+DB_RETRY_ATTEMPTS = 5
+
+T = TypeVar("T")
 
 
 class FSMData(BaseModel):
@@ -21,19 +34,69 @@ class Command(BaseCommand):
         super().__init__(*args, **kwargs)
         self.tg_client = TgClient()
         self.clients: dict[int, FSMData] = {}
+        # Время последней записи по чату: после нее чтения чата идут в основную базу REPLICA_PIN_SECONDS секунд
+        self.written_at: dict[int, float] = {}
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=settings.BOT_WORKERS)
+        parser.add_argument("--max-pending", type=int, default=settings.BOT_MAX_PENDING)
 
     def handle(self, *args, **options):
-        offset = 0
+        runner = BotRunner(self.tg_client, self.handle_update, options["workers"], options["max_pending"])
 
         self.stdout.write(self.style.SUCCESS("Bot is running!"))
-        while True:
-            res = self.tg_client.get_updates(offset=offset)
-            for item in res.result:
-                offset = item.update_id + 1
-                self.handle_message(item.message)
+        asyncio.run(self.run_until_signal(runner))
+        self.stdout.write(self.style.SUCCESS("Bot is stopped"))
+
+    @staticmethod
+    async def run_until_signal(runner: BotRunner) -> None:
+        """
+        Запускает бота до SIGTERM или SIGINT: после сигнала новые обновления не запрашиваются,
+        а уже полученные сообщения обрабатываются до конца
+        """
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, runner.stop)
+        await runner.run()
+
+    def handle_update(self, msg: Message):
+        """
+        Обрабатывает сообщение как отдельный запрос: после обработки закрываются устаревшие
+        и сломанные соединения с базой. Если база так и не стала доступна (см. run_db),
+        сообщение пропускается, чтобы не задерживать следующие сообщения чата
+        """
+        try:
+            self.handle_message(msg)
+        except (OperationalError, InterfaceError) as error:
+            self.stderr.write(f"Database unavailable, message from chat {msg.chat.id} dropped: {error}")
+        finally:
+            close_old_connections()
+
+    def run_db(self, operation: Callable[[], T], idempotent: bool = True) -> T:
+        """
+        Выполняет шаг работы с базой, отправка сообщений в Telegram в него не входит. Если база
+        недоступна (например, перезапускается), шаг повторяется с растущей паузой, всего
+        DB_RETRY_ATTEMPTS попыток. Неидемпотентная запись повторяется только до подключения к базе:
+        после отправки запроса неизвестно, зафиксирована ли она, и повтор мог бы ее продублировать
+        """
+        delay = DB_RETRY_DELAY
+        for attempt in range(1, DB_RETRY_ATTEMPTS + 1):
+            close_old_connections()
+            try:
+                if idempotent:
+                    return operation()
+                connection.ensure_connection()
+                break
+            except (OperationalError, InterfaceError) as error:
+                if attempt == DB_RETRY_ATTEMPTS:
+                    raise
+                self.stderr.write(f"Database unavailable, retrying in {delay} s: {error}")
+                time.sleep(delay)
+                delay = min(delay * 2, DB_RETRY_MAX_DELAY)
+        return operation()
 
     def handle_message(self, msg: Message):
-        tg_user, _ = TgUser.objects.get_or_create(chat_id=msg.chat.id)
+        tg_user, _ = self.run_db(lambda: TgUser.objects.get_or_create(chat_id=msg.chat.id))
 
         if tg_user.is_verified:
             self.handle_authorized_user(tg_user, msg)
@@ -41,8 +104,8 @@ class Command(BaseCommand):
             self.handle_unauthorized_user(tg_user, msg)
 
     def handle_unauthorized_user(self, tg_user: TgUser, msg: Message):
+        self.run_db(tg_user.update_verification_code)
         self.tg_client.send_message(tg_user.chat_id, "Hello there!")
-        tg_user.update_verification_code()
         self.tg_client.send_message(tg_user.chat_id, f"Your verification code: {tg_user.verification_code}")
 
     def handle_authorized_user(self, tg_user: TgUser, msg: Message):
@@ -63,9 +126,17 @@ class Command(BaseCommand):
         else:
             self.tg_client.send_message(chat_id=msg.chat.id, text="Command not found!\n/goals\n/create\n/cancel")
 
+    def read_from_replica(self, chat_id: int) -> ContextManager[None]:
+        written_at = self.written_at.get(chat_id)
+        return use_replica(written_at is None or time.monotonic() - written_at > settings.REPLICA_PIN_SECONDS)
+
     def handle_goals_command(self, tg_user: TgUser, msg: Message):
-        goals = Goal.objects.exclude(status=Goal.Status.archived).filter(
-            user=tg_user.user)
+        def read_goals() -> list[Goal]:
+            with self.read_from_replica(tg_user.chat_id):
+                return list(Goal.objects.exclude(status=Goal.Status.archived).filter(
+                    user_id=tg_user.user_id, category__is_deleted=False, board__is_deleted=False))
+
+        goals = self.run_db(read_goals)
         if goals:
             text = "Your goals:\n" + "\n".join([f"{goal.id} {goal.title}" for goal in goals])
         else:
@@ -74,7 +145,14 @@ class Command(BaseCommand):
         self.tg_client.send_message(tg_user.chat_id, text)
 
     def handle_create_command(self, tg_user: TgUser, msg: Message):
-        categories = GoalCategory.objects.filter(user=tg_user.user).exclude(is_deleted=True)
+        def read_categories() -> list[GoalCategory]:
+            with self.read_from_replica(tg_user.chat_id):
+                return list(
+                    GoalCategory.objects.filter(user_id=tg_user.user_id, board__is_deleted=False)
+                    .exclude(is_deleted=True)
+                )
+
+        categories = self.run_db(read_categories)
         if not categories:
             self.tg_client.send_message(tg_user.chat_id, "You have not categories!")
             return
@@ -84,8 +162,12 @@ class Command(BaseCommand):
         self.clients[tg_user.chat_id] = FSMData(next_handler=self._get_category)
 
     def _get_category(self, tg_user: TgUser, msg: Message):
+        def read_category() -> GoalCategory:
+            with self.read_from_replica(tg_user.chat_id):
+                return GoalCategory.objects.get(pk=msg.text)
+
         try:
-            category = GoalCategory.objects.get(pk=msg.text)
+            category = self.run_db(read_category)
         except GoalCategory.DoesNotExist:
             self.tg_client.send_message(chat_id=msg.chat.id, text="Category not exists!")
             return
@@ -95,6 +177,7 @@ class Command(BaseCommand):
 
     def _create_goal(self, tg_user: TgUser, msg: Message, **kwargs):
         category = kwargs["category"]
-        Goal.objects.create(category=category, user=tg_user.user, title=msg.text)
+        self.run_db(lambda: Goal.objects.create(category=category, user=tg_user.user, title=msg.text), idempotent=False)
+        self.written_at[tg_user.chat_id] = time.monotonic()
         self.tg_client.send_message(chat_id=msg.chat.id, text="New goal created")
         self.clients.pop(tg_user.chat_id, None)
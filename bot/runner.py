@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import requests
+from django.db import connections
+
+from bot.tg.client import TgClient
+from bot.tg.schemas import Message, UpdateObj
+
+logger = logging.getLogger(__name__)
+
+POLL_RETRY_DELAY = 1
+POLL_RETRY_MAX_DELAY = 30
+
+
+class BotRunner:
+    """
+    Цикл бота на asyncio: обновления получаются long polling, сообщения обрабатываются
+    параллельно в пуле из workers потоков (ORM и клиент Telegram блокирующие), поэтому медленный чат
+    не задерживает остальные. Сообщения одного чата обрабатываются строго по очереди: обработка
+    каждого ждет завершения предыдущего сообщения того же чата. Пока в обработке max_pending
+    сообщений, новые обновления не запрашиваются
+    """
+    def __init__(
+        self,
+        tg_client: TgClient,
+        handler: Callable[[Message], None],
+        workers: int,
+        max_pending: int,
+        poll_timeout: int = 60,
+    ) -> None:
+        self.tg_client = tg_client
+        self.handler = handler
+        self.workers = workers
+        self.max_pending = max_pending
+        self.poll_timeout = poll_timeout
+        self.offset = 0
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: asyncio.Semaphore | None = None
+        self._stopped = asyncio.Event()
+        # Последняя задача каждого чата, следующее сообщение чата ждет ее завершения
+        self._tails: dict[int, asyncio.Task] = {}
+
+    async def run(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bot-worker')
+        self._pending = asyncio.Semaphore(self.max_pending)
+        try:
+            await self._poll()
+            await asyncio.gather(*self._tails.values())
+        finally:
+            await self._close_connections()
+            self._executor.shutdown()
+
+    def stop(self) -> None:
+        """
+        Останавливает получение обновлений, run завершится после обработки уже полученных сообщений.
+        Новые обновления не запрашиваются, но уже начатый getUpdates дожидается ответа (до poll_timeout)
+        """
+        self._stopped.set()
+
+    async def _poll(self) -> None:
+        loop = asyncio.get_running_loop()
+        delay = POLL_RETRY_DELAY
+        while not self._stopped.is_set():
+            try:
+                # getUpdates выполняется в отдельном потоке по умолчанию, чтобы не занимать обработчики
+                response = await loop.run_in_executor(
+                    None, lambda: self.tg_client.get_updates(offset=self.offset, timeout=self.poll_timeout)
+                )
+            except requests.RequestException as error:
+                logger.warning('Failed to get updates, retrying in %s s: %s', delay, error)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, POLL_RETRY_MAX_DELAY)
+                continue
+            delay = POLL_RETRY_DELAY
+
+            for update in response.result:
+                await self._pending.acquire()
+                self._dispatch(update)
+                # Telegram считает обновление полученным после следующего getUpdates, поэтому
+                # при аварийной остановке теряются только сообщения, которые были в обработке
+                self.offset = update.update_id + 1
+
+    def _dispatch(self, update: UpdateObj) -> None:
+        chat_id = update.message.chat.id
+        task = asyncio.create_task(self._process(update, self._tails.get(chat_id)))
+        self._tails[chat_id] = task
+        task.add_done_callback(lambda done: self._finished(chat_id, done))
+
+    def _finished(self, chat_id: int, task: asyncio.Task) -> None:
+        self._pending.release()
+        if self._tails.get(chat_id) is task:
+            del self._tails[chat_id]
+
+    async def _process(self, update: UpdateObj, previous: asyncio.Task | None) -> None:
+        if previous is not None:
+            await asyncio.wait([previous])
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self.handler, update.message)
+        except Exception:
+            logger.exception('Failed to handle update %s', update.update_id)
+
+    async def _close_connections(self) -> None:
+        """
+        Закрывает соединения с базой во всех потоках пула: задачи ждут друг друга на барьере,
+        поэтому каждая выполняется в своем потоке
+        """
+        barrier = threading.Barrier(self.workers)
+
+        def close() -> None:
+            barrier.wait()
+            connections.close_all()
+
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, close) for _ in range(self.workers)))
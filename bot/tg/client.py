@@ -5,23 +5,27 @@ from pydantic import ValidationError
 from bot.tg.schemas import GetUpdatesResponse, SendMessageResponse
 from todolist import settings
 
+# Таймаут HTTP-запросов к Telegram, для getUpdates - сверх времени long polling
+REQUEST_TIMEOUT = 10
+
 
 class TgClient:
     """
     Класс с методами для управления Telegram ботом
     """
-    def __init__(self, token: str | None = None) -> None:
+    def __init__(self, token: str | None = None, api_url: str | None = None) -> None:
         """
-        Инициализация класса TgClient через токен
+        Инициализация класса TgClient через токен и адрес Bot API
         """
         self.__token = token if token else settings.BOT_TOKEN
-        self.__base_url = f"https://api.telegram.org/bot{self.__token}/"
+        api_url = api_url if api_url else settings.TELEGRAM_API_URL
+        self.__base_url = f"{api_url.rstrip('/')}/bot{self.__token}/"
 
     def get_updates(self, offset: int = 0, timeout: int = 60) -> GetUpdatesResponse:
         """
         Получение ботом сообщений от пользователя
         """
-        data = self._get("getUpdates", offset=offset, timeout=timeout)
+        data = self._get("getUpdates", request_timeout=timeout + REQUEST_TIMEOUT, offset=offset, timeout=timeout)
         print(data)
         return GetUpdatesResponse(**data)
 
@@ -38,9 +42,9 @@ class TgClient:
         """
         return f"{self.__base_url}{method}"
 
-    def _get(self, command: str, **params: Any) -> dict:
+    def _get(self, command: str, request_timeout: float = REQUEST_TIMEOUT, **params: Any) -> dict:
         url = self.__get_url(command)
-        response = requests.get(url, params=params)
+        response = requests.get(url, params=params, timeout=request_timeout)
         if not response.ok:
             print(f"Invalid status code from Telegram {response.status_code} on command {command}")
             return {"ok": False, "result": []}
@@ -14,6 +14,7 @@ class VerificationCodeView(generics.GenericAPIView):
     Представление для верификации пользователя Telegram
     """
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'bot_verify'
     serializer_class = TgUserSerializer
 
     def patch(self, request: Request, *args: Any, **kwargs: Any) -> Response:
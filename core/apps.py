@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.conf import settings
+
+from todolist.caches import require_shared_cache
+
+CACHED_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+)
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        import core.cache  # noqa: F401 регистрирует обработчики сигналов
+
+        require_shared_cache(settings.JWT_REVOCATION_CACHE_ALIAS, 'revoked tokens')
+        require_shared_cache(settings.THROTTLE_CACHE_ALIAS, 'rate limit buckets')
+        if settings.SESSION_ENGINE in CACHED_SESSION_ENGINES:
+            require_shared_cache(settings.SESSION_CACHE_ALIAS, 'sessions')
@@ -0,0 +1,31 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+
+from core.models import User
+from core.tokens import ACCESS, InvalidToken, decode_token, user_from_payload
+
+
+class JWTAuthentication(BaseAuthentication):
+    """
+    Аутентификация по access-токену из заголовка "Authorization: Bearer <token>".
+    Токен проверяется без обращения к базе, CSRF не требуется
+    """
+    keyword = 'Bearer'
+
+    def authenticate(self, request: Request) -> tuple[User, dict] | None:
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed(_('Invalid token header.'))
+
+        try:
+            payload = decode_token(auth[1].decode(), ACCESS)
+        except (InvalidToken, UnicodeError) as error:
+            raise AuthenticationFailed(str(error))
+        return user_from_payload(payload), payload
+
+    def authenticate_header(self, request: Request) -> str:
+        return self.keyword
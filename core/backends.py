@@ -0,0 +1,25 @@
+from django.contrib.auth.backends import ModelBackend
+
+from core import hashing
+from core.models import User
+
+
+class HashOffloadModelBackend(ModelBackend):
+    """
+    ModelBackend, который проверяет пароль в ограниченном пуле хеширования (core/hashing.py)
+    """
+    def authenticate(self, request, username=None, password=None, **kwargs) -> User | None:
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            # Хеш считается и для несуществующего пользователя, чтобы время ответа
+            # не выдавало, есть ли такой пользователь
+            hashing.make_password(password)
+            return None
+        if hashing.check_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
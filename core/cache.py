@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.auth.signals import user_logged_out
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import HttpRequest
+from django.utils.crypto import constant_time_compare
+
+from core.models import User
+
+
+def auth_cache() -> BaseCache:
+    return caches[settings.AUTH_CACHE_ALIAS]
+
+
+def _user_key(user_id: int) -> str:
+    return f'auth:user:{user_id}'
+
+
+def get_cached_user(request: HttpRequest) -> User | AnonymousUser:
+    """
+    Пользователь текущей сессии из кеша AUTH_CACHE_ALIAS. Хеш пароля в сессии сверяется
+    с закешированным пользователем, при промахе или несовпадении пользователь загружается
+    и проверяется стандартным django.contrib.auth.get_user
+    """
+    user_id = request.session.get(SESSION_KEY)
+    if user_id is None or request.session.get(BACKEND_SESSION_KEY) not in settings.AUTHENTICATION_BACKENDS:
+        return auth.get_user(request)
+
+    key = _user_key(user_id)
+    user = auth_cache().get(key)
+    if user is not None and constant_time_compare(request.session.get(HASH_SESSION_KEY), user.get_session_auth_hash()):
+        return user
+
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        auth_cache().set(key, user)
+    return user
+
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Сбрасывает закешированного пользователя сразу и повторно после фиксации текущей транзакции
+    """
+    key = _user_key(user_id)
+    auth_cache().delete(key)
+    transaction.on_commit(lambda: auth_cache().delete(key))
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance: User, **kwargs) -> None:
+    invalidate_user(instance.id)
+
+
+@receiver(user_logged_out)
+def user_logged_out_handler(sender, request: HttpRequest, user: User | None, **kwargs) -> None:
+    if user is not None:
+        invalidate_user(user.id)
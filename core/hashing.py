@@ -0,0 +1,64 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import Throttled
+
+from core.models import User
+
+T = TypeVar('T')
+
+
+class PasswordHashingBusy(Throttled):
+    default_detail = _('Too many password operations in progress, try again later.')
+
+
+class HashExecutor:
+    """
+    Ограниченный пул потоков для вычисления хешей паролей (PBKDF2 освобождает GIL).
+    Одновременно считается не больше workers хешей, еще queue_size операций ждут в очереди,
+    остальные сразу отклоняются с ошибкой 429, не занимая процессор
+    """
+    def __init__(self, workers: int, queue_size: int) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if not self.slots.acquire(blocking=False):
+            raise PasswordHashingBusy(wait=settings.PASSWORD_HASH_RETRY_AFTER)
+        try:
+            return self.executor.submit(fn, *args).result()
+        finally:
+            self.slots.release()
+
+
+_executor: HashExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> HashExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = HashExecutor(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_SIZE)
+        return _executor
+
+
+def make_password(password: str) -> str:
+    return get_executor().run(hashers.make_password, password)
+
+
+def check_password(user: User, password: str) -> bool:
+    """
+    Проверяет пароль пользователя в пуле хеширования. Хеш устаревшего формата
+    пересчитывается и сохраняется, как это делает User.check_password
+    """
+    if not get_executor().run(hashers.check_password, password, user.password):
+        return False
+    if hashers.identify_hasher(user.password).must_update(user.password):
+        user.password = make_password(password)
+        user.save(update_fields=['password'])
+    return True
@@ -0,0 +1,34 @@
+from typing import Callable
+
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.http import HttpRequest, HttpResponse
+from django.utils.functional import SimpleLazyObject
+
+from core.cache import get_cached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    AuthenticationMiddleware, которое берет request.user из кеша (см. core/cache.py),
+    а не загружает пользователя из базы на каждый запрос
+    """
+    def process_request(self, request: HttpRequest) -> None:
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Добавляет к ответу заголовки RateLimit-Limit, RateLimit-Remaining и RateLimit-Reset
+    по самому строгому из ограничений, проверенных для запроса (см. core/throttling.py)
+    """
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
+        if rate_limit := getattr(request, 'rate_limit', None):
+            response.headers['RateLimit-Limit'] = str(rate_limit.limit)
+            response.headers['RateLimit-Remaining'] = str(rate_limit.remaining)
+            response.headers['RateLimit-Reset'] = str(rate_limit.reset)
+        return response
@@ -0,0 +1,52 @@
+# Generated by Django 4.2 on 2026-10-18 18:53
+
+from django.db import migrations, models
+
+# Данные пользователя, которые встраиваются в ответы, меняются редко, поэтому их версия - одна строка
+# (создается при первом изменении), обновляемая в той же транзакции, что и пользователь: ETag
+# не может смениться раньше, чем изменения станут видны. Вход и смена пароля эти поля не затрагивают
+# и версию не меняют
+USER_DATA_VERSION_TRIGGER = """
+CREATE FUNCTION core_user_data_version_bump() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO core_userdataversion AS data (id, version) VALUES (1, 1)
+    ON CONFLICT (id) DO UPDATE SET version = data.version + 1;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_user_data_version_bump AFTER UPDATE ON core_user
+    FOR EACH ROW
+    WHEN (
+        OLD.username IS DISTINCT FROM NEW.username OR OLD.first_name IS DISTINCT FROM NEW.first_name
+        OR OLD.last_name IS DISTINCT FROM NEW.last_name OR OLD.email IS DISTINCT FROM NEW.email
+    )
+    EXECUTE FUNCTION core_user_data_version_bump();
+"""
+
+DROP_USER_DATA_VERSION_TRIGGER = """
+DROP TRIGGER IF EXISTS core_user_data_version_bump ON core_user;
+DROP FUNCTION IF EXISTS core_user_data_version_bump();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_alter_user_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserDataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=1, verbose_name='Версия')),
+            ],
+            options={
+                'verbose_name': 'Версия данных пользователей',
+                'verbose_name_plural': 'Версии данных пользователей',
+            },
+        ),
+        migrations.RunSQL(USER_DATA_VERSION_TRIGGER, DROP_USER_DATA_VERSION_TRIGGER),
+    ]
@@ -1,4 +1,5 @@
 from django.contrib.auth.models import AbstractUser
+from django.db import models
 
 
 class User(AbstractUser):
@@ -11,3 +12,16 @@ class User(AbstractUser):
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
         ordering = ["username"]
+
+
+class UserDataVersion(models.Model):
+    """
+    Модель версии данных пользователей, которые встраиваются в ответы (имя, фамилия, username, email).
+    Единственная строка увеличивается триггером в базе при их изменении (см. миграцию
+    0004_userdataversion) и входит в ETag списков досок, категорий, целей и комментариев
+    """
+    version = models.PositiveBigIntegerField(verbose_name="Версия", default=1)
+
+    class Meta:
+        verbose_name = 'Версия данных пользователей'
+        verbose_name_plural = 'Версии данных пользователей'
@@ -1,9 +1,11 @@
 from django.contrib.auth import get_user_model, authenticate
-from django.contrib.auth.hashers import make_password
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated, ValidationError
 
+from core.hashing import check_password, make_password
+from core.tokens import REFRESH, InvalidToken, decode_token, revoke_user_tokens
+
 User_Model = get_user_model()
 
 
@@ -55,6 +57,7 @@ class LoginSerializer(serializers.ModelSerializer):
     """
     username = serializers.CharField(required=True)
     password = serializers.CharField(required=True)
+    mode = serializers.ChoiceField(choices=("session", "token"), default="session", write_only=True)
 
     def create(self, validated_data):
         if not (user := authenticate(
@@ -88,9 +91,10 @@ class UpdatePasswordSerializer(serializers.Serializer):
     new_password = serializers.CharField(required=True, write_only=True)
 
     def validate(self, attrs):
-        if not (user := attrs["user"]):
+        if not attrs["user"]:
             raise NotAuthenticated
-        if not user.check_password(attrs["old_password"]):
+        # Пароль сверяется с пользователем из базы: request.user может быть восстановлен из токена
+        if not check_password(self.instance, attrs["old_password"]):
             raise serializers.ValidationError({"old_password": "incorrect password"})
         return attrs
 
@@ -100,4 +104,18 @@ class UpdatePasswordSerializer(serializers.Serializer):
     def update(self, instance: user, validated_data):
         instance.password = make_password(validated_data["new_password"])
         instance.save(update_fields=["password"])
+        revoke_user_tokens(instance.id)
         return instance
+
+
+class TokenSerializer(serializers.Serializer):
+    """
+    Сериализатор проверки refresh-токена
+    """
+    refresh = serializers.CharField(required=True, write_only=True)
+
+    def validate_refresh(self, value: str) -> dict:
+        try:
+            return decode_token(value, REFRESH)
+        except InvalidToken as error:
+            raise AuthenticationFailed(str(error))
@@ -0,0 +1,143 @@
+import math
+import time
+from collections.abc import Mapping
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework.throttling import SimpleRateThrottle
+
+# Блокировка корзины на время ее обновления: срок жизни на случай падения процесса
+# и максимальное ожидание, после которого запрос отклоняется
+LOCK_TIMEOUT = 1
+LOCK_WAIT = 0.1
+
+
+class RateLimit(NamedTuple):
+    limit: int
+    remaining: int
+    reset: int
+
+
+def _record(request: Request, rate_limit: RateLimit) -> None:
+    """
+    Запоминает состояние самого строгого из ограничений запроса для заголовков RateLimit-*
+    (см. core.middleware.RateLimitHeadersMiddleware)
+    """
+    current = getattr(request._request, 'rate_limit', None)
+    if current is None or rate_limit.remaining < current.remaining:
+        request._request.rate_limit = rate_limit
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Ограничение частоты запросов по алгоритму token bucket. Скорость 'N/period' означает корзину
+    на N запросов (допустимый всплеск), которая пополняется на N токенов за period.
+    Состояние корзины хранится в кеше THROTTLE_CACHE_ALIAS
+    """
+    @property
+    def cache(self) -> BaseCache:
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def allow_request(self, request: Request, view) -> bool:
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        if not self._lock():
+            # Корзину все это время обновляют параллельные запросы того же клиента
+            self.tokens = 0
+            _record(request, RateLimit(self.num_requests, 0, math.ceil(self.wait())))
+            return self.throttle_failure()
+        try:
+            self.now = self.timer()
+            tokens, updated = self.cache.get(self.key, (self.num_requests, self.now))
+            self.tokens = min(self.num_requests, tokens + (self.now - updated) * self.num_requests / self.duration)
+            if self.tokens < 1:
+                _record(request, RateLimit(self.num_requests, 0, math.ceil(self.wait())))
+                return self.throttle_failure()
+
+            self.tokens -= 1
+            self.cache.set(self.key, (self.tokens, self.now), self.duration)
+        finally:
+            self.cache.delete(self._lock_key())
+        _record(request, RateLimit(self.num_requests, int(self.tokens), math.ceil(self._refill_time())))
+        return True
+
+    def _lock_key(self) -> str:
+        return f'{self.key}:lock'
+
+    def _lock(self) -> bool:
+        """
+        Захватывает корзину через атомарный cache.add, чтобы параллельные запросы (в том числе
+        из разных процессов при общем кеше) не прочитали одно и то же число токенов
+        """
+        deadline = time.monotonic() + LOCK_WAIT
+        while not self.cache.add(self._lock_key(), 1, timeout=LOCK_TIMEOUT):
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def wait(self) -> float:
+        # Время до появления следующего токена
+        return (1 - self.tokens) * self.duration / self.num_requests
+
+    def _refill_time(self) -> float:
+        # Время до полного пополнения корзины
+        return (self.num_requests - self.tokens) * self.duration / self.num_requests
+
+
+class ScopedUserThrottle(TokenBucketThrottle):
+    """
+    Ограничение запросов пользователя (анонимного - по IP-адресу) к группе представлений.
+    Группа задается атрибутом throttle_scope представления, по умолчанию 'read' для чтения
+    и 'write' для изменяющих запросов. Скорость группы берется из DEFAULT_THROTTLE_RATES
+    """
+    def __init__(self) -> None:
+        # Скорость зависит от группы представления и определяется в allow_request
+        pass
+
+    def allow_request(self, request: Request, view) -> bool:
+        self.scope = getattr(view, 'throttle_scope', None) or ('read' if request.method in SAFE_METHODS else 'write')
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request: Request, view) -> str:
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class AuthIPThrottle(TokenBucketThrottle):
+    """
+    Ограничение попыток входа и регистрации с одного IP-адреса
+    """
+    scope = 'auth_ip'
+
+    def get_cache_key(self, request: Request, view) -> str:
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class AuthUsernameThrottle(TokenBucketThrottle):
+    """
+    Ограничение попыток входа и регистрации для одного имени пользователя, с любых адресов
+    """
+    scope = 'auth_username'
+
+    def get_cache_key(self, request: Request, view) -> str | None:
+        if not isinstance(request.data, Mapping):
+            return None
+        username = request.data.get('username')
+        if not isinstance(username, str) or not username:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': username.lower()}
@@ -0,0 +1,110 @@
+import time
+import uuid
+from typing import Any
+
+import jwt
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+
+from core.models import User
+
+ACCESS = 'access'
+REFRESH = 'refresh'
+
+# Поля пользователя в access-токене: по ним request.user восстанавливается без запроса к базе
+USER_CLAIMS = ('username', 'first_name', 'last_name', 'email', 'is_staff', 'is_superuser')
+
+
+class InvalidToken(Exception):
+    pass
+
+
+def revocation_cache() -> BaseCache:
+    return caches[settings.JWT_REVOCATION_CACHE_ALIAS]
+
+
+def _revoked_key(jti: str) -> str:
+    return f'jwt:revoked:{jti}'
+
+
+def _not_before_key(user_id: int) -> str:
+    return f'jwt:not_before:{user_id}'
+
+
+def _encode(user: User, token_type: str, ttl: int, **claims: Any) -> str:
+    now = time.time()
+    payload = {
+        'sub': str(user.id),
+        'type': token_type,
+        'jti': uuid.uuid4().hex,
+        'iat': now,
+        'exp': int(now) + ttl,
+        **claims,
+    }
+    kid = settings.JWT_ACTIVE_KEY
+    return jwt.encode(
+        payload, settings.JWT_SIGNING_KEYS[kid], algorithm=settings.JWT_ALGORITHM, headers={'kid': kid}
+    )
+
+
+def issue_tokens(user: User) -> dict[str, str]:
+    """
+    Пара токенов: короткоживущий access с данными пользователя и refresh для получения новой пары
+    """
+    return {
+        ACCESS: _encode(
+            user, ACCESS, settings.JWT_ACCESS_TTL, **{claim: getattr(user, claim) for claim in USER_CLAIMS}
+        ),
+        REFRESH: _encode(user, REFRESH, settings.JWT_REFRESH_TTL),
+    }
+
+
+def decode_token(token: str, token_type: str) -> dict[str, Any]:
+    """
+    Проверяет подпись (ключ выбирается по kid из JWT_SIGNING_KEYS), срок действия, тип токена
+    и отзыв: отозванный jti или выпуск раньше отзыва всех токенов пользователя
+    """
+    try:
+        kid = jwt.get_unverified_header(token).get('kid')
+        key = settings.JWT_SIGNING_KEYS[kid]
+        payload = jwt.decode(
+            token, key, algorithms=[settings.JWT_ALGORITHM], options={'require': ['sub', 'jti', 'iat', 'exp']}
+        )
+    except (jwt.InvalidTokenError, KeyError) as error:
+        raise InvalidToken(str(error) or 'Unknown signing key')
+    if payload.get('type') != token_type:
+        raise InvalidToken('Wrong token type')
+
+    revoked = revocation_cache().get_many([_revoked_key(payload['jti']), _not_before_key(payload['sub'])])
+    if _revoked_key(payload['jti']) in revoked:
+        raise InvalidToken('Token revoked')
+    if payload['iat'] < revoked.get(_not_before_key(payload['sub']), 0):
+        raise InvalidToken('Token revoked')
+    return payload
+
+
+def user_from_payload(payload: dict[str, Any]) -> User:
+    """
+    Пользователь из access-токена. Экземпляр не загружается из базы, но подходит для проверок прав
+    и как значение внешнего ключа
+    """
+    user = User(id=int(payload['sub']), **{claim: payload[claim] for claim in USER_CLAIMS})
+    user._state.adding = False
+    return user
+
+
+def revoke_token(payload: dict[str, Any]) -> None:
+    """
+    Добавляет токен в список отозванных до истечения его срока действия
+    """
+    ttl = int(payload['exp'] - time.time())
+    if ttl > 0:
+        revocation_cache().set(_revoked_key(payload['jti']), True, timeout=ttl)
+
+
+def revoke_user_tokens(user_id: int) -> None:
+    """
+    Отзывает все токены пользователя, выпущенные до текущего момента
+    """
+    revocation_cache().set(_not_before_key(user_id), time.time(), timeout=settings.JWT_REFRESH_TTL)
@@ -7,4 +7,6 @@ urlpatterns = [
     path('login', views.LoginView.as_view(), name='login'),
     path('profile', views.ProfileView.as_view(), name='profile'),
     path('update_password', views.UpdatePasswordView.as_view(), name='update_password'),
+    path('token/refresh', views.TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/revoke', views.TokenRevokeView.as_view(), name='token_revoke'),
 ]
@@ -1,8 +1,13 @@
 from django.contrib.auth import get_user_model, login, logout
 from rest_framework import generics, status, permissions
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
 
-from core.serializers import RegistrationSerializer, LoginSerializer, UpdatePasswordSerializer, UserSerializer
+from core.serializers import (
+    LoginSerializer, RegistrationSerializer, TokenSerializer, UpdatePasswordSerializer, UserSerializer,
+)
+from core.throttling import AuthIPThrottle, AuthUsernameThrottle, ScopedUserThrottle
+from core.tokens import issue_tokens, revoke_token
 
 User_Model = get_user_model()
 
@@ -13,6 +18,8 @@ class RegistrationView(generics.CreateAPIView):
     """
     model = User_Model
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [ScopedUserThrottle, AuthIPThrottle, AuthUsernameThrottle]
+    throttle_scope = 'auth'
     serializer_class = RegistrationSerializer
 
 
@@ -20,12 +27,16 @@ class LoginView(generics.CreateAPIView):
     """
     Представление для входа в систему существующего пользователя
     """
+    throttle_classes = [ScopedUserThrottle, AuthIPThrottle, AuthUsernameThrottle]
+    throttle_scope = 'auth'
     serializer_class = LoginSerializer
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
+        if serializer.validated_data["mode"] == "token":
+            return Response(serializer.data | issue_tokens(user))
         login(request=request, user=user)
         return Response(serializer.data)
 
@@ -39,9 +50,14 @@ class ProfileView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        # request.user берется из кеша, изменения сохраняются поверх актуальной строки из базы
+        if self.request.method in permissions.SAFE_METHODS:
+            return self.request.user
+        return User_Model.objects.get(pk=self.request.user.pk)
 
     def delete(self, request, *args, **kwargs):
+        if isinstance(request.auth, dict):
+            revoke_token(request.auth)
         logout(request)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -51,7 +67,45 @@ class UpdatePasswordView(generics.UpdateAPIView):
     Представление для обновления пароля пользователя
     """
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'auth'
     serializer_class = UpdatePasswordSerializer
 
     def get_object(self):
-        return self.request.user
+        return User_Model.objects.get(pk=self.request.user.pk)
+
+
+class TokenRefreshView(generics.GenericAPIView):
+    """
+    Представление для обмена refresh-токена на новую пару токенов. Использованный refresh-токен отзывается
+    """
+    permission_classes = [permissions.AllowAny]
+    throttle_scope = 'auth'
+    authentication_classes = []
+    serializer_class = TokenSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        payload = serializer.validated_data["refresh"]
+        user = User_Model.objects.filter(pk=payload["sub"], is_active=True).first()
+        if user is None:
+            raise AuthenticationFailed
+        revoke_token(payload)
+        return Response(issue_tokens(user))
+
+
+class TokenRevokeView(generics.GenericAPIView):
+    """
+    Представление для отзыва refresh-токена и access-токена текущего запроса
+    """
+    permission_classes = [permissions.AllowAny]
+    throttle_scope = 'auth'
+    serializer_class = TokenSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        revoke_token(serializer.validated_data["refresh"])
+        if isinstance(request.auth, dict):
+            revoke_token(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
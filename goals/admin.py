@@ -1,8 +1,35 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
 from django.urls import reverse
 from django.utils.html import format_html
 
-from goals.models import Board, BoardParticipant, GoalCategory, GoalComment, Goal
+from goals.filters import trigram_search
+from goals.models import ArchiveJob, Board, BoardParticipant, GoalCategory, GoalComment, Goal
+
+
+class TrigramSearchChangeList(ChangeList):
+    """
+    Список объектов админ-панели, который при поиске без явной сортировки упорядочивает
+    результаты по схожести
+    """
+    def get_ordering(self, request, queryset):
+        if self.query.strip() and ORDER_VAR not in self.params:
+            return ['-similarity', '-pk']
+        return super().get_ordering(request, queryset)
+
+
+class TrigramSearchAdminMixin:
+    """
+    Нечеткий поиск в админ-панели по полям search_fields через pg_trgm
+    """
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        return trigram_search(queryset, list(self.get_search_fields(request)), search_term), False
+
+    def get_changelist(self, request, **kwargs):
+        return TrigramSearchChangeList
 
 
 class ParticipantsInLine(admin.TabularInline):
@@ -14,7 +41,7 @@ class ParticipantsInLine(admin.TabularInline):
 
 
 @admin.register(Board)
-class BoardAdmin(admin.ModelAdmin):
+class BoardAdmin(TrigramSearchAdminMixin, admin.ModelAdmin):
     """
     Класс с кастомной настройкой админ-панели доски (Board)
     """
@@ -42,7 +69,7 @@ class BoardParticipantAdmin(admin.ModelAdmin):
 
 
 @admin.register(GoalCategory)
-class GoalCategoryAdmin(admin.ModelAdmin):
+class GoalCategoryAdmin(TrigramSearchAdminMixin, admin.ModelAdmin):
     """
     Класс с кастомной настройкой админ-панели категорий (Category)
     """
@@ -78,3 +105,14 @@ class GoalAdmin(admin.ModelAdmin):
         )
 
     author_goal.short_description = 'Author'
+
+
+@admin.register(ArchiveJob)
+class ArchiveJobAdmin(admin.ModelAdmin):
+    """
+    Класс с кастомной настройкой админ-панели заданий архивирования (ArchiveJob)
+    """
+    list_display = ('id', 'board', 'category', 'status', 'goals_archived', 'goals_total', 'attempts', 'updated')
+    list_filter = ('status',)
+    list_select_related = ('board', 'category')
+    readonly_fields = [field.name for field in ArchiveJob._meta.fields]
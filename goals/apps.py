@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
+
+from todolist.caches import require_shared_cache
 
 
 class GoalsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'goals'
+
+    def ready(self):
+        import goals.cache  # noqa: F401 регистрирует обработчики сигналов
+
+        # По кешу досок проверяется доступ к комментариям, синхронизации и экспорту: сброс
+        # после удаления участника должен действовать во всех процессах
+        require_shared_cache(settings.BOARD_CACHE_ALIAS, 'board memberships')
@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q, QuerySet, Sum
+from django.utils import timezone
+
+from goals.models import ArchiveJob, Board, Goal, GoalCategory
+
+
+def schedule_board_archive(board: Board) -> ArchiveJob:
+    """
+    Помечает доску удаленной и ставит в очередь архивирование ее целей и категорий
+    """
+    Board.objects.filter(id=board.id).update(is_deleted=True)
+    goals_total = board.goal_stats.exclude(status=Goal.Status.archived).aggregate(total=Sum("goals_count"))["total"]
+    return ArchiveJob.objects.create(board=board, goals_total=goals_total or 0)
+
+
+def schedule_category_archive(category: GoalCategory) -> ArchiveJob:
+    """
+    Помечает категорию удаленной и ставит в очередь архивирование ее целей
+    """
+    category.is_deleted = True
+    category.save(update_fields=["is_deleted"])
+    goals_total = category.goal_set.exclude(status=Goal.Status.archived).count()
+    return ArchiveJob.objects.create(board_id=category.board_id, category=category, goals_total=goals_total)
+
+
+class LeaseLost(Exception):
+    """
+    Задание перехвачено другим обработчиком после истечения аренды
+    """
+
+
+class ArchiveWorker:
+    """
+    Обработчик заданий архивирования. Задание захватывается через SELECT ... SKIP LOCKED
+    с арендой на lease секунд; каждая партия выполняется в своей транзакции и продлевает аренду.
+    Если обработчик упал, задание после истечения аренды подхватывает другой и продолжает
+    с последней сохраненной цели
+    """
+    def __init__(self, batch_size: int = 1000, lease: int = 60) -> None:
+        self.batch_size = batch_size
+        self.lease = timedelta(seconds=lease)
+
+    def claim(self) -> ArchiveJob | None:
+        now = timezone.now()
+        with transaction.atomic():
+            job = (
+                ArchiveJob.objects.select_for_update(skip_locked=True)
+                .exclude(status=ArchiveJob.Status.done)
+                .filter(Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+                .order_by("id")
+                .first()
+            )
+            if job is None:
+                return None
+            job.status = ArchiveJob.Status.running
+            job.attempts += 1
+            job.locked_until = now + self.lease
+            job.save(update_fields=["status", "attempts", "locked_until", "updated"])
+        return job
+
+    def run(self, job: ArchiveJob) -> None:
+        while self._archive_goals(job):
+            pass
+        if job.category_id is None:
+            while self._delete_categories(job):
+                pass
+        with transaction.atomic():
+            self._save_progress(job, status=ArchiveJob.Status.done, locked_until=None)
+
+    def run_pending(self) -> int:
+        """
+        Выполняет задания, пока очередь не опустеет. Возвращает количество выполненных заданий
+        """
+        processed = 0
+        while (job := self.claim()) is not None:
+            self.run(job)
+            processed += 1
+        return processed
+
+    def _goals(self, job: ArchiveJob) -> QuerySet[Goal]:
+        if job.category_id is not None:
+            return Goal.objects.filter(category_id=job.category_id)
+        return Goal.objects.filter(board_id=job.board_id)
+
+    def _archive_goals(self, job: ArchiveJob) -> bool:
+        with transaction.atomic():
+            goal_ids = list(
+                self._goals(job).filter(id__gt=job.last_goal_id)
+                .exclude(status=Goal.Status.archived)
+                .order_by("id")
+                .values_list("id", flat=True)[:self.batch_size]
+            )
+            if not goal_ids:
+                return False
+            archived = Goal.objects.filter(id__in=goal_ids).exclude(status=Goal.Status.archived).update(
+                status=Goal.Status.archived, updated=timezone.now()
+            )
+            self._save_progress(job, last_goal_id=goal_ids[-1], goals_archived=job.goals_archived + archived)
+        return True
+
+    def _delete_categories(self, job: ArchiveJob) -> bool:
+        with transaction.atomic():
+            category_ids = list(
+                GoalCategory.objects.filter(board_id=job.board_id, is_deleted=False)
+                .order_by("id")
+                .values_list("id", flat=True)[:self.batch_size]
+            )
+            if not category_ids:
+                return False
+            deleted = GoalCategory.objects.filter(id__in=category_ids, is_deleted=False).update(
+                is_deleted=True, updated=timezone.now()
+            )
+            self._save_progress(job, categories_deleted=job.categories_deleted + deleted)
+        return True
+
+    def _save_progress(self, job: ArchiveJob, **fields) -> None:
+        # Прогресс сохраняется только пока аренда принадлежит этому обработчику (attempts не изменился),
+        # иначе транзакция партии откатывается
+        fields.setdefault("locked_until", timezone.now() + self.lease)
+        fields["updated"] = timezone.now()
+        if not ArchiveJob.objects.filter(id=job.id, attempts=job.attempts).update(**fields):
+            raise LeaseLost(f"Archive job {job.id} was taken over by another worker")
+        for attr, value in fields.items():
+            setattr(job, attr, value)
@@ -0,0 +1,144 @@
+from collections import defaultdict
+from typing import Any
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.request import Request
+
+from goals.models import Goal, GoalCategory
+from goals.roles import BoardRoles
+from goals.serializers import GoalBulkOperationSerializer, GoalBulkSerializer
+
+Action = GoalBulkOperationSerializer.Action
+
+
+def prefetch_categories(items: list[dict]) -> dict[int, GoalCategory]:
+    """
+    Загружает одним запросом все категории, на которые ссылаются элементы пакета
+    """
+    category_ids = set()
+    for item in items:
+        try:
+            category_ids.add(int(item["category"]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return GoalCategory.objects.select_related("board").in_bulk(category_ids)
+
+
+class GoalBulkOperations:
+    """
+    Класс для выполнения пакета операций над целями (создание, изменение, архивирование):
+    роли пользователя, цели и категории загружаются по одному запросу на весь пакет,
+    запись выполняется через bulk_create/bulk_update в одной транзакции.
+    Результат возвращается по каждой операции в порядке запроса
+    """
+    def __init__(self, request: Request) -> None:
+        self.request = request
+        self.board_roles = BoardRoles.for_request(request)
+
+    def apply(self, operations: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        results: list[dict[str, Any]] = [{"index": index} for index in range(len(operations))]
+        envelopes = self._validate_envelopes(operations, results)
+
+        goal_ids = [envelope["id"] for envelope in envelopes.values() if "id" in envelope]
+        goals = (
+            Goal.objects.filter(category__is_deleted=False, board__is_deleted=False)
+            .exclude(status=Goal.Status.archived)
+            .in_bulk(goal_ids)
+        )
+        context = {"request": self.request, "categories": prefetch_categories(operations)}
+
+        to_create: dict[int, Goal] = {}
+        to_update: dict[int, tuple[Goal, set[str]]] = {}
+        seen_ids: set[int] = set()
+        for index, envelope in envelopes.items():
+            result = results[index]
+            result |= envelope
+            if envelope["action"] != Action.create:
+                if envelope["id"] in seen_ids:
+                    result |= {"status": status.HTTP_400_BAD_REQUEST, "errors": {"id": ["Duplicate goal id"]}}
+                    continue
+                seen_ids.add(envelope["id"])
+
+            try:
+                if envelope["action"] == Action.create:
+                    to_create[index] = self._build_created(operations[index], context, result)
+                else:
+                    goal = self._get_goal(goals, envelope["id"], result)
+                    to_update[index] = self._build_updated(goal, envelope["action"], operations[index], context, result)
+            except PermissionDenied as error:
+                result |= {"status": status.HTTP_403_FORBIDDEN, "errors": {"detail": [str(error.detail)]}}
+            except _OperationFailed:
+                continue
+
+        self._save(to_create, to_update)
+        for index, goal in to_create.items():
+            results[index] |= {"status": status.HTTP_201_CREATED, "id": goal.id}
+        for index in to_update:
+            results[index]["status"] = status.HTTP_200_OK
+        return results
+
+    @staticmethod
+    def _validate_envelopes(operations: list[dict], results: list[dict]) -> dict[int, dict]:
+        envelopes = {}
+        for index, operation in enumerate(operations):
+            serializer = GoalBulkOperationSerializer(data=operation)
+            if serializer.is_valid():
+                envelopes[index] = serializer.validated_data
+            else:
+                results[index] |= {"status": status.HTTP_400_BAD_REQUEST, "errors": serializer.errors}
+        return envelopes
+
+    def _get_goal(self, goals: dict[int, Goal], goal_id: int, result: dict) -> Goal:
+        goal = goals.get(goal_id)
+        if goal is None:
+            result |= {"status": status.HTTP_404_NOT_FOUND, "errors": {"id": ["Goal not found"]}}
+            raise _OperationFailed
+        if not self.board_roles.can_write(goal.board_id):
+            raise PermissionDenied("Must be owner or writer in project")
+        return goal
+
+    @staticmethod
+    def _build_created(data: dict, context: dict, result: dict) -> Goal:
+        serializer = GoalBulkSerializer(data=data, context=context)
+        if not serializer.is_valid():
+            result |= {"status": status.HTTP_400_BAD_REQUEST, "errors": serializer.errors}
+            raise _OperationFailed
+        return Goal(**serializer.validated_data)
+
+    @staticmethod
+    def _build_updated(goal: Goal, action: str, data: dict, context: dict, result: dict) -> tuple[Goal, set[str]]:
+        if action == Action.archive:
+            goal.status = Goal.Status.archived
+            return goal, {"status"}
+
+        serializer = GoalBulkSerializer(goal, data=data, partial=True, context=context)
+        if not serializer.is_valid():
+            result |= {"status": status.HTTP_400_BAD_REQUEST, "errors": serializer.errors}
+            raise _OperationFailed
+        for attr, value in serializer.validated_data.items():
+            setattr(goal, attr, value)
+        return goal, set(serializer.validated_data)
+
+    @staticmethod
+    def _save(to_create: dict[int, Goal], to_update: dict[int, tuple[Goal, set[str]]]) -> None:
+        # Цели с одинаковым набором измененных полей обновляются одним запросом,
+        # остальные поля не перезаписываются устаревшими значениями
+        update_groups: dict[frozenset[str], list[Goal]] = defaultdict(list)
+        now = timezone.now()
+        for goal, fields in to_update.values():
+            goal.updated = now
+            update_groups[frozenset(fields | {"updated"})].append(goal)
+
+        with transaction.atomic():
+            Goal.objects.bulk_create(to_create.values())
+            for fields, goals in update_groups.items():
+                Goal.objects.bulk_update(goals, sorted(fields))
+
+
+class _OperationFailed(Exception):
+    """
+    Операция пакета отклонена, результат уже записан
+    """
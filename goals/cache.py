@@ -0,0 +1,85 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from goals.models import BoardParticipant
+from todolist import metrics
+from todolist.db_router import use_replica
+
+HITS_KEY = 'boards:hits'
+MISSES_KEY = 'boards:misses'
+
+
+def board_cache() -> BaseCache:
+    return caches[settings.BOARD_CACHE_ALIAS]
+
+
+def _generation_key(user_id: int) -> str:
+    return f'boards:generation:{user_id}'
+
+
+def _user_key(user_id: int, generation: str) -> str:
+    return f'boards:user:{user_id}:{generation}'
+
+
+def _generation(cache: BaseCache, user_id: int) -> str:
+    """
+    Поколение кеша досок пользователя: случайная метка, которую заменяет каждый сброс.
+    Если метка вытеснена из кеша, создается новая, поэтому прежние значения не читаются
+    """
+    generation = cache.get(_generation_key(user_id))
+    if generation is None:
+        cache.add(_generation_key(user_id), uuid.uuid4().hex, timeout=None)
+        generation = cache.get(_generation_key(user_id))
+    return generation
+
+
+def get_board_ids(user_id: int) -> list[int]:
+    """
+    Идентификаторы досок, где пользователь участник. Берутся из кеша BOARD_CACHE_ALIAS,
+    при промахе загружаются одним запросом без соединения с Board. Загрузка идет из основной базы,
+    чтобы отстающая реплика не вернула в кеш только что сброшенный состав участников.
+    Значение записывается под поколением, прочитанным до загрузки: если состав участников сбросили
+    во время загрузки, устаревшее значение попадет в прежнее поколение и читаться не будет
+    """
+    cache = board_cache()
+    generation = _generation(cache, user_id)
+    board_ids = cache.get(_user_key(user_id, generation))
+    if board_ids is not None:
+        metrics.count(HITS_KEY)
+        return board_ids
+
+    metrics.count(MISSES_KEY)
+    with use_replica(False):
+        board_ids = list(
+            BoardParticipant.objects.filter(user_id=user_id).order_by('board_id').values_list('board_id', flat=True)
+        )
+    cache.set(_user_key(user_id, generation), board_ids)
+    return board_ids
+
+
+def invalidate_board_ids(*user_ids: int) -> None:
+    """
+    Сбрасывает кеш досок пользователей сменой поколения сразу и повторно после фиксации текущей
+    транзакции: второй сброс убирает значения, загруженные параллельными запросами до фиксации
+    """
+    def reset() -> None:
+        board_cache().set_many({_generation_key(user_id): uuid.uuid4().hex for user_id in user_ids}, timeout=None)
+
+    reset()
+    transaction.on_commit(reset)
+
+
+def get_stats() -> dict[str, int]:
+    counters = metrics.read([HITS_KEY, MISSES_KEY])
+    return {'hits': counters[HITS_KEY], 'misses': counters[MISSES_KEY]}
+
+
+@receiver([post_save, post_delete], sender=BoardParticipant)
+def participant_changed(sender, instance: BoardParticipant, **kwargs) -> None:
+    invalidate_board_ids(instance.user_id)
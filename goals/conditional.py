@@ -0,0 +1,81 @@
+import hashlib
+from typing import Any
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.db.models import CharField, Subquery, Value
+from django.db.models.functions import Cast, Coalesce, Concat
+from django.views.decorators.http import condition
+from rest_framework.request import Request
+
+from core.models import UserDataVersion
+from goals.cache import get_board_ids
+from goals.models import Board
+
+
+def _user_data_version() -> Coalesce:
+    """
+    Версия данных пользователей (см. core.models.UserDataVersion) подзапросом: ответы встраивают
+    автора и участников, поэтому изменение профиля тоже должно менять ETag
+    """
+    return Coalesce(Subquery(UserDataVersion.objects.values('version')[:1]), 0)
+
+
+def _boards_version(request: Request, board_id: int | None = None) -> str | None:
+    """
+    Версии досок пользователя и данных пользователей одним запросом: строка "users;id:version,...".
+    В нее входит и состав досок, поэтому потеря доступа к доске тоже меняет ETag. Last-Modified
+    не отдается: время изменения доски с точностью до секунды не отличает записи одной секунды
+    и транзакции, начатые раньше
+    """
+    users = Cast(_user_data_version(), CharField())
+    if board_id is None:
+        return Board.objects.filter(id__in=get_board_ids(request.user.id)).aggregate(
+            versions=Concat(
+                users,
+                Value(';'),
+                StringAgg(
+                    Concat(Cast('id', CharField()), Value(':'), Cast('version', CharField())),
+                    delimiter=',',
+                    ordering='id',
+                    default='',
+                ),
+                output_field=CharField(),
+            ),
+        )['versions']
+
+    version = (
+        Board.objects.filter(id=board_id, participants__user_id=request.user.id, is_deleted=False)
+        .annotate(versions=Concat(users, Value(';'), Cast('version', CharField())))
+        .values_list('versions', flat=True)
+        .first()
+    )
+    return version
+
+
+def _etag(request: Request, board_id: int | None = None) -> str | None:
+    if not request.user.is_authenticated:
+        return None
+    version = _boards_version(request, board_id)
+    if version is None:
+        return None
+    key = f'{request.user.id}:{request.get_full_path()}:{version}'
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def boards_etag(request: Request, *args: Any, **kwargs: Any) -> str | None:
+    """
+    ETag списков досок, категорий и целей: меняется при записи на любой доске пользователя
+    """
+    return _etag(request)
+
+
+def board_etag(request: Request, *args: Any, pk: int, **kwargs: Any) -> str | None:
+    """
+    ETag конкретной доски. Для досок, где пользователь не участник, не вычисляется,
+    и запрос проходит обычную проверку прав
+    """
+    return _etag(request, pk)
+
+
+boards_condition = condition(etag_func=boards_etag)
+board_condition = condition(etag_func=board_etag)
@@ -0,0 +1,82 @@
+import json
+import zlib
+from typing import Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, router, transaction
+from django.db.models import F, QuerySet
+
+from goals.cache import get_board_ids
+from goals.models import Board, Goal, GoalCategory, GoalComment
+
+CHUNK_SIZE = 2000
+FLUSH_SIZE = 64 * 1024
+
+
+def _rows(record_type: str, queryset: QuerySet, chunk_size: int) -> Iterator[dict]:
+    for row in queryset.iterator(chunk_size=chunk_size):
+        yield {'type': record_type, **row}
+
+
+def export_records(user_id: int, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Доски, категории, цели и комментарии пользователя по одной записи. Каждая таблица читается
+    серверным курсором порциями по chunk_size строк, поэтому в памяти одновременно находится
+    не больше одной порции. Все таблицы читаются в одной транзакции REPEATABLE READ READ ONLY:
+    выгрузка - согласованный снимок, в котором у каждой цели есть ее категория, а серверные курсоры
+    работают и через PgBouncer, и с DISABLE_SERVER_SIDE_CURSORS
+    """
+    using = router.db_for_read(Board)
+    connection = connections[using]
+    # Проверка соединения (CONN_HEALTH_CHECKS) выполняет запрос, поэтому она нужна до начала транзакции:
+    # уровень изоляции задается только первой командой транзакции
+    connection.close_if_health_check_failed()
+    outermost = not connection.in_atomic_block
+    with transaction.atomic(using=using):
+        if outermost:
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY')
+        yield from _export_records(user_id, chunk_size)
+
+
+def _export_records(user_id: int, chunk_size: int) -> Iterator[dict]:
+    boards = Board.objects.filter(id__in=get_board_ids(user_id), is_deleted=False).order_by('id')
+    board_ids = list(boards.values_list('id', flat=True))
+    yield from _rows('board', boards.values('id', 'title', 'created', 'updated'), chunk_size)
+
+    categories = GoalCategory.objects.filter(board_id__in=board_ids, is_deleted=False)
+    yield from _rows(
+        'category',
+        categories.order_by('id').values('id', 'board', 'title', 'created', 'updated', author=F('user__username')),
+        chunk_size,
+    )
+
+    goals = Goal.objects.filter(category__in=categories).order_by('id').values(
+        'id', 'category', 'title', 'description', 'due_date', 'status', 'priority', 'created', 'updated',
+        author=F('user__username'),
+    )
+    yield from _rows('goal', goals, chunk_size)
+
+    comments = GoalComment.objects.filter(goal__category__in=categories).order_by('id').values(
+        'id', 'goal', 'text', 'created', 'updated', author=F('user__username'),
+    )
+    yield from _rows('comment', comments, chunk_size)
+
+
+def jsonl_gzip(records: Iterable[dict], flush_size: int = FLUSH_SIZE) -> Iterator[bytes]:
+    """
+    Сжимает записи в gzip-поток JSON Lines на лету, отдавая данные блоками около flush_size байт
+    """
+    compressor = zlib.compressobj(wbits=31)
+    buffer = []
+    buffered = 0
+    for record in records:
+        line = json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False).encode() + b'\n'
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= flush_size:
+            if data := compressor.compress(b''.join(buffer)):
+                yield data
+            buffer.clear()
+            buffered = 0
+    yield compressor.compress(b''.join(buffer)) + compressor.flush()
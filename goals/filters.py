@@ -1,4 +1,8 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import F, Q, QuerySet
+from django.db.models.functions import Greatest
 from django_filters.rest_framework import FilterSet
+from rest_framework.filters import OrderingFilter, SearchFilter
 
 from goals.models import Goal
 
@@ -15,3 +19,60 @@ class GoalListFilter(FilterSet):
             'status': ['in'],
             'priority': ['in'],
         }
+
+
+class GoalSearchFilter(SearchFilter):
+    """
+    Класс для полнотекстового поиска целей по параметру ?search= (синтаксис websearch).
+    Использует столбец search_vector с GIN-индексом, поддерживаемый триггером в базе.
+    Если сортировка не задана явно через ?ordering=, результаты упорядочиваются по релевантности
+    """
+    search_config = 'russian'
+
+    def filter_queryset(self, request, queryset: QuerySet[Goal], view) -> QuerySet[Goal]:
+        search = request.query_params.get(self.search_param, '').strip()
+        if not search:
+            return queryset
+
+        query = SearchQuery(search, config=self.search_config, search_type='websearch')
+        queryset = queryset.filter(search_vector=query).annotate(rank=SearchRank(F('search_vector'), query))
+        return order_by_relevance(request, queryset, 'rank')
+
+
+class TrigramSearchFilter(SearchFilter):
+    """
+    Класс для нечеткого (устойчивого к опечаткам) поиска по параметру ?search= среди полей
+    search_fields представления. Использует оператор pg_trgm %> и GIN-индекс gin_trgm_ops,
+    порог схожести задается настройкой TRIGRAM_SIMILARITY_THRESHOLD. Если сортировка не задана
+    явно через ?ordering=, результаты упорядочиваются по степени схожести
+    """
+    def filter_queryset(self, request, queryset: QuerySet, view) -> QuerySet:
+        search = request.query_params.get(self.search_param, '').strip()
+        search_fields = self.get_search_fields(view, request)
+        if not search or not search_fields:
+            return queryset
+
+        return order_by_relevance(request, trigram_search(queryset, search_fields, search), 'similarity')
+
+
+def trigram_search(queryset: QuerySet, fields: list[str], search: str) -> QuerySet:
+    """
+    Отбирает строки, похожие на search хотя бы по одному из полей, и аннотирует их схожестью
+    """
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__trigram_word_similar': search})
+
+    similarities = [TrigramWordSimilarity(search, field) for field in fields]
+    similarity = similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+    return queryset.filter(condition).annotate(similarity=similarity)
+
+
+def order_by_relevance(request, queryset: QuerySet, relevance: str) -> QuerySet:
+    """
+    Ставит наиболее релевантные результаты первыми, сохраняя сортировку по умолчанию
+    для равных значений. Явно запрошенная сортировка (?ordering=) не переопределяется
+    """
+    if OrderingFilter.ordering_param in request.query_params:
+        return queryset
+    return queryset.order_by(f'-{relevance}', *queryset.query.order_by)
@@ -0,0 +1,130 @@
+import csv
+import json
+from itertools import islice
+from typing import IO, Any, Iterable, Iterator
+
+from django.db import transaction
+from rest_framework import status
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.request import Request
+
+from goals.bulk import prefetch_categories
+from goals.models import Goal
+from goals.serializers import GoalBulkSerializer
+
+BATCH_SIZE = 1000
+FORMATS = ("csv", "jsonl")
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+}
+
+Row = dict[str, Any] | ValueError
+
+
+def read_lines(stream: IO[bytes]) -> Iterator[str]:
+    """
+    Построчно читает байтовый поток (файл или тело запроса), не загружая его целиком
+    """
+    first = True
+    for line in iter(stream.readline, b""):
+        text = line.decode("utf-8")
+        if first:
+            text = text.lstrip("\ufeff")
+            first = False
+        yield text
+
+
+def parse_rows(lines: Iterable[str], file_format: str) -> Iterator[Row]:
+    """
+    Разбирает строки CSV (с заголовком) или JSON Lines в словари. Строка, которую не удалось
+    разобрать, возвращается как ValueError, чтобы нумерация строк не сбивалась
+    """
+    if file_format == "csv":
+        for row in csv.DictReader(lines):
+            # Пустые ячейки CSV означают значение по умолчанию
+            yield {key: value for key, value in row.items() if key and value not in ("", None)}
+        return
+
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield ValueError("Invalid JSON")
+            continue
+        yield row if isinstance(row, dict) else ValueError("Expected a JSON object")
+
+
+def _until_stream_error(rows: Iterable[Row], errors: list[str]) -> Iterator[Row]:
+    """
+    Отдает строки, пока поток читается. Ошибка кодировки или формата CSV останавливает чтение
+    (после нее строки уже нельзя сопоставить с файлом) и записывается в errors, а уже прочитанные
+    строки импортируются
+    """
+    try:
+        yield from rows
+    except UnicodeDecodeError as error:
+        errors.append(f"Invalid UTF-8: {error}")
+    except csv.Error as error:
+        errors.append(f"Invalid CSV: {error}")
+
+
+def _row_error(index: int, code: int, errors: dict) -> dict[str, Any]:
+    return {"index": index, "status": code, "errors": errors}
+
+
+class GoalImporter:
+    """
+    Класс для потокового импорта целей. Строки обрабатываются партиями по batch_size: категории
+    и роли пользователя проверяются одним запросом на партию, цели вставляются через bulk_create,
+    каждая партия фиксируется отдельной транзакцией. После каждой партии возвращается отчет
+    с количеством обработанных строк: импорт можно продолжить с этого места через offset
+    """
+    def __init__(self, request: Request, batch_size: int = BATCH_SIZE) -> None:
+        self.request = request
+        self.batch_size = batch_size
+
+    def run(self, rows: Iterable[Row], offset: int = 0) -> Iterator[dict[str, Any]]:
+        stream_errors: list[str] = []
+        numbered = islice(enumerate(_until_stream_error(rows, stream_errors)), offset, None)
+        processed = offset
+        created_total = 0
+        while batch := list(islice(numbered, self.batch_size)):
+            created, errors = self._import_batch(batch)
+            processed += len(batch)
+            created_total += created
+            yield {"processed": processed, "created": created, "errors": errors}
+        if stream_errors:
+            # Файл не дочитан: импорт можно продолжить с processed после исправления файла
+            yield {"processed": processed, "created_total": created_total, "done": False, "error": stream_errors[0]}
+            return
+        yield {"processed": processed, "created_total": created_total, "done": True}
+
+    def _import_batch(self, batch: list[tuple[int, Row]]) -> tuple[int, list[dict]]:
+        context = {
+            "request": self.request,
+            "categories": prefetch_categories([row for _, row in batch if isinstance(row, dict)]),
+        }
+        goals = []
+        errors = []
+        for index, row in batch:
+            if isinstance(row, ValueError):
+                errors.append(_row_error(index, status.HTTP_400_BAD_REQUEST, {"detail": [str(row)]}))
+                continue
+            serializer = GoalBulkSerializer(data=row, context=context)
+            try:
+                valid = serializer.is_valid()
+            except PermissionDenied as error:
+                errors.append(_row_error(index, status.HTTP_403_FORBIDDEN, {"detail": [str(error.detail)]}))
+                continue
+            if not valid:
+                errors.append(_row_error(index, status.HTTP_400_BAD_REQUEST, serializer.errors))
+                continue
+            goals.append(Goal(**serializer.validated_data))
+
+        with transaction.atomic():
+            Goal.objects.bulk_create(goals)
+        return len(goals), errors
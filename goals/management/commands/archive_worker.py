@@ -0,0 +1,37 @@
+import time
+
+from django.core.management import BaseCommand
+
+from goals.archive import ArchiveWorker, LeaseLost
+
+
+class Command(BaseCommand):
+    """
+    Команда для фонового выполнения заданий архивирования удаленных досок и категорий
+    """
+    help = "Process archive jobs created when boards and categories are deleted"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Goals archived per transaction")
+        parser.add_argument("--lease", type=int, default=60, help="Seconds before a silent job can be taken over")
+        parser.add_argument("--interval", type=float, default=5, help="Seconds to sleep when the queue is empty")
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+
+    def handle(self, *args, **options):
+        worker = ArchiveWorker(batch_size=options["batch_size"], lease=options["lease"])
+
+        self.stdout.write(self.style.SUCCESS("Archive worker is running!"))
+        while True:
+            job = worker.claim()
+            if job is None:
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
+                continue
+
+            try:
+                worker.run(job)
+            except LeaseLost as error:
+                self.stderr.write(str(error))
+                continue
+            self.stdout.write(f"Archive job {job.id}: {job.goals_archived} goals, {job.categories_deleted} categories")
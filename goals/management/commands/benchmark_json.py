@@ -0,0 +1,95 @@
+import io
+import time
+from datetime import timedelta
+
+from django.core.management import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from todolist.parsers import FastJSONParser
+from todolist.renderers import FastJSONRenderer, orjson
+
+
+class Command(BaseCommand):
+    """
+    Команда для сравнения скорости стандартных JSONRenderer/JSONParser DRF и их версий на orjson
+    на странице списка целей. Данные собираются в памяти, база данных не используется
+    """
+    help = "Benchmark JSON rendering and parsing: DRF JSONRenderer/JSONParser vs FastJSONRenderer/FastJSONParser"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000, help="Goals per page")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per renderer and parser")
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        if orjson is None:
+            self.stdout.write("orjson is not installed, FastJSONRenderer falls back to JSONRenderer")
+
+        page = self._page(rows)
+        renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        body = renderer.render(page)
+        if fast_renderer.render(page) != body:
+            raise CommandError("FastJSONRenderer output differs from JSONRenderer")
+
+        parser, fast_parser = JSONParser(), FastJSONParser()
+        if fast_parser.parse(io.BytesIO(body)) != parser.parse(io.BytesIO(body)):
+            raise CommandError("FastJSONParser result differs from JSONParser")
+
+        self._report(
+            f"render {rows} goals",
+            self._measure(lambda: renderer.render(page), repeat),
+            self._measure(lambda: fast_renderer.render(page), repeat),
+        )
+        self._report(
+            f"parse {len(body) // 1024} KB",
+            self._measure(lambda: parser.parse(io.BytesIO(body)), repeat),
+            self._measure(lambda: fast_parser.parse(io.BytesIO(body)), repeat),
+        )
+
+    def _report(self, title: str, default_time: float, fast_time: float) -> None:
+        self.stdout.write(
+            f"{title:<24} drf {default_time * 1000:.1f} ms, fast {fast_time * 1000:.1f} ms, "
+            f"x{default_time / fast_time:.1f}"
+        )
+
+    @staticmethod
+    def _measure(run, repeat: int) -> float:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    @staticmethod
+    def _page(rows: int) -> dict:
+        """
+        Страница списка целей в том виде, в котором ее отдает GoalListView: вложенный автор,
+        даты уже приведены сериализатором к строкам, текст не в ASCII
+        """
+        now = timezone.now()
+        iso = serializers.DateTimeField().to_representation
+        user = {"id": 1, "username": "benchmark", "first_name": "Иван", "last_name": "Петров", "email": "b@example.com"}
+        return {
+            "count": rows,
+            "next": None,
+            "previous": None,
+            "results": [
+                {
+                    "id": i,
+                    "user": user,
+                    "created": iso(now - timedelta(minutes=i)),
+                    "updated": iso(now),
+                    "title": f"Цель {i}",
+                    "description": "Описание цели " * 5,
+                    "due_date": (now + timedelta(days=i)).date().isoformat(),
+                    "status": i % 4 + 1,
+                    "priority": i % 4 + 1,
+                    "category": i % 10 + 1,
+                }
+                for i in range(rows)
+            ],
+        }
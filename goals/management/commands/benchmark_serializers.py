@@ -0,0 +1,76 @@
+import time
+
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from core.models import User
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+from goals.read_plan import plan_for
+from goals.serializers import BoardCreateSerializer, GoalCategorySerializer, GoalCommentSerializer, GoalUserSerializer
+
+
+class Command(BaseCommand):
+    """
+    Команда для сравнения скорости ModelSerializer и ValuesPlan на страницах списков.
+    Тестовые данные создаются в транзакции, которая в конце откатывается
+    """
+    help = "Benchmark list serialization: ModelSerializer vs ValuesPlan"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000, help="Rows per page")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per serializer")
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        with transaction.atomic():
+            querysets = self._fixtures(rows)
+            renderer = JSONRenderer()
+            for serializer_class, queryset in querysets:
+                plan = plan_for(serializer_class)
+                queryset = queryset.order_by("id")
+
+                def serializer_page():
+                    return renderer.render(serializer_class(queryset.all(), many=True).data)
+
+                def plan_page():
+                    return renderer.render(plan.render(plan.values(queryset.all())))
+
+                if serializer_page() != plan_page():
+                    raise CommandError(f"{serializer_class.__name__}: ValuesPlan output differs")
+
+                serializer_time = self._measure(serializer_page, repeat)
+                plan_time = self._measure(plan_page, repeat)
+                self.stdout.write(
+                    f"{serializer_class.__name__:<24} {rows} rows: serializer {serializer_time * 1000:.1f} ms, "
+                    f"plan {plan_time * 1000:.1f} ms, x{serializer_time / plan_time:.1f}"
+                )
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _measure(page, repeat: int) -> float:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            page()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    @staticmethod
+    def _fixtures(rows: int) -> list:
+        user = User.objects.create_user(username="benchmark-serializers", password="benchmark")
+        boards = Board.objects.bulk_create(Board(title=f"board {i}") for i in range(rows))
+        BoardParticipant.objects.bulk_create(BoardParticipant(board=board, user=user) for board in boards)
+        categories = GoalCategory.objects.bulk_create(
+            GoalCategory(board=boards[0], user=user, title=f"category {i}") for i in range(rows)
+        )
+        goals = Goal.objects.bulk_create(
+            Goal(category=categories[0], user=user, title=f"goal {i}", description="description") for i in range(rows)
+        )
+        GoalComment.objects.bulk_create(GoalComment(goal=goals[0], user=user, text=f"comment {i}") for i in range(rows))
+        return [
+            (GoalUserSerializer, Goal.objects.filter(user=user).select_related("user")),
+            (GoalCategorySerializer, GoalCategory.objects.filter(user=user).select_related("user")),
+            (GoalCommentSerializer, GoalComment.objects.filter(user=user).select_related("user")),
+            (BoardCreateSerializer, Board.objects.filter(participants__user=user)),
+        ]
@@ -0,0 +1,37 @@
+import sys
+
+from django.core.management import BaseCommand, CommandError
+
+from core.models import User
+from goals.export import CHUNK_SIZE, export_records, jsonl_gzip
+
+
+class Command(BaseCommand):
+    """
+    Команда для выгрузки досок, категорий, целей и комментариев пользователя в gzip-файл JSON Lines
+    """
+    help = "Export everything a user can access as gzip-compressed JSON Lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("-o", "--output", default="-", help="Output file, '-' for stdout")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows fetched per server-side cursor read")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['username']} does not exist")
+
+        chunks = jsonl_gzip(export_records(user.id, chunk_size=options["chunk_size"]))
+        if options["output"] == "-":
+            self._write(sys.stdout.buffer, chunks)
+        else:
+            with open(options["output"], "wb") as output:
+                self._write(output, chunks)
+
+    @staticmethod
+    def _write(output, chunks) -> None:
+        for chunk in chunks:
+            output.write(chunk)
+        output.flush()
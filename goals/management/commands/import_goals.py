@@ -0,0 +1,44 @@
+import json
+from pathlib import Path
+
+from django.core.management import BaseCommand, CommandError
+from django.http import HttpRequest
+from rest_framework.request import Request
+
+from core.models import User
+from goals.importer import BATCH_SIZE, FORMATS, GoalImporter, parse_rows, read_lines
+
+
+class Command(BaseCommand):
+    """
+    Команда для импорта целей из CSV или JSON Lines от имени пользователя. После каждой партии
+    печатается отчет; прерванный импорт продолжается с --offset=<processed из последнего отчета>
+    """
+    help = "Import goals from a CSV or JSON Lines file as the given user"
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FORMATS, help="File format, by default taken from the extension")
+        parser.add_argument("--offset", type=int, default=0, help="Number of rows already imported")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Goals inserted per transaction")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['username']} does not exist")
+
+        path = Path(options["path"])
+        file_format = options["format"] or path.suffix.lstrip(".")
+        if file_format not in FORMATS:
+            raise CommandError(f"Unknown file format {file_format!r}, use --format")
+
+        # Проверки прав в сериализаторах работают с запросом, поэтому импорт выполняется от его имени
+        request = Request(HttpRequest())
+        request.user = user
+        importer = GoalImporter(request, batch_size=options["batch_size"])
+
+        with path.open("rb") as stream:
+            for report in importer.run(parse_rows(read_lines(stream), file_format), offset=options["offset"]):
+                self.stdout.write(json.dumps(report, ensure_ascii=False))
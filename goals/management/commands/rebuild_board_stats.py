@@ -0,0 +1,80 @@
+from collections import Counter
+
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, F
+
+from goals.models import BoardGoalStat, Goal
+
+StatKey = tuple[int, int, int]
+
+
+class Command(BaseCommand):
+    """
+    Команда для проверки и пересчета счетчиков целей досок (BoardGoalStat).
+    На время пересчета запись целей и категорий блокируется, чтение остается доступным
+    """
+    help = "Rebuild or check (--check) goal counters used by goals/board/<pk>/stats"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="Only report mismatched counters")
+        parser.add_argument("--board", type=int, action="append", dest="boards", help="Limit to board id")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if not options["check"]:
+                with connection.cursor() as cursor:
+                    cursor.execute("LOCK TABLE goals_goal, goals_goalcategory IN SHARE MODE")
+
+            expected = self._expected(options["boards"])
+            actual = self._actual(options["boards"])
+            mismatches = sorted(key for key in expected.keys() | actual.keys() if expected[key] != actual[key])
+
+            for board_id, status, priority in mismatches:
+                self.stdout.write(
+                    f"board={board_id} status={status} priority={priority}: "
+                    f"stored {actual[board_id, status, priority]}, actual {expected[board_id, status, priority]}"
+                )
+
+            if options["check"]:
+                if mismatches:
+                    raise CommandError(f"{len(mismatches)} board counters are out of sync")
+                self.stdout.write(self.style.SUCCESS("Board counters are in sync"))
+                return
+
+            stats = BoardGoalStat.objects.all()
+            if options["boards"]:
+                stats = stats.filter(board_id__in=options["boards"])
+            stats.delete()
+            BoardGoalStat.objects.bulk_create(
+                BoardGoalStat(board_id=board_id, status=status, priority=priority, goals_count=goals_count)
+                for (board_id, status, priority), goals_count in expected.items()
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Board counters rebuilt, {len(mismatches)} fixed"))
+
+    @staticmethod
+    def _expected(boards: list[int] | None) -> Counter[StatKey]:
+        goals = Goal.objects.all()
+        if boards:
+            goals = goals.filter(board_id__in=boards)
+        rows = (
+            goals.values("board_id", goal_status=F("status"), goal_priority=F("priority"))
+            .annotate(goals_count=Count("id"))
+            .order_by()
+        )
+        return Counter({
+            (row["board_id"], row["goal_status"], row["goal_priority"]): row["goals_count"] for row in rows
+        })
+
+    @staticmethod
+    def _actual(boards: list[int] | None) -> Counter[StatKey]:
+        stats = BoardGoalStat.objects.exclude(goals_count=0)
+        if boards:
+            stats = stats.filter(board_id__in=boards)
+        return Counter({
+            (board_id, status, priority): goals_count
+            for board_id, status, priority, goals_count in stats.values_list(
+                "board_id", "status", "priority", "goals_count"
+            )
+        })
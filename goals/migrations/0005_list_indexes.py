@@ -0,0 +1,39 @@
+# Generated by Django 4.2 on 2026-10-18 16:42
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0004_alter_goalcategory_board'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='boardparticipant',
+            index=models.Index(fields=['user', 'board', 'role'], name='goals_participant_user_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4), _negated=True), fields=['category', 'title'], name='goals_goal_title_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4), _negated=True), fields=['category', 'created'], name='goals_goal_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcategory',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['board', 'title'], name='goals_category_title_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcategory',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['board', 'created'], name='goals_category_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcomment',
+            index=models.Index(fields=['goal', 'created'], name='goals_comment_created_idx'),
+        ),
+    ]
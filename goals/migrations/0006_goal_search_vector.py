@@ -0,0 +1,66 @@
+# Generated by Django 4.2 on 2026-10-18 17:05
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_VECTOR_TRIGGER = """
+CREATE FUNCTION goals_goal_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('russian', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_goal_search_vector_update
+    BEFORE INSERT OR UPDATE OF title, description, search_vector ON goals_goal
+    FOR EACH ROW EXECUTE FUNCTION goals_goal_search_vector_update();
+"""
+
+DROP_SEARCH_VECTOR_TRIGGER = """
+DROP TRIGGER IF EXISTS goals_goal_search_vector_update ON goals_goal;
+DROP FUNCTION IF EXISTS goals_goal_search_vector_update();
+"""
+
+# Существующие цели заполняются партиями по id, каждая партия - отдельная транзакция, поэтому
+# миграция не держит блокировки всех строк goals_goal до конца заполнения. Вектор пересчитывает
+# триггер: обновление search_vector вызывает его для каждой строки партии
+BACKFILL_BATCH_SIZE = 5000
+
+BACKFILL_SEARCH_VECTOR = """
+UPDATE goals_goal SET search_vector = NULL
+WHERE id IN (
+    SELECT id FROM goals_goal WHERE id > %s AND search_vector IS NULL ORDER BY id LIMIT %s
+)
+RETURNING id
+"""
+
+
+def backfill_search_vector(apps, schema_editor) -> None:
+    last_id = 0
+    with schema_editor.connection.cursor() as cursor:
+        while True:
+            cursor.execute(BACKFILL_SEARCH_VECTOR, [last_id, BACKFILL_BATCH_SIZE])
+            ids = [row[0] for row in cursor.fetchall()]
+            if not ids:
+                return
+            last_id = max(ids)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0005_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_TRIGGER, DROP_SEARCH_VECTOR_TRIGGER),
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
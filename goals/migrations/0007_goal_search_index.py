@@ -0,0 +1,20 @@
+# Generated by Django 4.2 on 2026-10-18 17:05
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0006_goal_search_vector'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='goal',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='goals_goal_search_idx'),
+        ),
+    ]
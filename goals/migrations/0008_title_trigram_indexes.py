@@ -0,0 +1,29 @@
+# Generated by Django 4.2 on 2026-10-18 17:20
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0007_goal_search_index'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='board',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['title'], name='goals_board_title_trgm_idx', opclasses=['gin_trgm_ops']
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcategory',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['title'], name='goals_category_title_trgm_idx', opclasses=['gin_trgm_ops']
+            ),
+        ),
+    ]
@@ -0,0 +1,119 @@
+# Generated by Django 4.2 on 2026-10-18 17:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Счетчики обновляются statement-level триггерами по transition-таблицам: массовый .update()
+# по тысячам целей превращается в один upsert на каждую пару (статус, приоритет) доски.
+# Строки счетчиков блокируются в порядке ORDER BY, чтобы параллельные транзакции не взаимоблокировались
+GOAL_STATS_TRIGGERS = """
+CREATE FUNCTION goals_goal_stats_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO goals_boardgoalstat AS stat (board_id, status, priority, goals_count)
+        SELECT category.board_id, new_goals.status, new_goals.priority, count(*)
+        FROM new_goals JOIN goals_goalcategory category ON category.id = new_goals.category_id
+        GROUP BY 1, 2, 3
+        ORDER BY 1, 2, 3
+        ON CONFLICT (board_id, status, priority) DO UPDATE SET goals_count = stat.goals_count + EXCLUDED.goals_count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO goals_boardgoalstat AS stat (board_id, status, priority, goals_count)
+        SELECT category.board_id, old_goals.status, old_goals.priority, -count(*)
+        FROM old_goals JOIN goals_goalcategory category ON category.id = old_goals.category_id
+        GROUP BY 1, 2, 3
+        ORDER BY 1, 2, 3
+        ON CONFLICT (board_id, status, priority) DO UPDATE SET goals_count = stat.goals_count + EXCLUDED.goals_count;
+    ELSE
+        INSERT INTO goals_boardgoalstat AS stat (board_id, status, priority, goals_count)
+        SELECT changes.board_id, changes.status, changes.priority, sum(changes.delta)
+        FROM (
+            SELECT category.board_id, new_goals.status, new_goals.priority, 1 AS delta
+            FROM new_goals JOIN goals_goalcategory category ON category.id = new_goals.category_id
+            UNION ALL
+            SELECT category.board_id, old_goals.status, old_goals.priority, -1 AS delta
+            FROM old_goals JOIN goals_goalcategory category ON category.id = old_goals.category_id
+        ) AS changes
+        GROUP BY 1, 2, 3
+        HAVING sum(changes.delta) <> 0
+        ORDER BY 1, 2, 3
+        ON CONFLICT (board_id, status, priority) DO UPDATE SET goals_count = stat.goals_count + EXCLUDED.goals_count;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_goal_stats_insert AFTER INSERT ON goals_goal
+    REFERENCING NEW TABLE AS new_goals
+    FOR EACH STATEMENT EXECUTE FUNCTION goals_goal_stats_update();
+CREATE TRIGGER goals_goal_stats_update AFTER UPDATE ON goals_goal
+    REFERENCING OLD TABLE AS old_goals NEW TABLE AS new_goals
+    FOR EACH STATEMENT EXECUTE FUNCTION goals_goal_stats_update();
+CREATE TRIGGER goals_goal_stats_delete AFTER DELETE ON goals_goal
+    REFERENCING OLD TABLE AS old_goals
+    FOR EACH STATEMENT EXECUTE FUNCTION goals_goal_stats_update();
+
+CREATE FUNCTION goals_category_stats_update() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO goals_boardgoalstat AS stat (board_id, status, priority, goals_count)
+    SELECT changes.board_id, goal.status, goal.priority, sum(changes.delta)
+    FROM (
+        SELECT new_categories.id, new_categories.board_id, 1 AS delta
+        FROM new_categories JOIN old_categories ON old_categories.id = new_categories.id
+        WHERE old_categories.board_id <> new_categories.board_id
+        UNION ALL
+        SELECT old_categories.id, old_categories.board_id, -1 AS delta
+        FROM new_categories JOIN old_categories ON old_categories.id = new_categories.id
+        WHERE old_categories.board_id <> new_categories.board_id
+    ) AS changes
+    JOIN goals_goal goal ON goal.category_id = changes.id
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+    ON CONFLICT (board_id, status, priority) DO UPDATE SET goals_count = stat.goals_count + EXCLUDED.goals_count;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_category_stats_update AFTER UPDATE ON goals_goalcategory
+    REFERENCING OLD TABLE AS old_categories NEW TABLE AS new_categories
+    FOR EACH STATEMENT EXECUTE FUNCTION goals_category_stats_update();
+
+INSERT INTO goals_boardgoalstat (board_id, status, priority, goals_count)
+SELECT category.board_id, goal.status, goal.priority, count(*)
+FROM goals_goal goal JOIN goals_goalcategory category ON category.id = goal.category_id
+GROUP BY 1, 2, 3;
+"""
+
+DROP_GOAL_STATS_TRIGGERS = """
+DROP TRIGGER IF EXISTS goals_category_stats_update ON goals_goalcategory;
+DROP TRIGGER IF EXISTS goals_goal_stats_insert ON goals_goal;
+DROP TRIGGER IF EXISTS goals_goal_stats_update ON goals_goal;
+DROP TRIGGER IF EXISTS goals_goal_stats_delete ON goals_goal;
+DROP FUNCTION IF EXISTS goals_category_stats_update();
+DROP FUNCTION IF EXISTS goals_goal_stats_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0008_title_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardGoalStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.PositiveSmallIntegerField(choices=[(1, 'К выполнению'), (2, 'В процессе'), (3, 'Выполнено'), (4, 'Архив')], verbose_name='Статус')),
+                ('priority', models.PositiveSmallIntegerField(choices=[(1, 'Низкий'), (2, 'Средний'), (3, 'Высокий'), (4, 'Критический')], verbose_name='Приоритет')),
+                ('goals_count', models.IntegerField(default=0, verbose_name='Количество целей')),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='goal_stats', to='goals.board', verbose_name='Доска')),
+            ],
+            options={
+                'verbose_name': 'Статистика доски',
+                'verbose_name_plural': 'Статистика досок',
+                'unique_together': {('board', 'status', 'priority')},
+            },
+        ),
+        migrations.RunSQL(GOAL_STATS_TRIGGERS, DROP_GOAL_STATS_TRIGGERS),
+    ]
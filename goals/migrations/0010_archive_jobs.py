@@ -0,0 +1,39 @@
+# Generated by Django 4.2 on 2026-10-18 16:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0009_board_goal_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Дата последнего обновления')),
+                ('status', models.PositiveSmallIntegerField(choices=[(1, 'В очереди'), (2, 'Выполняется'), (3, 'Завершено')], default=1, verbose_name='Статус')),
+                ('goals_total', models.PositiveIntegerField(default=0, verbose_name='Целей к архивированию')),
+                ('goals_archived', models.PositiveIntegerField(default=0, verbose_name='Архивировано целей')),
+                ('categories_deleted', models.PositiveIntegerField(default=0, verbose_name='Удалено категорий')),
+                ('last_goal_id', models.PositiveBigIntegerField(default=0, verbose_name='Последняя обработанная цель')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Запусков')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='Занято обработчиком до')),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archive_jobs', to='goals.board', verbose_name='Доска')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archive_jobs', to='goals.goalcategory', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'Задание архивирования',
+                'verbose_name_plural': 'Задания архивирования',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivejob',
+            index=models.Index(condition=models.Q(('status', 3), _negated=True), fields=['id'], name='goals_archivejob_active_idx'),
+        ),
+    ]
@@ -0,0 +1,154 @@
+# Generated by Django 4.2 on 2026-10-18 16:59
+
+from django.db import migrations, models
+
+# Любое обновление строки доски увеличивает версию ровно на единицу (в том числе instance.save()
+# с устаревшим значением version). Изменения категорий, целей, комментариев и участников
+# касаются доски statement-level триггерами: массовый .update() обновляет каждую доску один раз.
+# Доски блокируются в порядке id, чтобы параллельные транзакции не взаимоблокировались
+BOARD_VERSION_TRIGGERS = """
+CREATE FUNCTION goals_board_version_bump() RETURNS trigger AS $$
+BEGIN
+    NEW.version := OLD.version + 1;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_board_version_bump BEFORE UPDATE ON goals_board
+    FOR EACH ROW EXECUTE FUNCTION goals_board_version_bump();
+
+CREATE FUNCTION goals_touch_boards(board_ids bigint[]) RETURNS void AS $$
+BEGIN
+    PERFORM 1 FROM goals_board WHERE id = ANY(board_ids) ORDER BY id FOR UPDATE;
+    UPDATE goals_board SET updated = now() WHERE id = ANY(board_ids);
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION goals_category_version_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM goals_touch_boards(ARRAY(SELECT DISTINCT board_id FROM new_rows));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM goals_touch_boards(ARRAY(SELECT DISTINCT board_id FROM old_rows));
+    ELSE
+        PERFORM goals_touch_boards(ARRAY(
+            SELECT board_id FROM new_rows UNION SELECT board_id FROM old_rows
+        ));
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION goals_goal_version_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM goals_touch_boards(ARRAY(
+            SELECT DISTINCT category.board_id
+            FROM new_rows JOIN goals_goalcategory category ON category.id = new_rows.category_id
+        ));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM goals_touch_boards(ARRAY(
+            SELECT DISTINCT category.board_id
+            FROM old_rows JOIN goals_goalcategory category ON category.id = old_rows.category_id
+        ));
+    ELSE
+        PERFORM goals_touch_boards(ARRAY(
+            SELECT category.board_id
+            FROM new_rows JOIN goals_goalcategory category ON category.id = new_rows.category_id
+            UNION
+            SELECT category.board_id
+            FROM old_rows JOIN goals_goalcategory category ON category.id = old_rows.category_id
+        ));
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION goals_comment_version_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM goals_touch_boards(ARRAY(
+            SELECT DISTINCT category.board_id
+            FROM new_rows
+            JOIN goals_goal goal ON goal.id = new_rows.goal_id
+            JOIN goals_goalcategory category ON category.id = goal.category_id
+        ));
+    ELSE
+        -- При каскадном удалении цели ее строка уже удалена, такие комментарии пропускаются:
+        -- доску в этом случае обновляет триггер целей
+        PERFORM goals_touch_boards(ARRAY(
+            SELECT DISTINCT category.board_id
+            FROM old_rows
+            JOIN goals_goal goal ON goal.id = old_rows.goal_id
+            JOIN goals_goalcategory category ON category.id = goal.category_id
+        ));
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION goals_participant_version_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM goals_touch_boards(ARRAY(SELECT DISTINCT board_id FROM new_rows));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM goals_touch_boards(ARRAY(SELECT DISTINCT board_id FROM old_rows));
+    ELSE
+        PERFORM goals_touch_boards(ARRAY(
+            SELECT board_id FROM new_rows UNION SELECT board_id FROM old_rows
+        ));
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+VERSION_TABLES = {
+    "goals_goalcategory": "goals_category_version_update",
+    "goals_goal": "goals_goal_version_update",
+    "goals_goalcomment": "goals_comment_version_update",
+    "goals_boardparticipant": "goals_participant_version_update",
+}
+
+for table, function in VERSION_TABLES.items():
+    BOARD_VERSION_TRIGGERS += f"""
+CREATE TRIGGER {table}_version_insert AFTER INSERT ON {table}
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+CREATE TRIGGER {table}_version_update AFTER UPDATE ON {table}
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+CREATE TRIGGER {table}_version_delete AFTER DELETE ON {table}
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+"""
+
+DROP_BOARD_VERSION_TRIGGERS = "".join(
+    f"""
+DROP TRIGGER IF EXISTS {table}_version_insert ON {table};
+DROP TRIGGER IF EXISTS {table}_version_update ON {table};
+DROP TRIGGER IF EXISTS {table}_version_delete ON {table};
+DROP FUNCTION IF EXISTS {function}();
+"""
+    for table, function in VERSION_TABLES.items()
+) + """
+DROP FUNCTION IF EXISTS goals_touch_boards(bigint[]);
+DROP TRIGGER IF EXISTS goals_board_version_bump ON goals_board;
+DROP FUNCTION IF EXISTS goals_board_version_bump();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0010_archive_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='version',
+            field=models.PositiveBigIntegerField(default=1, editable=False, verbose_name='Версия'),
+        ),
+        migrations.RunSQL(BOARD_VERSION_TRIGGERS, DROP_BOARD_VERSION_TRIGGERS),
+    ]
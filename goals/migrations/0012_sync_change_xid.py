@@ -0,0 +1,95 @@
+# Generated by Django 4.2 on 2026-10-18 17:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# change_xid - номер (xid8) транзакции, последней изменившей строку. Синхронизация отдает только строки
+# с change_xid меньше xmin текущего снимка: все такие транзакции уже завершены, поэтому строка,
+# зафиксированная позже, не может оказаться позади курсора клиента (в отличие от updated,
+# который выставляется до фиксации). Существующие строки получают 0 без перезаписи таблиц
+CHANGE_XID_TRIGGERS = """
+CREATE FUNCTION goals_change_xid_update() RETURNS trigger AS $$
+BEGIN
+    NEW.change_xid := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_goal_change_xid BEFORE INSERT OR UPDATE ON goals_goal
+    FOR EACH ROW EXECUTE FUNCTION goals_change_xid_update();
+CREATE TRIGGER goals_goalcategory_change_xid BEFORE INSERT OR UPDATE ON goals_goalcategory
+    FOR EACH ROW EXECUTE FUNCTION goals_change_xid_update();
+CREATE TRIGGER goals_goalcomment_change_xid BEFORE INSERT OR UPDATE ON goals_goalcomment
+    FOR EACH ROW EXECUTE FUNCTION goals_change_xid_update();
+
+CREATE FUNCTION goals_comment_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO goals_deletedgoalcomment (board_id, comment_id, change_xid)
+    SELECT category.board_id, old_rows.id, pg_current_xact_id()::text::bigint
+    FROM old_rows
+    JOIN goals_goal goal ON goal.id = old_rows.goal_id
+    JOIN goals_goalcategory category ON category.id = goal.category_id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_goalcomment_tombstone AFTER DELETE ON goals_goalcomment
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION goals_comment_tombstone();
+"""
+
+DROP_CHANGE_XID_TRIGGERS = """
+DROP TRIGGER IF EXISTS goals_goalcomment_tombstone ON goals_goalcomment;
+DROP FUNCTION IF EXISTS goals_comment_tombstone();
+DROP TRIGGER IF EXISTS goals_goal_change_xid ON goals_goal;
+DROP TRIGGER IF EXISTS goals_goalcategory_change_xid ON goals_goalcategory;
+DROP TRIGGER IF EXISTS goals_goalcomment_change_xid ON goals_goalcomment;
+DROP FUNCTION IF EXISTS goals_change_xid_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0011_board_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedGoalComment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('comment_id', models.BigIntegerField(verbose_name='Комментарий')),
+                ('change_xid', models.BigIntegerField(verbose_name='Транзакция изменения')),
+            ],
+            options={
+                'verbose_name': 'Удаленный комментарий',
+                'verbose_name_plural': 'Удаленные комментарии',
+            },
+        ),
+        migrations.AddField(
+            model_name='goal',
+            name='change_xid',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Транзакция изменения'),
+        ),
+        migrations.AddField(
+            model_name='goalcategory',
+            name='change_xid',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Транзакция изменения'),
+        ),
+        migrations.AddField(
+            model_name='goalcomment',
+            name='change_xid',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Транзакция изменения'),
+        ),
+        migrations.AddField(
+            model_name='deletedgoalcomment',
+            name='board',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deleted_comments', to='goals.board', verbose_name='Доска'),
+        ),
+        migrations.AddIndex(
+            model_name='deletedgoalcomment',
+            index=models.Index(fields=['board', 'change_xid', 'comment_id'], name='goals_deletedcomment_sync_idx'),
+        ),
+        migrations.RunSQL(CHANGE_XID_TRIGGERS, DROP_CHANGE_XID_TRIGGERS),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2 on 2026-10-18 17:07
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0012_sync_change_xid'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(fields=['category', 'change_xid', 'id'], name='goals_goal_sync_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcategory',
+            index=models.Index(fields=['board', 'change_xid', 'id'], name='goals_category_sync_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcomment',
+            index=models.Index(fields=['change_xid', 'id'], name='goals_comment_sync_idx'),
+        ),
+    ]
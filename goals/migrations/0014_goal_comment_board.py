@@ -0,0 +1,161 @@
+# Generated by Django 4.2 on 2026-10-18 18:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# board_id целей и комментариев дублирует доску категории, чтобы списки и проверки прав
+# фильтровались по board_id IN (доски пользователя) без соединений через категорию и цель.
+# BEFORE-триггеры берут доску из категории (для комментария - из цели) при вставке, смене
+# категории или цели и при попытке записать в board_id другое значение. Перенос категории
+# на другую доску переносит ее цели, а изменение доски цели - ее комментарии.
+#
+# Миграция не атомарная, чтобы не держать блокировку таблиц целей и комментариев на время
+# заполнения: сначала создаются триггеры (новые и измененные строки сразу получают доску),
+# затем существующие строки заполняются партиями по диапазонам id, каждая партия - отдельная
+# транзакция. Триггеры при этом включены, поэтому заполненные строки один раз получают новый
+# change_xid (клиенты синхронизации перечитают их), а версии досок растут. NOT NULL добавляется
+# через проверенное ограничение CHECK, чтобы SET NOT NULL не сканировал таблицу под блокировкой
+BACKFILL_BATCH_SIZE = 5000
+
+BACKFILL_GOALS = """
+UPDATE goals_goal goal SET board_id = category.board_id
+FROM goals_goalcategory category
+WHERE category.id = goal.category_id AND goal.board_id IS NULL AND goal.id > %s AND goal.id <= %s
+"""
+
+BACKFILL_COMMENTS = """
+UPDATE goals_goalcomment comment SET board_id = goal.board_id
+FROM goals_goal goal
+WHERE goal.id = comment.goal_id AND comment.board_id IS NULL AND comment.id > %s AND comment.id <= %s
+"""
+
+
+def backfill_board(apps, schema_editor) -> None:
+    with schema_editor.connection.cursor() as cursor:
+        for table, statement in (('goals_goal', BACKFILL_GOALS), ('goals_goalcomment', BACKFILL_COMMENTS)):
+            cursor.execute(f'SELECT coalesce(max(id), 0) FROM {table}')
+            max_id = cursor.fetchone()[0]
+            for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+                cursor.execute(statement, [start, start + BACKFILL_BATCH_SIZE])
+
+
+def set_not_null(table: str) -> list[str]:
+    constraint = f'{table}_board_id_not_null'
+    return [
+        f'ALTER TABLE {table} ADD CONSTRAINT {constraint} CHECK (board_id IS NOT NULL) NOT VALID',
+        f'ALTER TABLE {table} VALIDATE CONSTRAINT {constraint}',
+        f'ALTER TABLE {table} ALTER COLUMN board_id SET NOT NULL',
+        f'ALTER TABLE {table} DROP CONSTRAINT {constraint}',
+    ]
+
+
+BOARD_TRIGGERS = """
+CREATE FUNCTION goals_goal_board_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' OR NEW.category_id IS DISTINCT FROM OLD.category_id
+            OR NEW.board_id IS DISTINCT FROM OLD.board_id THEN
+        SELECT board_id INTO NEW.board_id FROM goals_goalcategory WHERE id = NEW.category_id;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_goal_board BEFORE INSERT OR UPDATE ON goals_goal
+    FOR EACH ROW EXECUTE FUNCTION goals_goal_board_update();
+
+CREATE FUNCTION goals_comment_board_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' OR NEW.goal_id IS DISTINCT FROM OLD.goal_id
+            OR NEW.board_id IS DISTINCT FROM OLD.board_id THEN
+        SELECT board_id INTO NEW.board_id FROM goals_goal WHERE id = NEW.goal_id;
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_goalcomment_board BEFORE INSERT OR UPDATE ON goals_goalcomment
+    FOR EACH ROW EXECUTE FUNCTION goals_comment_board_update();
+
+CREATE FUNCTION goals_category_board_move() RETURNS trigger AS $$
+BEGIN
+    UPDATE goals_goal goal SET board_id = new_rows.board_id
+    FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+    WHERE goal.category_id = new_rows.id AND new_rows.board_id <> old_rows.board_id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_goalcategory_board_move AFTER UPDATE ON goals_goalcategory
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION goals_category_board_move();
+
+CREATE FUNCTION goals_goal_board_move() RETURNS trigger AS $$
+BEGIN
+    UPDATE goals_goalcomment comment SET board_id = new_rows.board_id
+    FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+    WHERE comment.goal_id = new_rows.id AND new_rows.board_id <> old_rows.board_id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_goal_board_move AFTER UPDATE ON goals_goal
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION goals_goal_board_move();
+"""
+
+DROP_BOARD_TRIGGERS = """
+DROP TRIGGER IF EXISTS goals_goal_board_move ON goals_goal;
+DROP FUNCTION IF EXISTS goals_goal_board_move();
+DROP TRIGGER IF EXISTS goals_goalcategory_board_move ON goals_goalcategory;
+DROP FUNCTION IF EXISTS goals_category_board_move();
+DROP TRIGGER IF EXISTS goals_goalcomment_board ON goals_goalcomment;
+DROP FUNCTION IF EXISTS goals_comment_board_update();
+DROP TRIGGER IF EXISTS goals_goal_board ON goals_goal;
+DROP FUNCTION IF EXISTS goals_goal_board_update();
+"""
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0013_sync_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='board',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='goals', to='goals.board', verbose_name='Доска'),
+        ),
+        migrations.AddField(
+            model_name='goalcomment',
+            name='board',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='comments', to='goals.board', verbose_name='Доска'),
+        ),
+        migrations.RunSQL(BOARD_TRIGGERS, DROP_BOARD_TRIGGERS),
+        migrations.RunPython(backfill_board, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    set_not_null('goals_goal'), 'ALTER TABLE goals_goal ALTER COLUMN board_id DROP NOT NULL'
+                ),
+                migrations.RunSQL(
+                    set_not_null('goals_goalcomment'),
+                    'ALTER TABLE goals_goalcomment ALTER COLUMN board_id DROP NOT NULL',
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='goal',
+                    name='board',
+                    field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='goals', to='goals.board', verbose_name='Доска'),
+                ),
+                migrations.AlterField(
+                    model_name='goalcomment',
+                    name='board',
+                    field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='comments', to='goals.board', verbose_name='Доска'),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2 on 2026-10-18 18:20
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0014_goal_comment_board'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4), _negated=True), fields=['board', 'title'], name='goals_goal_board_title_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4), _negated=True), fields=['board', 'created'], name='goals_goal_board_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(fields=['board', 'change_xid', 'id'], name='goals_goal_board_sync_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcomment',
+            index=models.Index(fields=['board', 'change_xid', 'id'], name='goals_comment_board_sync_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='goal',
+            name='goals_goal_title_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='goal',
+            name='goals_goal_created_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='goal',
+            name='goals_goal_sync_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='goalcomment',
+            name='goals_comment_sync_idx',
+        ),
+    ]
@@ -0,0 +1,100 @@
+from django.db import migrations
+
+# Счетчики не должны ссылаться на удаленные доски: ограничения внешних ключей проверяются
+# при фиксации транзакции, поэтому цели доски могут удаляться и до, и после самой доски.
+# Триггеры счетчиков пропускают доски, которых уже нет, а удаление доски удаляет ее счетчики,
+# в том числе созданные удалением ее целей раньше в той же транзакции
+GOAL_STATS_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION goals_goal_stats_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO goals_boardgoalstat AS stat (board_id, status, priority, goals_count)
+        SELECT category.board_id, new_goals.status, new_goals.priority, count(*)
+        FROM new_goals
+        JOIN goals_goalcategory category ON category.id = new_goals.category_id
+        JOIN goals_board board ON board.id = category.board_id
+        GROUP BY 1, 2, 3
+        ORDER BY 1, 2, 3
+        ON CONFLICT (board_id, status, priority) DO UPDATE SET goals_count = stat.goals_count + EXCLUDED.goals_count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO goals_boardgoalstat AS stat (board_id, status, priority, goals_count)
+        SELECT category.board_id, old_goals.status, old_goals.priority, -count(*)
+        FROM old_goals
+        JOIN goals_goalcategory category ON category.id = old_goals.category_id
+        JOIN goals_board board ON board.id = category.board_id
+        GROUP BY 1, 2, 3
+        ORDER BY 1, 2, 3
+        ON CONFLICT (board_id, status, priority) DO UPDATE SET goals_count = stat.goals_count + EXCLUDED.goals_count;
+    ELSE
+        INSERT INTO goals_boardgoalstat AS stat (board_id, status, priority, goals_count)
+        SELECT changes.board_id, changes.status, changes.priority, sum(changes.delta)
+        FROM (
+            SELECT category.board_id, new_goals.status, new_goals.priority, 1 AS delta
+            FROM new_goals JOIN goals_goalcategory category ON category.id = new_goals.category_id
+            UNION ALL
+            SELECT category.board_id, old_goals.status, old_goals.priority, -1 AS delta
+            FROM old_goals JOIN goals_goalcategory category ON category.id = old_goals.category_id
+        ) AS changes
+        JOIN goals_board board ON board.id = changes.board_id
+        GROUP BY 1, 2, 3
+        HAVING sum(changes.delta) <> 0
+        ORDER BY 1, 2, 3
+        ON CONFLICT (board_id, status, priority) DO UPDATE SET goals_count = stat.goals_count + EXCLUDED.goals_count;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION goals_category_stats_update() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO goals_boardgoalstat AS stat (board_id, status, priority, goals_count)
+    SELECT changes.board_id, goal.status, goal.priority, sum(changes.delta)
+    FROM (
+        SELECT new_categories.id, new_categories.board_id, 1 AS delta
+        FROM new_categories JOIN old_categories ON old_categories.id = new_categories.id
+        WHERE old_categories.board_id <> new_categories.board_id
+        UNION ALL
+        SELECT old_categories.id, old_categories.board_id, -1 AS delta
+        FROM new_categories JOIN old_categories ON old_categories.id = new_categories.id
+        WHERE old_categories.board_id <> new_categories.board_id
+    ) AS changes
+    JOIN goals_board board ON board.id = changes.board_id
+    JOIN goals_goal goal ON goal.category_id = changes.id
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+    ON CONFLICT (board_id, status, priority) DO UPDATE SET goals_count = stat.goals_count + EXCLUDED.goals_count;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+BOARD_STATS_DELETE_TRIGGER = """
+CREATE FUNCTION goals_board_stats_delete() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM goals_boardgoalstat WHERE board_id IN (SELECT id FROM old_boards);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_board_stats_delete AFTER DELETE ON goals_board
+    REFERENCING OLD TABLE AS old_boards
+    FOR EACH STATEMENT EXECUTE FUNCTION goals_board_stats_delete();
+"""
+
+DROP_BOARD_STATS_DELETE_TRIGGER = """
+DROP TRIGGER IF EXISTS goals_board_stats_delete ON goals_board;
+DROP FUNCTION IF EXISTS goals_board_stats_delete();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0015_board_indexes'),
+    ]
+
+    operations = [
+        # Для существующих досок новые функции считают так же, как прежние, поэтому откат их не меняет
+        migrations.RunSQL(GOAL_STATS_FUNCTIONS, migrations.RunSQL.noop),
+        migrations.RunSQL(BOARD_STATS_DELETE_TRIGGER, DROP_BOARD_STATS_DELETE_TRIGGER),
+    ]
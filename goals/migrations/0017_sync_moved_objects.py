@@ -0,0 +1,107 @@
+# Generated by Django 4.2 on 2026-10-18 18:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Строка, перенесенная на другую доску, пропадает из синхронизации прежней доски, поэтому перенос
+# записывается как tombstone прежней доски: категории - в goals_movedgoalcategory, цели -
+# в goals_movedgoal, комментарии - в goals_deletedgoalcomment (для клиента прежней доски комментарий
+# удален). Перенос категории переносит ее цели и комментарии (миграция 0014), поэтому tombstone
+# получают и они
+MOVED_TOMBSTONE_TRIGGERS = """
+CREATE FUNCTION goals_category_moved_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO goals_movedgoalcategory (board_id, category_id, change_xid)
+    SELECT old_rows.board_id, old_rows.id, pg_current_xact_id()::text::bigint
+    FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+    WHERE new_rows.board_id <> old_rows.board_id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_goalcategory_moved_tombstone AFTER UPDATE ON goals_goalcategory
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION goals_category_moved_tombstone();
+
+CREATE FUNCTION goals_goal_moved_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO goals_movedgoal (board_id, goal_id, change_xid)
+    SELECT old_rows.board_id, old_rows.id, pg_current_xact_id()::text::bigint
+    FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+    WHERE new_rows.board_id <> old_rows.board_id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_goal_moved_tombstone AFTER UPDATE ON goals_goal
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION goals_goal_moved_tombstone();
+
+CREATE FUNCTION goals_comment_moved_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO goals_deletedgoalcomment (board_id, comment_id, change_xid)
+    SELECT old_rows.board_id, old_rows.id, pg_current_xact_id()::text::bigint
+    FROM new_rows JOIN old_rows ON old_rows.id = new_rows.id
+    WHERE new_rows.board_id <> old_rows.board_id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_goalcomment_moved_tombstone AFTER UPDATE ON goals_goalcomment
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION goals_comment_moved_tombstone();
+"""
+
+DROP_MOVED_TOMBSTONE_TRIGGERS = """
+DROP TRIGGER IF EXISTS goals_goalcomment_moved_tombstone ON goals_goalcomment;
+DROP FUNCTION IF EXISTS goals_comment_moved_tombstone();
+DROP TRIGGER IF EXISTS goals_goal_moved_tombstone ON goals_goal;
+DROP FUNCTION IF EXISTS goals_goal_moved_tombstone();
+DROP TRIGGER IF EXISTS goals_goalcategory_moved_tombstone ON goals_goalcategory;
+DROP FUNCTION IF EXISTS goals_category_moved_tombstone();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0016_board_stats_deleted_boards'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovedGoalCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category_id', models.BigIntegerField(verbose_name='Категория')),
+                ('change_xid', models.BigIntegerField(verbose_name='Транзакция изменения')),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='moved_categories', to='goals.board', verbose_name='Доска')),
+            ],
+            options={
+                'verbose_name': 'Перенесенная категория',
+                'verbose_name_plural': 'Перенесенные категории',
+            },
+        ),
+        migrations.CreateModel(
+            name='MovedGoal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('goal_id', models.BigIntegerField(verbose_name='Цель')),
+                ('change_xid', models.BigIntegerField(verbose_name='Транзакция изменения')),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='moved_goals', to='goals.board', verbose_name='Доска')),
+            ],
+            options={
+                'verbose_name': 'Перенесенная цель',
+                'verbose_name_plural': 'Перенесенные цели',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='movedgoalcategory',
+            index=models.Index(fields=['board', 'change_xid', 'category_id'], name='goals_movedcategory_sync_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movedgoal',
+            index=models.Index(fields=['board', 'change_xid', 'goal_id'], name='goals_movedgoal_sync_idx'),
+        ),
+        migrations.RunSQL(MOVED_TOMBSTONE_TRIGGERS, DROP_MOVED_TOMBSTONE_TRIGGERS),
+    ]
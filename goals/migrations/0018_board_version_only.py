@@ -0,0 +1,36 @@
+from django.db import migrations
+
+# Записи категорий, целей, комментариев и участников меняют только version доски: updated остается
+# временем изменения самой доски. Строки досок блокируются в порядке id в режиме FOR NO KEY UPDATE,
+# который не конфликтует с проверками внешних ключей (FOR KEY SHARE) при вставке строк доски.
+# Цена версии в строке доски: транзакции, пишущие на одну доску, выполняют обновление ее строки
+# по очереди, блокировка держится до фиксации. Массовые операции и пакеты архивирования обновляют
+# доску один раз на запрос, поэтому их стоит держать короткими
+TOUCH_BOARDS = """
+CREATE OR REPLACE FUNCTION goals_touch_boards(board_ids bigint[]) RETURNS void AS $$
+BEGIN
+    UPDATE goals_board SET version = version + 1
+    WHERE id IN (SELECT id FROM goals_board WHERE id = ANY(board_ids) ORDER BY id FOR NO KEY UPDATE);
+END
+$$ LANGUAGE plpgsql;
+"""
+
+PREVIOUS_TOUCH_BOARDS = """
+CREATE OR REPLACE FUNCTION goals_touch_boards(board_ids bigint[]) RETURNS void AS $$
+BEGIN
+    PERFORM 1 FROM goals_board WHERE id = ANY(board_ids) ORDER BY id FOR UPDATE;
+    UPDATE goals_board SET updated = now() WHERE id = ANY(board_ids);
+END
+$$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0017_sync_moved_objects'),
+    ]
+
+    operations = [
+        migrations.RunSQL(TOUCH_BOARDS, PREVIOUS_TOUCH_BOARDS),
+    ]
@@ -1,3 +1,5 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from core.models import User
@@ -10,8 +12,15 @@ class Board(BaseModel):
     """
     title = models.CharField(verbose_name="Название", max_length=260)
     is_deleted = models.BooleanField(verbose_name="Удалена", default=False)
+    # Увеличивается триггером в базе при любом изменении доски, ее категорий, целей, комментариев
+    # и участников (см. миграции 0011_board_version и 0018_board_version_only), используется для ETag.
+    # updated меняется только при изменении самой доски
+    version = models.PositiveBigIntegerField(verbose_name="Версия", default=1, editable=False)
 
     class Meta:
+        indexes = [
+            GinIndex(fields=["title"], name="goals_board_title_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
         verbose_name = "Доска"
         verbose_name_plural = "Доски"
 
@@ -48,6 +57,9 @@ class BoardParticipant(BaseModel):
 
     class Meta:
         unique_together = ("board", "user")
+        indexes = [
+            models.Index(fields=["user", "board", "role"], name="goals_participant_user_idx"),
+        ]
         verbose_name = "Участник"
         verbose_name_plural = "Участники"
 
@@ -60,11 +72,23 @@ class GoalCategory(BaseModel):
     user = models.ForeignKey(User, verbose_name="Автор", on_delete=models.PROTECT)
     is_deleted = models.BooleanField(verbose_name="Удалена", default=False)
     board = models.ForeignKey(to=Board, verbose_name="Доска", on_delete=models.PROTECT, related_name="categories")
+    # Номер транзакции последнего изменения, заполняется триггером в базе (см. миграцию 0012_sync_change_xid)
+    change_xid = models.BigIntegerField(verbose_name="Транзакция изменения", default=0, editable=False)
 
     def __str__(self):
         return self.title
 
     class Meta:
+        indexes = [
+            models.Index(
+                fields=["board", "title"], name="goals_category_title_idx", condition=models.Q(is_deleted=False)
+            ),
+            models.Index(
+                fields=["board", "created"], name="goals_category_created_idx", condition=models.Q(is_deleted=False)
+            ),
+            GinIndex(fields=["title"], name="goals_category_title_trgm_idx", opclasses=["gin_trgm_ops"]),
+            models.Index(fields=["board", "change_xid", "id"], name="goals_category_sync_idx"),
+        ]
         verbose_name = "Категория"
         verbose_name_plural = "Категории"
 
@@ -96,11 +120,34 @@ class Goal(BaseModel):
     priority = models.PositiveSmallIntegerField(
         verbose_name="Приоритет", choices=Priority.choices, default=Priority.medium
     )
+    # Доска категории, заполняется триггером в базе при создании цели, смене категории
+    # и переносе категории на другую доску (см. миграцию 0014_goal_comment_board)
+    board = models.ForeignKey(
+        to=Board,
+        verbose_name="Доска",
+        on_delete=models.PROTECT,
+        related_name="goals",
+        editable=False,
+        db_index=False,
+    )
+    # Заполняется триггером в базе из title и description (см. миграцию 0006_goal_search_vector)
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Номер транзакции последнего изменения, заполняется триггером в базе (см. миграцию 0012_sync_change_xid)
+    change_xid = models.BigIntegerField(verbose_name="Транзакция изменения", default=0, editable=False)
 
     def __str__(self):
         return self.title
 
     class Meta:
+        # Частичные индексы только по неархивным целям (status=4 - Goal.Status.archived)
+        indexes = [
+            models.Index(fields=["board", "title"], name="goals_goal_board_title_idx", condition=~models.Q(status=4)),
+            models.Index(
+                fields=["board", "created"], name="goals_goal_board_created_idx", condition=~models.Q(status=4)
+            ),
+            GinIndex(fields=["search_vector"], name="goals_goal_search_idx"),
+            models.Index(fields=["board", "change_xid", "id"], name="goals_goal_board_sync_idx"),
+        ]
         verbose_name = "Цель"
         verbose_name_plural = "Цели"
 
@@ -112,10 +159,157 @@ class GoalComment(BaseModel):
     text = models.TextField()
     user = models.ForeignKey(to=User, on_delete=models.PROTECT)
     goal = models.ForeignKey(to=Goal, on_delete=models.CASCADE)
+    # Доска цели, заполняется триггером в базе (см. миграцию 0014_goal_comment_board)
+    board = models.ForeignKey(
+        to=Board,
+        verbose_name="Доска",
+        on_delete=models.PROTECT,
+        related_name="comments",
+        editable=False,
+        db_index=False,
+    )
+    # Номер транзакции последнего изменения, заполняется триггером в базе (см. миграцию 0012_sync_change_xid)
+    change_xid = models.BigIntegerField(verbose_name="Транзакция изменения", default=0, editable=False)
 
     def __str__(self):
         return self.text
 
     class Meta:
+        indexes = [
+            models.Index(fields=["goal", "created"], name="goals_comment_created_idx"),
+            models.Index(fields=["board", "change_xid", "id"], name="goals_comment_board_sync_idx"),
+        ]
         verbose_name = "Комментарий"
         verbose_name_plural = "Комментарии"
+
+
+class DeletedGoalComment(models.Model):
+    """
+    Модель записей об удаленных комментариях для синхронизации клиентов (goals/sync).
+    Заполняется триггером в базе при удалении комментария и при переносе его цели на другую доску
+    """
+    board = models.ForeignKey(
+        to=Board,
+        verbose_name="Доска",
+        on_delete=models.CASCADE,
+        related_name="deleted_comments",
+    )
+    comment_id = models.BigIntegerField(verbose_name="Комментарий")
+    change_xid = models.BigIntegerField(verbose_name="Транзакция изменения")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["board", "change_xid", "comment_id"], name="goals_deletedcomment_sync_idx"),
+        ]
+        verbose_name = "Удаленный комментарий"
+        verbose_name_plural = "Удаленные комментарии"
+
+
+class MovedGoalCategory(models.Model):
+    """
+    Модель записей о категориях, перенесенных на другую доску, для синхронизации клиентов (goals/sync):
+    board - доска, с которой категория ушла. Заполняется триггером в базе
+    """
+    board = models.ForeignKey(
+        to=Board,
+        verbose_name="Доска",
+        on_delete=models.CASCADE,
+        related_name="moved_categories",
+    )
+    category_id = models.BigIntegerField(verbose_name="Категория")
+    change_xid = models.BigIntegerField(verbose_name="Транзакция изменения")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["board", "change_xid", "category_id"], name="goals_movedcategory_sync_idx"),
+        ]
+        verbose_name = "Перенесенная категория"
+        verbose_name_plural = "Перенесенные категории"
+
+
+class MovedGoal(models.Model):
+    """
+    Модель записей о целях, перенесенных на другую доску (вместе с категорией или сменой категории),
+    для синхронизации клиентов (goals/sync): board - доска, с которой цель ушла. Заполняется триггером в базе
+    """
+    board = models.ForeignKey(
+        to=Board,
+        verbose_name="Доска",
+        on_delete=models.CASCADE,
+        related_name="moved_goals",
+    )
+    goal_id = models.BigIntegerField(verbose_name="Цель")
+    change_xid = models.BigIntegerField(verbose_name="Транзакция изменения")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["board", "change_xid", "goal_id"], name="goals_movedgoal_sync_idx"),
+        ]
+        verbose_name = "Перенесенная цель"
+        verbose_name_plural = "Перенесенные цели"
+
+
+class BoardGoalStat(models.Model):
+    """
+    Модель счетчиков целей доски в разрезе статуса и приоритета. Счетчики поддерживаются
+    триггерами в базе (см. миграции 0009_board_goal_stats и 0016_board_stats_deleted_boards), в том числе при массовых
+    .update(), и пересчитываются командой rebuild_board_stats
+    """
+    board = models.ForeignKey(
+        to=Board,
+        verbose_name="Доска",
+        on_delete=models.CASCADE,
+        related_name="goal_stats",
+    )
+    status = models.PositiveSmallIntegerField(verbose_name="Статус", choices=Goal.Status.choices)
+    priority = models.PositiveSmallIntegerField(verbose_name="Приоритет", choices=Goal.Priority.choices)
+    goals_count = models.IntegerField(verbose_name="Количество целей", default=0)
+
+    class Meta:
+        unique_together = ("board", "status", "priority")
+        verbose_name = "Статистика доски"
+        verbose_name_plural = "Статистика досок"
+
+
+class ArchiveJob(BaseModel):
+    """
+    Модель фонового задания на архивирование целей и удаление категорий удаленной доски
+    (или целей удаленной категории). Задания выполняет команда archive_worker партиями
+    по первичному ключу, прогресс сохраняется после каждой партии
+    """
+    class Status(models.IntegerChoices):
+        pending = 1, "В очереди"
+        running = 2, "Выполняется"
+        done = 3, "Завершено"
+
+    board = models.ForeignKey(
+        to=Board,
+        verbose_name="Доска",
+        on_delete=models.PROTECT,
+        related_name="archive_jobs",
+    )
+    category = models.ForeignKey(
+        to=GoalCategory,
+        verbose_name="Категория",
+        on_delete=models.PROTECT,
+        related_name="archive_jobs",
+        null=True,
+        blank=True,
+    )
+    status = models.PositiveSmallIntegerField(verbose_name="Статус", choices=Status.choices, default=Status.pending)
+    goals_total = models.PositiveIntegerField(verbose_name="Целей к архивированию", default=0)
+    goals_archived = models.PositiveIntegerField(verbose_name="Архивировано целей", default=0)
+    categories_deleted = models.PositiveIntegerField(verbose_name="Удалено категорий", default=0)
+    last_goal_id = models.PositiveBigIntegerField(verbose_name="Последняя обработанная цель", default=0)
+    attempts = models.PositiveIntegerField(verbose_name="Запусков", default=0)
+    locked_until = models.DateTimeField(verbose_name="Занято обработчиком до", null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.board} ({self.get_status_display()})"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["id"], name="goals_archivejob_active_idx", condition=~models.Q(status=3)),
+        ]
+        verbose_name = "Задание архивирования"
+        verbose_name_plural = "Задания архивирования"
@@ -0,0 +1,188 @@
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import Cursor, CursorPagination, LimitOffsetPagination
+
+
+class GoalsCursorPagination(CursorPagination):
+    """
+    Курсорная (keyset) пагинация по составному ключу (поле сортировки, pk). Сортировка берется
+    из OrderingFilter представления (т.е. учитывает ?ordering= и ordering_fields); позиция в курсоре -
+    пара значений последней строки, поэтому одинаковые значения поля не приводят к пропускам
+    и повторам строк, а запрос не использует OFFSET
+    """
+    page_size = 100
+    page_size_query_param = 'limit'
+    max_page_size = 1000
+
+    def get_ordering(self, request, queryset, view) -> tuple[str, ...]:
+        ordering = tuple(
+            field.replace('id', 'pk') if field.lstrip('-') == 'id' else field
+            for field in super().get_ordering(request, queryset, view)
+        )
+        fields = [field for field in ordering if field.lstrip('-') != 'pk']
+        if len(fields) > 1:
+            raise ValidationError({'ordering': ['Cursor pagination supports ordering by a single field']})
+        if not fields:
+            return ordering[:1] or ('pk',)
+
+        field = fields[0]
+        self._validate_field(queryset, field.lstrip('-'))
+        return field, '-pk' if field.startswith('-') else 'pk'
+
+    def _validate_field(self, queryset: QuerySet, name: str) -> None:
+        try:
+            model_field = queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            model_field = None
+        values_fields = getattr(queryset, '_fields', None)
+        if (
+            model_field is None or not model_field.concrete or model_field.is_relation or model_field.null
+            or (values_fields and name not in values_fields)
+        ):
+            raise ValidationError({'ordering': [f'Cursor pagination does not support ordering by {name}']})
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self._decode_position(self.cursor, queryset)
+
+        if position is not None:
+            queryset = queryset.filter(self._after(position, reverse))
+        ordering = self.ordering
+        if reverse:
+            ordering = [field[1:] if field.startswith('-') else '-' + field for field in ordering]
+        results = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following = len(results) > self.page_size
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_following
+        else:
+            self.has_next, self.has_previous = has_following, position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def _after(self, position: list, reverse: bool) -> Q:
+        """
+        Условие "строка после позиции" для составного ключа в порядке сортировки
+        (для обратного курсора - "строка до позиции")
+        """
+        condition = None
+        for field, value in reversed(list(zip(self.ordering, position))):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') != reverse else 'gt'
+            beyond = Q(**{f'{name}__{lookup}': value})
+            condition = beyond if condition is None else beyond | Q(**{name: value}) & condition
+        return condition
+
+    def _decode_position(self, cursor: Cursor | None, queryset: QuerySet) -> list | None:
+        """
+        Позиция из курсора, значения приведены к типам полей сортировки: курсор приходит от клиента,
+        и поврежденное значение должно давать 404, а не ошибку запроса к базе
+        """
+        if cursor is None or cursor.position is None:
+            return None
+        try:
+            position = json.loads(cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        values = []
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            model_field = queryset.model._meta.pk if name == 'pk' else queryset.model._meta.get_field(name)
+            try:
+                value = model_field.to_python(value)
+                model_field.run_validators(value)
+            except (DjangoValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            values.append(value)
+        return values
+
+    def _get_position_from_instance(self, instance, ordering) -> str:
+        values = []
+        for field in ordering:
+            name = field.lstrip('-')
+            if isinstance(instance, dict):
+                # Строки .values() содержат первичный ключ под именем id
+                value = instance['id' if name == 'pk' else name]
+            else:
+                value = getattr(instance, name)
+            values.append(value if isinstance(value, (int, str)) else str(value))
+        return json.dumps(values, separators=(',', ':'))
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        position = self._get_position_from_instance(self.page[-1], self.ordering) if self.page \
+            else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous:
+            return None
+        position = self._get_position_from_instance(self.page[0], self.ordering) if self.page \
+            else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+
+class GoalsPagination(LimitOffsetPagination):
+    """
+    Пагинация списков целей, категорий и комментариев. По умолчанию limit/offset,
+    при ?pagination=cursor или переданном ?cursor= переключается на курсорную
+    пагинацию, которая не делает OFFSET и COUNT(*) по всей выборке
+    """
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    cursor_pagination_class = GoalsCursorPagination
+    cursor_paginator: CursorPagination | None = None
+
+    def use_cursor(self, request) -> bool:
+        return (
+            request.query_params.get(self.mode_query_param) == self.cursor_mode
+            or self.cursor_pagination_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        cursor_parameters = self.cursor_pagination_class().get_schema_operation_parameters(view)
+        parameters.append({
+            'name': self.mode_query_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Set to "cursor" to use cursor pagination.',
+            'schema': {'type': 'string', 'enum': [self.cursor_mode]},
+        })
+        return parameters + [
+            parameter for parameter in cursor_parameters
+            if parameter['name'] == self.cursor_pagination_class.cursor_query_param
+        ]
@@ -1,10 +1,9 @@
-from typing import Any
-
 from rest_framework.generics import GenericAPIView
 from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
 from rest_framework.request import Request
 
-from goals.models import Board, BoardParticipant, GoalCategory, Goal, GoalComment
+from goals.models import ArchiveJob, Board, GoalCategory, Goal, GoalComment
+from goals.roles import BoardRoles
 
 
 class BoardPermission(IsAuthenticated):
@@ -13,11 +12,11 @@ class BoardPermission(IsAuthenticated):
     кто отсутствует в списке участников
     """
     def has_object_permission(self, request: Request, view: GenericAPIView, obj: Board) -> bool:
-        _filters: dict[str, Any] = {"user": request.user, "board": obj}
+        board_roles = BoardRoles.for_request(request)
         if request.method not in SAFE_METHODS:
-            _filters["role"] = BoardParticipant.Role.owner
+            return board_roles.is_owner(obj.id)
 
-        return BoardParticipant.objects.filter(**_filters).exists()
+        return board_roles.has_role(obj.id)
 
 
 class GoalCategoryPermission(IsAuthenticated):
@@ -26,11 +25,11 @@ class GoalCategoryPermission(IsAuthenticated):
     пользователей, которые не имеют роль редактор или владелец
     """
     def has_object_permission(self, request: Request, view: GenericAPIView, obj: GoalCategory) -> bool:
-        _filters: dict[str, Any] = {"user": request.user, "board": obj.board}
+        board_roles = BoardRoles.for_request(request)
         if request.method not in SAFE_METHODS:
-            _filters["role__in"] = [BoardParticipant.Role.owner, BoardParticipant.Role.writer]
+            return board_roles.can_write(obj.board_id)
 
-        return BoardParticipant.objects.filter(**_filters).exists()
+        return board_roles.has_role(obj.board_id)
 
 
 class GoalPermission(IsAuthenticated):
@@ -39,11 +38,11 @@ class GoalPermission(IsAuthenticated):
     пользователей, которые не имеют роль редактор или владелец
     """
     def has_object_permission(self, request: Request, view: GenericAPIView, obj: Goal) -> bool:
-        _filters: dict[str, Any] = {"user": request.user, "board": obj.category.board}
+        board_roles = BoardRoles.for_request(request)
         if request.method not in SAFE_METHODS:
-            _filters["role__in"] = [BoardParticipant.Role.owner, BoardParticipant.Role.writer]
+            return board_roles.can_write(obj.board_id)
 
-        return BoardParticipant.objects.filter(**_filters).exists()
+        return board_roles.has_role(obj.board_id)
 
 
 class GoalCommentPermission(IsAuthenticated):
@@ -55,3 +54,12 @@ class GoalCommentPermission(IsAuthenticated):
         if request.method in SAFE_METHODS:
             return True
         return obj.user == request.user
+
+
+class ArchiveJobPermission(IsAuthenticated):
+    """
+    Класс ArchiveJobPermission служит для ограничения доступа к заданию архивирования
+    для пользователей, кто не был участником доски
+    """
+    def has_object_permission(self, request: Request, view: GenericAPIView, obj: ArchiveJob) -> bool:
+        return BoardRoles.for_request(request).has_role(obj.board_id)
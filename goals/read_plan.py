@@ -0,0 +1,96 @@
+from functools import lru_cache
+from typing import Any, Callable, Iterable, NamedTuple
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import QuerySet
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+class PlanField(NamedTuple):
+    name: str
+    lookup: str | None
+    convert: Callable[[Any], Any] | None
+    nested: tuple['PlanField', ...] | None
+
+
+# Поля, у которых to_representation не меняет значения, прочитанные из базы
+IDENTITY_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.ReadOnlyField,
+    serializers.ModelField,
+)
+
+
+class ValuesPlan:
+    """
+    Предкомпилированный план сериализации только для чтения: поля сериализатора один раз
+    раскладываются в список колонок для .values() и функций преобразования, после чего строки
+    выборки превращаются в словари без создания экземпляров моделей и вложенных сериализаторов.
+    Результат совпадает с serializer.data байт в байт
+    """
+    def __init__(self, serializer: serializers.Serializer) -> None:
+        self.columns: list[str] = []
+        self.fields = self._compile(serializer, prefix='')
+
+    def _compile(self, serializer: serializers.Serializer, prefix: str) -> tuple[PlanField, ...]:
+        plan = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if field.source == '*' or '.' in field.source or isinstance(field, serializers.ListSerializer):
+                raise ImproperlyConfigured(f'Field {name} of {type(serializer).__name__} is not supported')
+
+            lookup = prefix + field.source
+            if isinstance(field, serializers.Serializer):
+                plan.append(PlanField(name, None, None, self._compile(field, lookup + '__')))
+                continue
+
+            self.columns.append(lookup)
+            if isinstance(field, IDENTITY_FIELDS) or (
+                isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None
+            ):
+                plan.append(PlanField(name, lookup, None, None))
+            else:
+                plan.append(PlanField(name, lookup, field.to_representation, None))
+        return tuple(plan)
+
+    def values(self, queryset: QuerySet) -> QuerySet:
+        return queryset.values(*self.columns)
+
+    def render(self, rows: Iterable[dict]) -> list[dict]:
+        return [self._render_row(self.fields, row) for row in rows]
+
+    def _render_row(self, fields: tuple[PlanField, ...], row: dict) -> dict:
+        data = {}
+        for name, lookup, convert, nested in fields:
+            if nested is not None:
+                nested_data = self._render_row(nested, row)
+                # Пустая (NULL) связь сериализуется как null, как это делает вложенный сериализатор
+                data[name] = None if all(value is None for value in nested_data.values()) else nested_data
+                continue
+            value = row[lookup]
+            data[name] = value if convert is None or value is None else convert(value)
+        return data
+
+
+@lru_cache(maxsize=None)
+def plan_for(serializer_class: type[serializers.Serializer]) -> ValuesPlan:
+    return ValuesPlan(serializer_class())
+
+
+class ValuesListMixin:
+    """
+    Примесь для ListAPIView: список строится через ValuesPlan сериализатора представления
+    вместо ModelSerializer(many=True). Фильтрация, сортировка и пагинация не меняются
+    """
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        plan = plan_for(self.get_serializer_class())
+        queryset = plan.values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(plan.render(page))
+        return Response(plan.render(queryset))
@@ -0,0 +1,53 @@
+from typing import Iterable
+
+from rest_framework.request import Request
+
+from goals.models import BoardParticipant
+
+WRITE_ROLES = (BoardParticipant.Role.owner, BoardParticipant.Role.writer)
+
+
+class BoardRoles:
+    """
+    Роли пользователя на досках в рамках одного запроса. Карта {board_id: role} загружается
+    одним запросом при первой проверке, все последующие проверки обслуживаются из памяти
+    """
+    request_attr = '_board_roles'
+
+    def __init__(self, user) -> None:
+        self.user = user
+        self._roles: dict[int, int] | None = None
+
+    @classmethod
+    def for_request(cls, request: Request) -> 'BoardRoles':
+        """
+        Общий для permission-классов и сериализаторов экземпляр, закрепленный за запросом
+        """
+        board_roles = getattr(request, cls.request_attr, None)
+        if board_roles is None or board_roles.user != request.user:
+            board_roles = cls(request.user)
+            setattr(request, cls.request_attr, board_roles)
+        return board_roles
+
+    @property
+    def roles(self) -> dict[int, int]:
+        if self._roles is None:
+            self._roles = dict(
+                BoardParticipant.objects.filter(user_id=self.user.id).values_list('board_id', 'role')
+            )
+        return self._roles
+
+    def get_role(self, board_id: int) -> int | None:
+        return self.roles.get(board_id)
+
+    def has_role(self, board_id: int, roles: Iterable[int] | None = None) -> bool:
+        role = self.get_role(board_id)
+        if role is None:
+            return False
+        return roles is None or role in roles
+
+    def can_write(self, board_id: int) -> bool:
+        return self.has_role(board_id, WRITE_ROLES)
+
+    def is_owner(self, board_id: int) -> bool:
+        return self.has_role(board_id, [BoardParticipant.Role.owner])
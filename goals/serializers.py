@@ -1,11 +1,38 @@
-from django.db import transaction
+from django.db import models, transaction
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError, PermissionDenied
 from rest_framework.request import Request
 
 from core.models import User
 from core.serializers import UserSerializer
-from goals.models import Board, BoardParticipant, GoalCategory, Goal, GoalComment
+from goals.cache import invalidate_board_ids
+from goals.models import ArchiveJob, Board, BoardParticipant, GoalCategory, Goal, GoalComment
+from goals.roles import BoardRoles
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Поле PrimaryKeyRelatedField, которое берет объекты из заранее загруженного словаря
+    context[prefetch_key] = {pk: объект} вместо отдельного запроса на каждое значение
+    """
+    def __init__(self, prefetch_key: str, **kwargs) -> None:
+        self.prefetch_key = prefetch_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        prefetched = self.context.get(self.prefetch_key)
+        if prefetched is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            obj = prefetched.get(int(data))
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        if obj is None:
+            self.fail("does_not_exist", pk_value=data)
+        return obj
 
 
 class BoardCreateSerializer(serializers.ModelSerializer):
@@ -15,7 +42,40 @@ class BoardCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Board
         read_only_fields = ("id", "created", "updated")
-        fields = "__all__"
+        exclude = ("version",)
+
+
+class PrefetchedSlugRelatedField(serializers.SlugRelatedField):
+    """
+    Поле SlugRelatedField, которое берет объекты из заранее загруженного словаря
+    context[prefetch_key] = {slug: объект} вместо отдельного запроса на каждое значение
+    """
+    def __init__(self, prefetch_key: str, **kwargs) -> None:
+        self.prefetch_key = prefetch_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        prefetched = self.context.get(self.prefetch_key)
+        if prefetched is None:
+            return super().to_internal_value(data)
+        if not isinstance(data, str):
+            self.fail("invalid")
+        obj = prefetched.get(data)
+        if obj is None:
+            self.fail("does_not_exist", slug_name=self.slug_field, value=data)
+        return obj
+
+
+class BoardParticipantListSerializer(serializers.ListSerializer):
+    """
+    Сериализатор списка участников: пользователи всех участников загружаются одним запросом
+    по username в context["participant_users"]
+    """
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            usernames = {item["user"] for item in data if isinstance(item, dict) and isinstance(item.get("user"), str)}
+            self.context["participant_users"] = User.objects.in_bulk(usernames, field_name="username")
+        return super().to_internal_value(data)
 
 
 class BoardParticipantSerializer(serializers.ModelSerializer):
@@ -23,7 +83,9 @@ class BoardParticipantSerializer(serializers.ModelSerializer):
     Сериализатор BoardParticipantSerializer служит для сериализации и десериализации участников доски
     """
     role = serializers.ChoiceField(required=True, choices=BoardParticipant.editable_roles)
-    user = serializers.SlugRelatedField(slug_field="username", queryset=User.objects.all())
+    user = PrefetchedSlugRelatedField(
+        prefetch_key="participant_users", slug_field="username", queryset=User.objects.all()
+    )
 
     def validate_user(self, user: User) -> User:
         if self.context["request"].user == user:
@@ -34,6 +96,7 @@ class BoardParticipantSerializer(serializers.ModelSerializer):
         model = BoardParticipant
         fields = "__all__"
         read_only_fields = ("id", "created", "updated", "board")
+        list_serializer_class = BoardParticipantListSerializer
 
 
 class BoardSerializer(BoardCreateSerializer):
@@ -45,25 +108,15 @@ class BoardSerializer(BoardCreateSerializer):
 
     class Meta:
         model = Board
-        fields = "__all__"
+        exclude = ("version",)
         read_only_fields = ("id", "created", "updated")
 
     def update(self, instance: Board, validated_data: dict) -> Board:
         request: Request = self.context["request"]
 
         with transaction.atomic():
-            BoardParticipant.objects.filter(board=instance).exclude(user=request.user).delete()
-            BoardParticipant.objects.bulk_create(
-                [
-                    BoardParticipant(
-                        user=participant["user"],
-                        role=participant["role"],
-                        board=instance
-                    )
-                    for participant in validated_data.get("participants", [])
-                ],
-                ignore_conflicts=True,
-            )
+            if "participants" in validated_data:
+                self._update_participants(instance, request.user, validated_data["participants"])
 
             if title := validated_data.get("title"):
                 instance.title = title
@@ -72,6 +125,67 @@ class BoardSerializer(BoardCreateSerializer):
 
         return instance
 
+    @staticmethod
+    def _update_participants(board: Board, current_user: User, participants: list[dict]) -> None:
+        """
+        Приводит участников доски (кроме текущего пользователя) к переданному списку:
+        удаляются, добавляются и меняют роль только те участники, которых это касается
+        """
+        roles = {participant["user"].id: participant["role"] for participant in participants}
+        existing = {
+            participant.user_id: participant
+            for participant in BoardParticipant.objects.select_for_update().filter(board=board).exclude(user=current_user)
+        }
+
+        removed = [user_id for user_id in existing if user_id not in roles]
+        added = [user_id for user_id in roles if user_id not in existing]
+        changed = []
+        now = timezone.now()
+        for user_id, participant in existing.items():
+            if user_id in roles and participant.role != roles[user_id]:
+                participant.role = roles[user_id]
+                participant.updated = now
+                changed.append(participant)
+
+        if removed:
+            BoardParticipant.objects.filter(id__in=[existing[user_id].id for user_id in removed]).delete()
+        if added:
+            BoardParticipant.objects.bulk_create(
+                [BoardParticipant(user_id=user_id, role=roles[user_id], board=board) for user_id in added],
+                ignore_conflicts=True,
+            )
+        if changed:
+            BoardParticipant.objects.bulk_update(changed, ["role", "updated"])
+        if removed or added:
+            # Кеш досок хранит только состав участников, смена роли его не затрагивает.
+            # bulk_create не отправляет сигналы, поэтому кеш сбрасывается явно
+            invalidate_board_ids(*removed, *added)
+
+
+class BoardStatsSerializer(serializers.Serializer):
+    """
+    Сериализатор BoardStatsSerializer служит для отображения статистики целей доски:
+    by_status включает архивные цели, total и by_priority считаются только по неархивным
+    """
+    board = serializers.IntegerField()
+    total = serializers.IntegerField()
+    by_status = serializers.DictField(child=serializers.IntegerField())
+    by_priority = serializers.DictField(child=serializers.IntegerField())
+
+
+class ArchiveJobSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор ArchiveJobSerializer служит для отображения прогресса архивирования
+    удаленной доски или категории
+    """
+    class Meta:
+        model = ArchiveJob
+        fields = (
+            "id", "board", "category", "status", "goals_total", "goals_archived",
+            "categories_deleted", "created", "updated",
+        )
+        read_only_fields = fields
+
 
 class GoalCreateSerializer(serializers.ModelSerializer):
     """
@@ -83,11 +197,7 @@ class GoalCreateSerializer(serializers.ModelSerializer):
         if board.is_deleted:
             raise ValidationError("Board is deleted")
 
-        if not BoardParticipant.objects.filter(
-                board_id=board.id,
-                role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
-                user_id=self.context["request"].user
-        ).exists():
+        if not BoardRoles.for_request(self.context["request"]).can_write(board.id):
             raise PermissionDenied
 
         return board
@@ -95,7 +205,7 @@ class GoalCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = GoalCategory
         read_only_fields = ("id", "created", "updated", "user", "is_deleted")
-        fields = "__all__"
+        exclude = ("change_xid",)
 
 
 class GoalCategorySerializer(GoalCreateSerializer):
@@ -110,21 +220,18 @@ class GoalSerializer(serializers.ModelSerializer):
     Класс BoardSerializer служит для получения конкретной цели
     """
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    category = serializers.PrimaryKeyRelatedField(queryset=GoalCategory.objects.select_related("board"))
 
     class Meta:
         model = Goal
-        fields = "__all__"
+        exclude = ("search_vector", "change_xid", "board")
         read_only_fields = ("id", "created", "updated", "user")
 
     def validate_category(self, value: GoalCategory) -> GoalCategory:
-        if not BoardParticipant.objects.filter(
-                board_id=value.board_id,
-                role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
-                user_id=self.context["request"].user
-        ).exists():
+        if not BoardRoles.for_request(self.context["request"]).can_write(value.board_id):
             raise PermissionDenied("Must be owner or writer in project")
 
-        if value.is_deleted:
+        if value.is_deleted or value.board.is_deleted:
             raise ValidationError("Category not found")
 
         return value
@@ -134,22 +241,65 @@ class GoalUserSerializer(GoalSerializer):
     user = UserSerializer(read_only=True)
 
 
+class GoalBulkSerializer(GoalSerializer):
+    """
+    Сериализатор GoalBulkSerializer служит для проверки одной цели в пакетной операции:
+    категории берутся из context["categories"], загруженного одним запросом на весь пакет
+    """
+    category = PrefetchedPrimaryKeyRelatedField(
+        prefetch_key="categories", queryset=GoalCategory.objects.select_related("board")
+    )
+
+
+class GoalBulkOperationSerializer(serializers.Serializer):
+    """
+    Сериализатор GoalBulkOperationSerializer служит для проверки действия и цели пакетной операции
+    """
+    class Action(models.TextChoices):
+        create = "create", "Создание"
+        update = "update", "Изменение"
+        archive = "archive", "Архивирование"
+
+    action = serializers.ChoiceField(choices=Action.choices)
+    id = serializers.IntegerField(required=False)
+
+    def validate(self, attrs: dict) -> dict:
+        if attrs["action"] != self.Action.create and "id" not in attrs:
+            raise ValidationError({"id": "This field is required."})
+        return attrs
+
+
+class GoalBulkRequestSerializer(serializers.Serializer):
+    """
+    Сериализатор GoalBulkRequestSerializer служит для приема списка пакетных операций над целями
+    """
+    max_operations = 500
+
+    operations = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=max_operations
+    )
+
+
+class GoalImportSerializer(serializers.Serializer):
+    """
+    Сериализатор GoalImportSerializer служит для проверки параметров импорта целей
+    """
+    offset = serializers.IntegerField(required=False, min_value=0, default=0)
+
+
 class CommentSerializer(serializers.ModelSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    goal = serializers.PrimaryKeyRelatedField(queryset=Goal.objects.select_related("category", "board"))
 
     class Meta:
         model = GoalComment
-        fields = "__all__"
+        exclude = ("change_xid", "board")
         read_only_fields = ("id", "created", "updated", "user")
 
     def validate_goal(self, value: Goal) -> Goal:
-        if value.status == Goal.Status.archived:
+        if value.status == Goal.Status.archived or value.category.is_deleted or value.board.is_deleted:
             raise ValidationError("Goal not found")
-        if not BoardParticipant.objects.filter(
-                board_id=value.category.board_id,
-                role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
-                user_id=self.context["request"].user
-        ).exists():
+        if not BoardRoles.for_request(self.context["request"]).can_write(value.board_id):
             raise PermissionDenied("Not owner of category")
         return value
 
@@ -157,3 +307,11 @@ class CommentSerializer(serializers.ModelSerializer):
 class GoalCommentSerializer(CommentSerializer):
     user = UserSerializer(read_only=True)
     goal = serializers.PrimaryKeyRelatedField(read_only=True)
+
+
+class SyncRequestSerializer(serializers.Serializer):
+    """
+    Сериализатор SyncRequestSerializer служит для проверки параметров синхронизации
+    """
+    cursor = serializers.CharField(required=False, allow_blank=True)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=1000, default=500)
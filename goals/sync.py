@@ -0,0 +1,215 @@
+import base64
+import binascii
+import json
+from typing import Any, NamedTuple
+
+from django.db import connection
+from django.db.models import Model, Q, QuerySet
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+from goals.cache import get_board_ids
+from goals.models import DeletedGoalComment, Goal, GoalCategory, GoalComment, MovedGoal, MovedGoalCategory
+from goals.serializers import GoalCategorySerializer, GoalCommentSerializer, GoalUserSerializer
+
+SyncPosition = tuple[int, int]
+
+FEEDS = ("goals", "categories", "comments", "deleted_comments", "moved_goals", "moved_categories")
+TOMBSTONE_PK_FIELDS = {"deleted_comments": "comment_id", "moved_goals": "goal_id", "moved_categories": "category_id"}
+# Виды изменений, которые отдаются при полной выгрузке досок, доступ к которым пользователь получил
+SNAPSHOT_FEEDS = ("goals", "categories", "comments")
+
+
+class SyncCursor(NamedTuple):
+    """
+    Состояние синхронизации клиента: позиции (change_xid, id) последних полученных строк каждого вида,
+    доски, данные которых есть у клиента (None до первой синхронизации), и незавершенная полная
+    выгрузка досок, доступ к которым появился после прошлой синхронизации
+    """
+    positions: dict[str, SyncPosition]
+    boards: set[int] | None
+    snapshot_boards: set[int]
+    snapshot_positions: dict[str, SyncPosition]
+
+
+def _decode_positions(data: dict, feeds: tuple[str, ...]) -> dict[str, SyncPosition]:
+    positions = {}
+    for feed in feeds:
+        # Курсоры прежних версий не содержат новых видов изменений, они читаются с начала
+        xid, pk = data.get(feed, (0, 0))
+        positions[feed] = int(xid), int(pk)
+    return positions
+
+
+def decode_cursor(cursor: str | None) -> SyncCursor:
+    """
+    Разбирает курсор клиента
+    """
+    if not cursor:
+        return SyncCursor(dict.fromkeys(FEEDS, (0, 0)), None, set(), dict.fromkeys(SNAPSHOT_FEEDS, (0, 0)))
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        snapshot = data.get("snapshot") or {}
+        return SyncCursor(
+            positions=_decode_positions(data, FEEDS),
+            # Курсоры прежних версий не содержат досок, для них состав досок считается неизменным
+            boards={int(board_id) for board_id in data["boards"]} if "boards" in data else None,
+            snapshot_boards={int(board_id) for board_id in snapshot.get("boards", [])},
+            snapshot_positions=_decode_positions(snapshot, SNAPSHOT_FEEDS),
+        )
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        raise ValidationError({"cursor": ["Invalid cursor"]})
+
+
+def encode_cursor(state: SyncCursor) -> str:
+    data: dict[str, Any] = dict(state.positions)
+    data["boards"] = sorted(state.boards)
+    if state.snapshot_boards:
+        data["snapshot"] = {"boards": sorted(state.snapshot_boards), **state.snapshot_positions}
+    return base64.urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode()).decode()
+
+
+def snapshot_horizon() -> int:
+    """
+    xmin текущего снимка: все транзакции с меньшим номером уже завершены
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+        return cursor.fetchone()[0]
+
+
+def changed_since(
+    queryset: QuerySet, position: SyncPosition, horizon: int, limit: int, pk_field: str = "id"
+) -> list[Model]:
+    """
+    Строки, измененные после position и до horizon, в порядке (change_xid, pk). Возвращает
+    до limit + 1 строк, лишняя строка означает, что изменения есть и после этой страницы
+    """
+    xid, pk = position
+    return list(
+        queryset.filter(
+            Q(change_xid__gt=xid) | Q(change_xid=xid, **{f"{pk_field}__gt": pk}),
+            change_xid__gte=xid,
+            change_xid__lt=horizon,
+        ).order_by("change_xid", pk_field)[:limit + 1]
+    )
+
+
+class ChangeFeed:
+    """
+    Изменения целей, категорий и комментариев на досках пользователя после курсора клиента.
+    Архивные цели, удаленные категории, удаленные комментарии и строки, перенесенные на доску
+    пользователя, которой нет, отдаются как tombstone (только id). Каждый вид изменений читается
+    по индексу (..., change_xid, id), поэтому стоимость синхронизации зависит от количества изменений,
+    а не от объема данных пользователя.
+
+    Курсор хранит доски, данные которых есть у клиента. Доски, доступ к которым пользователь потерял,
+    отдаются в deleted.boards: клиент удаляет их категории, а с ними цели и комментарии. Доски,
+    доступ к которым появился, выгружаются полностью, постранично вместе с обычными изменениями
+    """
+    def __init__(self, request: Request, cursor: str | None, limit: int) -> None:
+        self.request = request
+        self.state = decode_cursor(cursor)
+        self.limit = limit
+
+    def collect(self) -> dict[str, Any]:
+        horizon = snapshot_horizon()
+        board_ids = set(get_board_ids(self.request.user.id))
+        known = board_ids if self.state.boards is None else self.state.boards
+        removed = known - board_ids
+        added = board_ids - known - self.state.snapshot_boards
+        snapshot_boards = (self.state.snapshot_boards & board_ids) | added
+        snapshot_positions = self.state.snapshot_positions
+        if added:
+            # Новая доска выгружается с начала, уже выгруженные строки других досок придут повторно
+            snapshot_positions = dict.fromkeys(SNAPSHOT_FEEDS, (0, 0))
+
+        rows, has_more = self._changes(board_ids, self.state.positions, horizon)
+        if snapshot_boards:
+            snapshot_rows, snapshot_more = self._snapshot(snapshot_boards, snapshot_positions, horizon)
+            for feed in SNAPSHOT_FEEDS:
+                changed = {row.id for row in rows[feed]}
+                rows[feed] = [row for row in snapshot_rows[feed] if row.id not in changed] + rows[feed]
+            if not snapshot_more:
+                snapshot_boards = set()
+            has_more = has_more or snapshot_more
+
+        self.state = SyncCursor(self.state.positions, board_ids, snapshot_boards, snapshot_positions)
+        context = {"request": self.request}
+        goals = [goal for goal in rows["goals"] if goal.status != Goal.Status.archived]
+        categories = [category for category in rows["categories"] if not category.is_deleted]
+        deleted_goals = [goal.id for goal in rows["goals"] if goal.status == Goal.Status.archived]
+        deleted_goals += [moved.goal_id for moved in rows["moved_goals"]]
+        deleted_categories = [category.id for category in rows["categories"] if category.is_deleted]
+        deleted_categories += [moved.category_id for moved in rows["moved_categories"]]
+        return {
+            "cursor": encode_cursor(self.state),
+            "has_more": has_more,
+            "goals": GoalUserSerializer(goals, many=True, context=context).data,
+            "categories": GoalCategorySerializer(categories, many=True, context=context).data,
+            "comments": GoalCommentSerializer(rows["comments"], many=True, context=context).data,
+            "deleted": {
+                "boards": sorted(removed),
+                "goals": deleted_goals,
+                "categories": deleted_categories,
+                "comments": [comment.comment_id for comment in rows["deleted_comments"]],
+            },
+        }
+
+    def _changes(
+        self, board_ids: set[int], positions: dict[str, SyncPosition], horizon: int
+    ) -> tuple[dict[str, list[Model]], bool]:
+        """
+        Изменения на досках пользователя после позиций курсора. Tombstone переноса не отдаются,
+        если строка осталась на доске пользователя: ее новое состояние придет обычным изменением
+        """
+        goals = Goal.objects.filter(board_id__in=board_ids)
+        categories = GoalCategory.objects.filter(board_id__in=board_ids)
+        comments = GoalComment.objects.filter(board_id__in=board_ids)
+        feeds = {
+            "goals": goals.select_related("user"),
+            "categories": categories.select_related("user"),
+            "comments": comments.select_related("user"),
+            "deleted_comments": DeletedGoalComment.objects.filter(board_id__in=board_ids).exclude(
+                comment_id__in=comments.values("id")
+            ),
+            "moved_goals": MovedGoal.objects.filter(board_id__in=board_ids).exclude(goal_id__in=goals.values("id")),
+            "moved_categories": MovedGoalCategory.objects.filter(board_id__in=board_ids).exclude(
+                category_id__in=categories.values("id")
+            ),
+        }
+        return self._read(feeds, positions, horizon)
+
+    def _snapshot(
+        self, board_ids: set[int], positions: dict[str, SyncPosition], horizon: int
+    ) -> tuple[dict[str, list[Model]], bool]:
+        """
+        Полная выгрузка новых для клиента досок: текущие строки без tombstone
+        """
+        feeds = {
+            "goals": Goal.objects.select_related("user").filter(board_id__in=board_ids).exclude(
+                status=Goal.Status.archived
+            ),
+            "categories": GoalCategory.objects.select_related("user").filter(board_id__in=board_ids, is_deleted=False),
+            "comments": GoalComment.objects.select_related("user").filter(board_id__in=board_ids),
+        }
+        return self._read(feeds, positions, horizon)
+
+    def _read(
+        self, feeds: dict[str, QuerySet], positions: dict[str, SyncPosition], horizon: int
+    ) -> tuple[dict[str, list[Model]], bool]:
+        """
+        Читает страницу каждого вида изменений и сдвигает его позицию в positions
+        """
+        rows = {}
+        has_more = False
+        for feed, queryset in feeds.items():
+            pk_field = TOMBSTONE_PK_FIELDS.get(feed, "id")
+            rows[feed] = changed_since(queryset, positions[feed], horizon, self.limit, pk_field)
+            if len(rows[feed]) > self.limit:
+                has_more = True
+                rows[feed] = rows[feed][:self.limit]
+            if rows[feed]:
+                last = rows[feed][-1]
+                positions[feed] = last.change_xid, getattr(last, pk_field)
+        return rows, has_more
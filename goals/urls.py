@@ -1,15 +1,22 @@
 from django.urls import path
 
-from goals.views.board import BoardCreateView, BoardListView, BoardDetailView
+from goals.views.board import (
+    ArchiveJobView, BoardCacheStatsView, BoardCreateView, BoardListView, BoardDetailView, BoardStatsView,
+)
 from goals.views.goal_category import GoalCategoryCreateView, GoalCategoryListView, GoalCategoryDetailView
-from goals.views.goals import GoalCreateView, GoalListView, GoalDetailView
+from goals.views.goals import GoalCreateView, GoalListView, GoalDetailView, GoalBulkView, GoalImportView
 from goals.views.goal_comment import GoalCommentCreateView, GoalCommentDetailView, GoalCommentListView
+from goals.views.export import ExportView
+from goals.views.sync import SyncView
 
 urlpatterns = [
     # Board
     path("board/create", BoardCreateView.as_view(), name="create_board"),
     path("board/list", BoardListView.as_view(), name="board_list"),
     path("board/<int:pk>", BoardDetailView.as_view(), name="board_detail"),
+    path("board/<int:pk>/stats", BoardStatsView.as_view(), name="board_stats"),
+    path("board/cache_stats", BoardCacheStatsView.as_view(), name="board_cache_stats"),
+    path("archive_job/<int:pk>", ArchiveJobView.as_view(), name="archive_job"),
     # Category
     path("goal_category/create", GoalCategoryCreateView.as_view(), name="create_category"),
     path("goal_category/list", GoalCategoryListView.as_view(), name="category_list"),
@@ -18,8 +25,13 @@ urlpatterns = [
     path("goal/create", GoalCreateView.as_view(), name="create_goal"),
     path("goal/list", GoalListView.as_view(), name="goal_list"),
     path("goal/<int:pk>", GoalDetailView.as_view(), name="goal_detail"),
+    path("goal/bulk", GoalBulkView.as_view(), name="goal_bulk"),
+    path("goal/import", GoalImportView.as_view(), name="goal_import"),
     # Comments
     path("goal_comment/create", GoalCommentCreateView.as_view(), name="comment_create"),
     path("goal_comment/list", GoalCommentListView.as_view(), name="comment_list"),
     path("goal_comment/<int:pk>", GoalCommentDetailView.as_view(), name="comment_detail"),
+    # Sync
+    path("sync", SyncView.as_view(), name="sync"),
+    path("export", ExportView.as_view(), name="export"),
 ]
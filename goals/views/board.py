@@ -1,10 +1,21 @@
+from typing import Any
+
 from django.db import transaction
 from django.db.models import QuerySet
+from django.utils.decorators import method_decorator
 from rest_framework import generics, filters, permissions
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
 
-from goals.models import Board, BoardParticipant, Goal
-from goals.permissions import BoardPermission
-from goals.serializers import BoardCreateSerializer, BoardSerializer
+from goals.archive import schedule_board_archive
+from goals.cache import get_board_ids, get_stats
+from goals.conditional import board_condition, boards_condition
+from goals.models import ArchiveJob, Board, BoardParticipant, Goal
+from goals.permissions import ArchiveJobPermission, BoardPermission
+from goals.read_plan import ValuesListMixin
+from goals.serializers import ArchiveJobSerializer, BoardCreateSerializer, BoardSerializer, BoardStatsSerializer
+from todolist.db_router import replica_reads
 
 
 class BoardCreateView(generics.CreateAPIView):
@@ -24,7 +35,9 @@ class BoardCreateView(generics.CreateAPIView):
             )
 
 
-class BoardListView(generics.ListAPIView):
+@method_decorator(replica_reads, name='get')
+@method_decorator(boards_condition, name='get')
+class BoardListView(ValuesListMixin, generics.ListAPIView):
     """
     Представление для отображения списка всех доступных досок
     """
@@ -34,9 +47,11 @@ class BoardListView(generics.ListAPIView):
     ordering = ['title']
 
     def get_queryset(self) -> QuerySet(Board):
-        return Board.objects.filter(participants__user=self.request.user).exclude(is_deleted=True)
+        return Board.objects.filter(id__in=get_board_ids(self.request.user.id)).exclude(is_deleted=True)
 
 
+@method_decorator(replica_reads, name='get')
+@method_decorator(board_condition, name='get')
 class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Представление для отображения, обновления и удаления конкретной доски
@@ -45,8 +60,58 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = BoardSerializer
     queryset = Board.objects.prefetch_related('participants__user').exclude(is_deleted=True)
 
+    def destroy(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        response = super().destroy(request, *args, **kwargs)
+        response["Location"] = reverse("goals:archive_job", kwargs={"pk": self.archive_job.id})
+        return response
+
     def perform_destroy(self, instance: Board) -> None:
+        # Цели и категории архивируются партиями командой archive_worker
         with transaction.atomic():
-            Board.objects.filter(id=instance.id).update(is_deleted=True)
-            instance.categories.update(is_deleted=True)
-            Goal.objects.filter(category__board=instance).update(status=Goal.Status.archived)
+            self.archive_job = schedule_board_archive(instance)
+
+
+@method_decorator(replica_reads, name='get')
+class BoardStatsView(generics.RetrieveAPIView):
+    """
+    Представление для отображения количества целей доски по статусам и приоритетам
+    """
+    permission_classes = [BoardPermission]
+    serializer_class = BoardStatsSerializer
+    queryset = Board.objects.exclude(is_deleted=True)
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        board = self.get_object()
+        by_status = dict.fromkeys(Goal.Status.values, 0)
+        by_priority = dict.fromkeys(Goal.Priority.values, 0)
+        for status, priority, goals_count in board.goal_stats.values_list("status", "priority", "goals_count"):
+            by_status[status] += goals_count
+            if status != Goal.Status.archived:
+                by_priority[priority] += goals_count
+
+        serializer = self.get_serializer({
+            "board": board.id,
+            "total": sum(by_priority.values()),
+            "by_status": by_status,
+            "by_priority": by_priority,
+        })
+        return Response(serializer.data)
+
+
+class BoardCacheStatsView(generics.GenericAPIView):
+    """
+    Представление для отображения счетчиков попаданий и промахов кеша досок пользователей
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return Response(get_stats())
+
+
+class ArchiveJobView(generics.RetrieveAPIView):
+    """
+    Представление для отслеживания прогресса архивирования удаленной доски или категории
+    """
+    permission_classes = [ArchiveJobPermission]
+    serializer_class = ArchiveJobSerializer
+    queryset = ArchiveJob.objects.all()
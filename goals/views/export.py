@@ -0,0 +1,20 @@
+from typing import Any
+
+from django.http import StreamingHttpResponse
+from rest_framework import generics, permissions
+from rest_framework.request import Request
+
+from goals.export import export_records, jsonl_gzip
+
+
+class ExportView(generics.GenericAPIView):
+    """
+    Представление для выгрузки всех досок, категорий, целей и комментариев пользователя
+    одним сжатым (gzip) файлом JSON Lines. Ответ формируется потоково
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> StreamingHttpResponse:
+        response = StreamingHttpResponse(jsonl_gzip(export_records(request.user.id)), content_type='application/gzip')
+        response['Content-Disposition'] = 'attachment; filename="goals-export.jsonl.gz"'
+        return response
@@ -1,9 +1,21 @@
+from typing import Any
+
 from django.db import transaction
+from django.utils.decorators import method_decorator
 from rest_framework import generics, permissions, filters
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
 
-from goals.models import GoalCategory, Goal
+from goals.archive import schedule_category_archive
+from goals.conditional import boards_condition
+from goals.filters import TrigramSearchFilter
+from goals.models import GoalCategory
+from goals.pagination import GoalsPagination
 from goals.permissions import GoalCategoryPermission
+from goals.read_plan import ValuesListMixin
 from goals.serializers import GoalCreateSerializer, GoalCategorySerializer
+from todolist.db_router import replica_reads
 
 
 class GoalCategoryCreateView(generics.CreateAPIView):
@@ -14,31 +26,41 @@ class GoalCategoryCreateView(generics.CreateAPIView):
     serializer_class = GoalCreateSerializer
 
 
-class GoalCategoryListView(generics.ListAPIView):
+@method_decorator(replica_reads, name='get')
+@method_decorator(boards_condition, name='get')
+class GoalCategoryListView(ValuesListMixin, generics.ListAPIView):
     """
     Представление для отображения списка всех доступных категорий
     """
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = GoalCategorySerializer
-    filter_backends = [filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [filters.OrderingFilter, TrigramSearchFilter]
+    pagination_class = GoalsPagination
     ordering_fields = ['title', 'created']
     ordering = ['title']
     search_fields = ['title']
 
     def get_queryset(self):
-        return GoalCategory.objects.filter(board__participants__user=self.request.user).exclude(is_deleted=True)
+        return GoalCategory.objects.select_related('user').filter(
+            board__participants__user=self.request.user, board__is_deleted=False
+        ).exclude(is_deleted=True)
 
 
+@method_decorator(replica_reads, name='get')
 class GoalCategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Представление для отображения, обновления и удаления конкретной категории
     """
     serializer_class = GoalCategorySerializer
     permission_classes = [GoalCategoryPermission]
-    queryset = GoalCategory.objects.exclude(is_deleted=True)
+    queryset = GoalCategory.objects.select_related('user').filter(is_deleted=False, board__is_deleted=False)
+
+    def destroy(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        response = super().destroy(request, *args, **kwargs)
+        response['Location'] = reverse('goals:archive_job', kwargs={'pk': self.archive_job.id})
+        return response
 
     def perform_destroy(self, instance: GoalCategory) -> None:
+        # Цели архивируются партиями командой archive_worker
         with transaction.atomic():
-            instance.is_deleted = True
-            instance.save(update_fields=['is_deleted'])
-            instance.goal_set.update(status=Goal.Status.archived)
+            self.archive_job = schedule_category_archive(instance)
@@ -1,10 +1,15 @@
 from django.db.models import QuerySet
+from django.utils.decorators import method_decorator
 from rest_framework import generics, permissions, filters
 from django_filters.rest_framework import DjangoFilterBackend
 
+from goals.cache import get_board_ids
 from goals.models import GoalComment
+from goals.pagination import GoalsPagination
 from goals.permissions import GoalCommentPermission
+from goals.read_plan import ValuesListMixin
 from goals.serializers import GoalCommentSerializer, CommentSerializer
+from todolist.db_router import replica_reads
 
 
 class GoalCommentCreateView(generics.CreateAPIView):
@@ -15,7 +20,8 @@ class GoalCommentCreateView(generics.CreateAPIView):
     serializer_class = CommentSerializer
 
 
-class GoalCommentListView(generics.ListAPIView):
+@method_decorator(replica_reads, name='get')
+class GoalCommentListView(ValuesListMixin, generics.ListAPIView):
     """
     Представление для отображения списка комментариев
     """
@@ -23,12 +29,14 @@ class GoalCommentListView(generics.ListAPIView):
     serializer_class = GoalCommentSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['goal']
+    pagination_class = GoalsPagination
     ordering = ['-created']
 
     def get_queryset(self):
-        return GoalComment.objects.filter(goal__category__board__participants__user=self.request.user)
+        return GoalComment.objects.select_related('user').filter(board_id__in=get_board_ids(self.request.user.id))
 
 
+@method_decorator(replica_reads, name='get')
 class GoalCommentDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Представление для отображения, обновления и удаления конкретного комментария
@@ -37,6 +45,4 @@ class GoalCommentDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = GoalCommentSerializer
 
     def get_queryset(self) -> QuerySet[GoalComment]:
-        return GoalComment.objects.select_related('user').filter(
-            goal__category__board__participants__user=self.request.user
-        )
+        return GoalComment.objects.select_related('user').filter(board_id__in=get_board_ids(self.request.user.id))
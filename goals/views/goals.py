@@ -1,10 +1,25 @@
+import json
+from typing import Any
+
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
 from rest_framework import generics, permissions, filters
+from rest_framework.exceptions import ParseError, UnsupportedMediaType
+from rest_framework.request import Request
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
-from goals.filters import GoalListFilter
+from goals.bulk import GoalBulkOperations
+from goals.cache import get_board_ids
+from goals.conditional import boards_condition
+from goals.filters import GoalListFilter, GoalSearchFilter
+from goals.importer import CONTENT_TYPES, GoalImporter, parse_rows, read_lines
 from goals.models import Goal
+from goals.pagination import GoalsPagination
 from goals.permissions import GoalPermission
-from goals.serializers import GoalSerializer, GoalUserSerializer
+from goals.read_plan import ValuesListMixin
+from goals.serializers import GoalBulkRequestSerializer, GoalImportSerializer, GoalSerializer, GoalUserSerializer
+from todolist.db_router import replica_reads
 
 
 class GoalCreateView(generics.CreateAPIView):
@@ -15,32 +30,82 @@ class GoalCreateView(generics.CreateAPIView):
     serializer_class = GoalSerializer
 
 
-class GoalListView(generics.ListAPIView):
+@method_decorator(replica_reads, name='get')
+@method_decorator(boards_condition, name='get')
+class GoalListView(ValuesListMixin, generics.ListAPIView):
     """
     Представление для отображения списка всех доступных целей
     """
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = GoalUserSerializer
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, GoalSearchFilter]
     filterset_class = GoalListFilter
+    pagination_class = GoalsPagination
     ordering_fields = ['title', 'created']
     ordering = ['title']
-    search_fields = ['title', 'description']
 
     def get_queryset(self):
-        return Goal.objects.filter(
-            category__board__participants__user=self.request.user,
+        return Goal.objects.select_related('user').filter(
+            board_id__in=get_board_ids(self.request.user.id),
+            category__is_deleted=False,
+            board__is_deleted=False,
         ).exclude(status=Goal.Status.archived)
 
 
+@method_decorator(replica_reads, name='get')
 class GoalDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Представление для отображения, обновления и удаления конкретной цели
     """
     permission_classes = [GoalPermission]
     serializer_class = GoalUserSerializer
-    queryset = Goal.objects.exclude(status=Goal.Status.archived)
+    queryset = Goal.objects.select_related('user').filter(
+        category__is_deleted=False, board__is_deleted=False
+    ).exclude(status=Goal.Status.archived)
 
     def perform_destroy(self, instance: Goal) -> None:
         instance.status = Goal.Status.archived
         instance.save(update_fields=['status'])
+
+
+class GoalBulkView(generics.GenericAPIView):
+    """
+    Представление для пакетного создания, изменения и архивирования целей.
+    Возвращает результат по каждой операции в порядке запроса
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = GoalBulkRequestSerializer
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = GoalBulkOperations(request).apply(serializer.validated_data["operations"])
+        return Response({"results": results})
+
+
+class GoalImportView(generics.GenericAPIView):
+    """
+    Представление для потокового импорта целей из CSV (text/csv) или JSON Lines (application/x-ndjson).
+    Тело запроса читается построчно, ответ - JSON Lines с отчетом после каждой зафиксированной партии.
+    Прерванный импорт продолжается повторной отправкой файла с ?offset=<processed из последнего отчета>
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = GoalImportSerializer
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> StreamingHttpResponse:
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        file_format = CONTENT_TYPES.get(request.content_type.split(";")[0].strip())
+        if file_format is None:
+            raise UnsupportedMediaType(request.content_type)
+
+        # DRF не создает поток для тела без Content-Length (пустого или переданного по частям)
+        if request.stream is None:
+            raise ParseError("Request body is empty or has no Content-Length")
+
+        rows = parse_rows(read_lines(request.stream), file_format)
+        reports = GoalImporter(request).run(rows, offset=serializer.validated_data["offset"])
+        return StreamingHttpResponse(
+            (json.dumps(report, ensure_ascii=False) + "\n" for report in reports),
+            content_type="application/x-ndjson",
+        )
@@ -0,0 +1,24 @@
+from typing import Any
+
+from rest_framework import generics, permissions
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from goals.serializers import SyncRequestSerializer
+from goals.sync import ChangeFeed
+
+
+class SyncView(generics.GenericAPIView):
+    """
+    Представление для получения изменений целей, категорий и комментариев после курсора клиента.
+    Первый запрос выполняется без курсора, следующие - с cursor из предыдущего ответа,
+    пока has_more равен true
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = SyncRequestSerializer
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        feed = ChangeFeed(request, serializer.validated_data.get("cursor"), serializer.validated_data["limit"])
+        return Response(feed.collect())
@@ -1,4 +1,5 @@
 import pytest
+from django.core.cache import caches
 from rest_framework.test import APIClient
 
 pytest_plugins = 'tests.factories'
@@ -24,3 +25,12 @@ def auth_client(client, user):
 @pytest.fixture()
 def another_user(user_factory):
     return user_factory.create()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> None:
+    """
+    Очистка кешей между тестами
+    """
+    for cache in caches.all():
+        cache.clear()
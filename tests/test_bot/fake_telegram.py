@@ -0,0 +1,85 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeTelegram:
+    """
+    Локальная заглушка Bot API: отдает добавленные обновления через getUpdates
+    и запоминает сообщения, отправленные ботом через sendMessage
+    """
+    def __init__(self, token: str = 'test-token') -> None:
+        self.token = token
+        self.updates: list[dict[str, Any]] = []
+        self.sent: list[dict[str, Any]] = []
+        self.condition = threading.Condition()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address
+        return f'http://{host}:{port}'
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def add_message(self, chat_id: int, text: str) -> None:
+        with self.condition:
+            update_id = len(self.updates) + 1
+            self.updates.append({'update_id': update_id, 'message': {'chat': {'id': chat_id}, 'text': text}})
+            self.condition.notify_all()
+
+    def messages(self, chat_id: int) -> list[str]:
+        with self.condition:
+            return [message['text'] for message in self.sent if message['chat_id'] == chat_id]
+
+    def get_updates(self, offset: int, timeout: float) -> list[dict[str, Any]]:
+        with self.condition:
+            # Long polling, укороченный для тестов
+            self.condition.wait_for(lambda: len(self.updates) >= max(offset, 1), timeout=min(timeout, 0.1))
+            return [update for update in self.updates if update['update_id'] >= offset]
+
+    def send_message(self, chat_id: int, text: str) -> dict[str, Any]:
+        with self.condition:
+            self.sent.append({'chat_id': chat_id, 'text': text})
+        return {'chat': {'id': chat_id}, 'text': text}
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        telegram = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                prefix = f'/bot{telegram.token}/'
+                if not url.path.startswith(prefix):
+                    return self._reply(404, {'ok': False, 'description': 'Not Found'})
+
+                method = url.path[len(prefix):]
+                if method == 'getUpdates':
+                    result = telegram.get_updates(int(params.get('offset', 0)), float(params.get('timeout', 0)))
+                elif method == 'sendMessage':
+                    result = telegram.send_message(int(params['chat_id']), params['text'])
+                else:
+                    return self._reply(404, {'ok': False, 'description': 'Not Found'})
+                self._reply(200, {'ok': True, 'result': result})
+
+            def _reply(self, code: int, data: dict[str, Any]) -> None:
+                body = json.dumps(data).encode()
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
@@ -1,10 +1,15 @@
 import pytest
-from unittest.mock import patch
+from unittest.mock import ANY, Mock, patch
+from django.db import OperationalError
 from django.urls import reverse
 from rest_framework import status
 
+from bot.management.commands.runbot import DB_RETRY_ATTEMPTS, Command
+from bot.models import TgUser
 from bot.tg.client import TgClient
+from bot.tg.schemas import Chat, Message
 from core.models import User
+from goals.models import Goal
 
 
 @pytest.mark.django_db
@@ -51,3 +56,81 @@ class TestTgUser:
 
         assert response.status_code == status.HTTP_200_OK
         mock.assert_called_once_with(tg_user.chat_id, 'Bot token verified!')
+
+
+class TestRunBot:
+
+    def test_retries_database_step(self):
+        """
+        Тест, что после ошибки соединения с базой повторяется только шаг работы с базой
+        """
+        command = Command()
+        operation = Mock(side_effect=[OperationalError('server closed'), 'result'])
+
+        with (
+            patch('bot.management.commands.runbot.close_old_connections') as close,
+            patch('bot.management.commands.runbot.time.sleep') as sleep,
+        ):
+            assert command.run_db(operation) == 'result'
+
+        assert operation.call_count == 2
+        sleep.assert_called_once_with(1)
+        assert close.called
+
+    @pytest.mark.django_db
+    def test_message_dropped_after_attempts(self):
+        """
+        Тест, что если база недоступна дольше DB_RETRY_ATTEMPTS попыток, сообщение пропускается
+        без отправки ответа, а обработка не зависает
+        """
+        command = Command()
+        msg = Message(chat=Chat(id=1), text='hello')
+
+        with (
+            patch.object(TgUser.objects, 'get_or_create', side_effect=OperationalError('server closed')) as get,
+            patch.object(TgClient, 'send_message') as send,
+            patch('bot.management.commands.runbot.time.sleep') as sleep,
+        ):
+            command.handle_update(msg)
+
+        assert get.call_count == DB_RETRY_ATTEMPTS
+        assert sleep.call_count == DB_RETRY_ATTEMPTS - 1
+        send.assert_not_called()
+
+    @pytest.mark.django_db
+    def test_code_sent_once(self, tg_user_factory):
+        """
+        Тест, что ошибка базы при выдаче кода верификации не приводит к повторной отправке приветствия
+        """
+        tg_user = tg_user_factory.create(user=None)
+        command = Command()
+        msg = Message(chat=Chat(id=tg_user.chat_id), text='hello')
+        with (
+            patch.object(TgUser, 'save', autospec=True, side_effect=[OperationalError('server closed'), None]),
+            patch.object(TgClient, 'send_message') as send,
+            patch('bot.management.commands.runbot.close_old_connections'),
+            patch('bot.management.commands.runbot.time.sleep'),
+        ):
+            command.handle_update(msg)
+
+        assert [call.args[1] for call in send.call_args_list] == ['Hello there!', ANY]
+        assert send.call_args_list[1].args[1].startswith('Your verification code: ')
+
+    @pytest.mark.django_db
+    def test_goal_creation_not_retried(self, goal_category_factory):
+        """
+        Тест, что создание цели не повторяется после ошибки базы: запись могла быть зафиксирована
+        """
+        category = goal_category_factory.create()
+        tg_user = TgUser(chat_id=1, user=category.user)
+        command = Command()
+
+        with (
+            patch.object(Goal.objects, 'create', side_effect=OperationalError('server closed')) as create,
+            patch.object(TgClient, 'send_message') as send,
+            pytest.raises(OperationalError),
+        ):
+            command._create_goal(tg_user, Message(chat=Chat(id=1), text='title'), category=category)
+
+        create.assert_called_once()
+        send.assert_not_called()
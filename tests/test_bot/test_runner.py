@@ -0,0 +1,146 @@
+import asyncio
+import os
+import signal
+import threading
+import time
+from typing import Callable, Iterator
+
+import pytest
+
+from bot.management.commands.runbot import Command
+from bot.models import TgUser
+from bot.runner import BotRunner
+from bot.tg.client import TgClient
+from bot.tg.schemas import Message
+from tests.test_bot.fake_telegram import FakeTelegram
+
+
+@pytest.fixture()
+def telegram() -> Iterator[FakeTelegram]:
+    """
+    Локальная заглушка Bot API
+    """
+    telegram = FakeTelegram()
+    telegram.start()
+    yield telegram
+    telegram.stop()
+
+
+def run_until(runner: BotRunner, condition: Callable[[], bool], timeout: float = 10) -> None:
+    """
+    Запускает бота и останавливает его, когда выполнится условие
+    """
+    async def main() -> None:
+        task = asyncio.create_task(runner.run())
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        runner.stop()
+        await task
+
+    asyncio.run(main())
+    assert condition()
+
+
+def make_runner(telegram: FakeTelegram, handler: Callable[[Message], None], workers: int = 4) -> BotRunner:
+    client = TgClient(token=telegram.token, api_url=telegram.url)
+    return BotRunner(client, handler, workers=workers, max_pending=10, poll_timeout=1)
+
+
+class TestBotRunner:
+
+    def test_slow_chat_does_not_block_others(self, telegram: FakeTelegram) -> None:
+        """
+        Тест, что сообщения других чатов обрабатываются, пока медленный чат занят,
+        а сообщения одного чата обрабатываются по очереди
+        """
+        release = threading.Event()
+        handled: list[tuple[int, str]] = []
+
+        def handler(msg: Message) -> None:
+            if msg.text == 'slow':
+                release.wait(timeout=5)
+            handled.append((msg.chat.id, msg.text))
+            if msg.chat.id == 2 and msg.text == '3':
+                release.set()
+
+        telegram.add_message(1, 'slow')
+        telegram.add_message(1, 'after slow')
+        for text in ('1', '2', '3'):
+            telegram.add_message(2, text)
+
+        runner = make_runner(telegram, handler)
+        run_until(runner, lambda: len(handled) == 5)
+
+        assert handled[:3] == [(2, '1'), (2, '2'), (2, '3')]
+        assert handled[3:] == [(1, 'slow'), (1, 'after slow')]
+        assert runner.offset == 6
+
+    def test_handler_error_does_not_stop_chat(self, telegram: FakeTelegram) -> None:
+        """
+        Тест, что ошибка обработки сообщения не останавливает обработку следующих сообщений чата
+        """
+        handled = []
+
+        def handler(msg: Message) -> None:
+            if msg.text == 'fail':
+                raise ValueError(msg.text)
+            handled.append(msg.text)
+
+        telegram.add_message(1, 'fail')
+        telegram.add_message(1, 'ok')
+
+        run_until(make_runner(telegram, handler, workers=1), lambda: handled == ['ok'])
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRunBotCommand:
+
+    def test_unverified_users_receive_codes(self, telegram: FakeTelegram) -> None:
+        """
+        Тест бота против заглушки Bot API: каждый новый чат получает приветствие и код верификации
+        """
+        command = Command()
+        command.tg_client = TgClient(token=telegram.token, api_url=telegram.url)
+        for chat_id in (1, 2, 3):
+            telegram.add_message(chat_id, 'hello')
+
+        runner = BotRunner(command.tg_client, command.handle_update, workers=2, max_pending=10, poll_timeout=1)
+        run_until(runner, lambda: all(len(telegram.messages(chat_id)) == 2 for chat_id in (1, 2, 3)))
+
+        for tg_user in TgUser.objects.all():
+            assert telegram.messages(tg_user.chat_id) == [
+                'Hello there!', f'Your verification code: {tg_user.verification_code}',
+            ]
+        assert TgUser.objects.count() == 3
+
+    @pytest.mark.parametrize('signum', [signal.SIGTERM, signal.SIGINT])
+    def test_signal_stops_after_in_flight_messages(self, telegram: FakeTelegram, signum: int) -> None:
+        """
+        Тест, что по SIGTERM и SIGINT команда перестает запрашивать обновления,
+        но дорабатывает сообщения, которые уже в обработке
+        """
+        command = Command()
+        command.tg_client = TgClient(token=telegram.token, api_url=telegram.url)
+        started = threading.Event()
+        handle_update = command.handle_update
+
+        def slow_handle_update(msg: Message) -> None:
+            started.set()
+            time.sleep(0.2)
+            handle_update(msg)
+
+        command.handle_update = slow_handle_update
+        for chat_id in (1, 2):
+            telegram.add_message(chat_id, 'hello')
+
+        def send_signal() -> None:
+            started.wait(timeout=10)
+            os.kill(os.getpid(), signum)
+
+        threading.Thread(target=send_signal, daemon=True).start()
+        command.handle(workers=2, max_pending=10)
+
+        assert started.is_set()
+        for chat_id in (1, 2):
+            assert len(telegram.messages(chat_id)) == 2
@@ -1,10 +1,15 @@
 import pytest
 from typing import Any
 from unittest.mock import ANY
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from core.cache import auth_cache
 from core.models import User
 from tests.factories import SignUpRequest
 
@@ -146,3 +151,80 @@ class TestLoginView:
         response = client.post(self.url, data={"username": "username", "password": "password"})
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestCachedAuthentication:
+    url = reverse('core:profile')
+
+    def test_no_auth_queries_when_cached(self, auth_client: APIClient) -> None:
+        """
+        Тест, что сессия и пользователь повторного запроса берутся из кеша без запросов к базе
+        """
+        auth_client.get(self.url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(queries) == 0
+
+    def test_profile_update_invalidates(self, auth_client: APIClient) -> None:
+        """
+        Тест, что после изменения профиля отдается обновленный пользователь
+        """
+        auth_client.get(self.url)
+
+        auth_client.patch(self.url, data={'first_name': 'Иван'})
+
+        assert auth_client.get(self.url).json()['first_name'] == 'Иван'
+
+    def test_password_update_invalidates(self, client: APIClient, user_factory: Any) -> None:
+        """
+        Тест, что после смены пароля другие сессии пользователя перестают действовать
+        """
+        user = user_factory.create(password='old_password')
+        other_client = APIClient()
+        client.force_login(user)
+        other_client.force_login(user)
+        assert other_client.get(self.url).status_code == status.HTTP_200_OK
+
+        response = client.put(
+            reverse('core:update_password'), data={'old_password': 'old_password', 'new_password': 'new_password'}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert other_client.get(self.url).status_code == status.HTTP_403_FORBIDDEN
+
+    def test_logout_invalidates(self, auth_client: APIClient, user: User) -> None:
+        """
+        Тест, что после выхода пользователь удаляется из кеша, а сессия перестает действовать
+        """
+        auth_client.get(self.url)
+
+        auth_client.delete(self.url)
+
+        assert auth_cache().get(f'auth:user:{user.id}') is None
+        assert auth_client.get(self.url).status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.parametrize('engine, error', [
+        ('django.contrib.sessions.backends.cached_db', True),
+        ('django.contrib.sessions.backends.cache', True),
+        ('django.contrib.sessions.backends.db', False),
+    ])
+    def test_cached_sessions_require_shared_cache(self, settings: Any, engine: str, error: bool) -> None:
+        """
+        Тест, что сессии в кеше запрещены, если кеш сессий локальный для процесса
+        """
+        settings.ALLOW_LOCAL_CACHES = False
+        settings.SESSION_ENGINE = engine
+        settings.CACHES = settings.CACHES | {
+            settings.JWT_REVOCATION_CACHE_ALIAS: {'BACKEND': 'django.core.cache.backends.redis.RedisCache'},
+            settings.THROTTLE_CACHE_ALIAS: {'BACKEND': 'django.core.cache.backends.redis.RedisCache'},
+        }
+
+        if error:
+            with pytest.raises(ImproperlyConfigured, match=settings.SESSION_CACHE_ALIAS):
+                apps.get_app_config('core').ready()
+        else:
+            apps.get_app_config('core').ready()
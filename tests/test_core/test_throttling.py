@@ -0,0 +1,223 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.apps import apps
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core import hashing
+from core.models import User
+from core.throttling import AuthIPThrottle, AuthUsernameThrottle, ScopedUserThrottle, TokenBucketThrottle
+from tests.factories import SignUpRequest
+
+
+@pytest.fixture()
+def rates(monkeypatch):
+    """
+    Небольшие лимиты попыток входа и регистрации для тестов
+    """
+    rates = {'auth_ip': '4/min', 'auth_username': '2/min', 'auth': '30/min', 'read': '3/min', 'write': '2/min'}
+    for throttle in (AuthIPThrottle, AuthUsernameThrottle, ScopedUserThrottle):
+        monkeypatch.setattr(throttle, 'THROTTLE_RATES', rates)
+    return rates
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('rates')
+class TestAuthThrottling:
+    url = reverse('core:login')
+
+    def test_username_throttled(self, client: APIClient, user: User) -> None:
+        """
+        Тест на ограничение попыток входа для одного имени пользователя
+        """
+        for _ in range(2):
+            response = client.post(self.url, data={'username': user.username, 'password': 'wrong'})
+            assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        response = client.post(self.url, data={'username': user.username.upper(), 'password': 'wrong'})
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert 0 < int(response.headers['Retry-After']) <= 30
+
+        response = client.post(self.url, data={'username': 'another', 'password': 'wrong'})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_ip_throttled(self, client: APIClient) -> None:
+        """
+        Тест на ограничение попыток входа и регистрации с одного адреса
+        """
+        for index in range(4):
+            response = client.post(self.url, data={'username': f'user{index}', 'password': 'wrong'})
+            assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        response = client.post(reverse('core:signup'), data=SignUpRequest.build())
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert not User.objects.exists()
+
+        response = client.post(self.url, data={'username': 'user', 'password': 'wrong'}, REMOTE_ADDR='10.0.0.2')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_spoofed_forwarded_for_ignored(self, client: APIClient) -> None:
+        """
+        Тест, что подставленный клиентом X-Forwarded-For не дает новую корзину: nginx дописывает
+        реальный адрес в конец заголовка, и берется только он
+        """
+        for index in range(5):
+            response = client.post(
+                self.url,
+                data={'username': f'user{index}', 'password': 'wrong'},
+                HTTP_X_FORWARDED_FOR=f'203.0.113.{index}, 198.51.100.1',
+            )
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_non_object_body(self, client: APIClient) -> None:
+        """
+        Тест, что тело запроса не в виде объекта не ломает ограничение по имени пользователя
+        """
+        response = client.post(self.url, data=[], format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_parallel_burst(self, settings, monkeypatch) -> None:
+        """
+        Тест, что параллельные запросы не читают одно и то же число токенов
+        """
+        cache = caches[settings.THROTTLE_CACHE_ALIAS]
+        cache_get = type(cache).get
+
+        def slow_get(self, *args, **kwargs):
+            value = cache_get(self, *args, **kwargs)
+            time.sleep(0.005)
+            return value
+
+        monkeypatch.setattr(type(cache), 'get', slow_get)
+        barrier = threading.Barrier(8)
+        request = Request(
+            APIRequestFactory().post(self.url, data={'username': 'user'}, format='json'), parsers=[JSONParser()]
+        )
+        assert request.data == {'username': 'user'}
+
+        def attempt(_) -> bool:
+            barrier.wait()
+            return AuthUsernameThrottle().allow_request(request, None)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            allowed = list(executor.map(attempt, range(8)))
+
+        assert allowed.count(True) == 2
+
+    def test_bucket_refills(self, client: APIClient, user: User, monkeypatch) -> None:
+        """
+        Тест на пополнение корзины со временем: за 30 секунд при скорости 2/min появляется один токен
+        """
+        now = 1000.0
+        monkeypatch.setattr(TokenBucketThrottle, 'timer', lambda self: now)
+        data = {'username': user.username, 'password': 'wrong'}
+        for _ in range(2):
+            client.post(self.url, data=data)
+        assert client.post(self.url, data=data).status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+        now += 30
+        assert client.post(self.url, data=data).status_code == status.HTTP_403_FORBIDDEN
+        assert client.post(self.url, data=data).status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('rates')
+class TestScopedThrottling:
+    url = reverse('core:profile')
+
+    def test_rate_limit_headers(self, auth_client: APIClient) -> None:
+        """
+        Тест на заголовки RateLimit-* в ответах
+        """
+        response = auth_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['RateLimit-Limit'] == '3'
+        assert response.headers['RateLimit-Remaining'] == '2'
+        assert response.headers['RateLimit-Reset'] == '20'
+
+    def test_read_throttled_per_user(self, auth_client: APIClient, another_user: User) -> None:
+        """
+        Тест на ограничение чтения для пользователя: лимит не затрагивает других пользователей и запись
+        """
+        for remaining in ('2', '1', '0'):
+            assert auth_client.get(self.url).headers['RateLimit-Remaining'] == remaining
+
+        response = auth_client.get(self.url)
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.headers['RateLimit-Remaining'] == '0'
+        assert response.headers['Retry-After'] == response.headers['RateLimit-Reset'] == '20'
+
+        response = auth_client.patch(self.url, data={'first_name': 'name'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['RateLimit-Limit'] == '2'
+
+        other_client = APIClient()
+        other_client.force_login(another_user)
+        assert other_client.get(self.url).status_code == status.HTTP_200_OK
+
+    def test_auth_headers_most_restrictive(self, client: APIClient) -> None:
+        """
+        Тест на заголовки входа: отдается самое строгое из ограничений (по имени пользователя)
+        """
+        response = client.post(reverse('core:login'), data={'username': 'user', 'password': 'wrong'})
+
+        assert response.headers['RateLimit-Limit'] == '2'
+        assert response.headers['RateLimit-Remaining'] == '1'
+
+    def test_local_cache_rejected(self, settings) -> None:
+        """
+        Тест, что приложение не запускается с локальным кешем корзин: лимиты должны
+        действовать суммарно по всем процессам
+        """
+        settings.ALLOW_LOCAL_CACHES = False
+        settings.CACHES = settings.CACHES | {
+            settings.JWT_REVOCATION_CACHE_ALIAS: {'BACKEND': 'django.core.cache.backends.redis.RedisCache'},
+        }
+
+        with pytest.raises(ImproperlyConfigured, match=settings.THROTTLE_CACHE_ALIAS):
+            apps.get_app_config('core').ready()
+
+
+@pytest.mark.django_db
+class TestPasswordHashing:
+    def test_login_shed_when_busy(self, client: APIClient, user_factory, monkeypatch) -> None:
+        """
+        Тест на отклонение входа с ответом 429, когда пул хеширования и очередь заняты
+        """
+        user = user_factory.create(password='password')
+        executor = hashing.HashExecutor(workers=1, queue_size=0)
+        monkeypatch.setattr(hashing, '_executor', executor)
+
+        executor.slots.acquire()
+        response = client.post(reverse('core:login'), data={'username': user.username, 'password': 'password'})
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.headers['Retry-After'] == '1'
+
+        executor.slots.release()
+        response = client.post(reverse('core:login'), data={'username': user.username, 'password': 'password'})
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_outdated_hash_updated(self, user_factory) -> None:
+        """
+        Тест на пересчет хеша пароля со старыми параметрами после успешной проверки
+        """
+        user = user_factory.create(password='password')
+        algorithm, iterations, salt, digest = user.password.split('$')
+        user.password = hashing.hashers.PBKDF2PasswordHasher().encode('password', salt, int(iterations) - 1)
+        user.save(update_fields=['password'])
+
+        assert not hashing.check_password(user, 'wrong')
+        assert hashing.check_password(user, 'password')
+        user.refresh_from_db()
+        assert user.password.split('$')[1] == iterations
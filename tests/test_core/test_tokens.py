@@ -0,0 +1,131 @@
+from typing import Any
+
+import jwt
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.cache import auth_cache
+from core.models import User
+from goals.models import Board
+
+
+@pytest.mark.django_db
+class TestJWTAuthentication:
+    profile_url = reverse('core:profile')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, client: APIClient, user_factory: Any) -> None:
+        self.user = user_factory.create(password='password')
+        response = client.post(
+            reverse('core:login'), data={'username': self.user.username, 'password': 'password', 'mode': 'token'}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        self.tokens = response.json()
+
+    @staticmethod
+    def bearer(token: str) -> APIClient:
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
+
+    def test_login_token_mode(self, client: APIClient) -> None:
+        """
+        Тест, что вход в режиме token возвращает пару токенов и не создает сессию
+        """
+        assert set(self.tokens) >= {'access', 'refresh'}
+        assert 'sessionid' not in client.cookies
+
+    def test_access_without_database(self) -> None:
+        """
+        Тест, что запрос с access-токеном аутентифицируется без запросов к базе
+        """
+        client = self.bearer(self.tokens['access'])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(self.profile_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['username'] == self.user.username
+        assert len(queries) == 0
+
+    def test_write_with_token_user(self) -> None:
+        """
+        Тест, что пользователь из токена подходит для создания объектов
+        """
+        response = self.bearer(self.tokens['access']).post(reverse('goals:create_board'), data={'title': 'board'})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Board.objects.get().participants.get().user == self.user
+
+    @pytest.mark.parametrize('token', ['invalid', 'refresh'], ids=['malformed', 'refresh token'])
+    def test_invalid_token(self, token: str) -> None:
+        """
+        Тест, что некорректный токен и refresh-токен вместо access отклоняются
+        """
+        response = self.bearer(self.tokens.get(token, token)).get(self.profile_url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_key_rotation(self, settings: Any) -> None:
+        """
+        Тест, что после смены активного ключа старые токены принимаются, пока их ключ в списке
+        """
+        settings.JWT_SIGNING_KEYS = {**settings.JWT_SIGNING_KEYS, 'new': 'new-secret'}
+        settings.JWT_ACTIVE_KEY = 'new'
+        response = self.bearer(self.tokens['access']).get(self.profile_url)
+        assert response.status_code == status.HTTP_200_OK
+
+        tokens = APIClient().post(reverse('core:token_refresh'), data={'refresh': self.tokens['refresh']}).json()
+        assert jwt.get_unverified_header(tokens['access'])['kid'] == 'new'
+
+        settings.JWT_SIGNING_KEYS = {'new': 'new-secret'}
+        assert self.bearer(self.tokens['access']).get(self.profile_url).status_code == status.HTTP_403_FORBIDDEN
+        assert self.bearer(tokens['access']).get(self.profile_url).status_code == status.HTTP_200_OK
+
+    def test_refresh_rotates(self) -> None:
+        """
+        Тест, что refresh-токен выдает новую пару и повторно не принимается
+        """
+        url = reverse('core:token_refresh')
+
+        response = APIClient().post(url, data={'refresh': self.tokens['refresh']})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert self.bearer(response.json()['access']).get(self.profile_url).status_code == status.HTTP_200_OK
+        response = APIClient().post(url, data={'refresh': self.tokens['refresh']})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_revoke(self) -> None:
+        """
+        Тест, что отозванные токены перестают приниматься
+        """
+        client = self.bearer(self.tokens['access'])
+
+        response = client.post(reverse('core:token_revoke'), data={'refresh': self.tokens['refresh']})
+        # Вытеснение сессий и пользователей из кеша не затрагивает список отозванных токенов
+        auth_cache().clear()
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert client.get(self.profile_url).status_code == status.HTTP_403_FORBIDDEN
+        response = APIClient().post(reverse('core:token_refresh'), data={'refresh': self.tokens['refresh']})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_password_change_revokes_tokens(self) -> None:
+        """
+        Тест, что смена пароля отзывает все ранее выданные токены пользователя
+        """
+        client = self.bearer(self.tokens['access'])
+
+        response = client.put(
+            reverse('core:update_password'), data={'old_password': 'password', 'new_password': 'new_password'}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert User.objects.get(id=self.user.id).check_password('new_password')
+        assert client.get(self.profile_url).status_code == status.HTTP_403_FORBIDDEN
+        response = APIClient().post(reverse('core:token_refresh'), data={'refresh': self.tokens['refresh']})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -1,15 +1,23 @@
 from typing import Callable, Any
-from unittest.mock import ANY
+from unittest.mock import ANY, patch
 
 import pytest
 from faker import Faker
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 
 
 from rest_framework.test import APIClient
-from goals.models import Board, BoardParticipant
+from goals.archive import ArchiveWorker, LeaseLost
+from goals.cache import board_cache, get_board_ids, get_stats
+from goals.models import ArchiveJob, Board, BoardGoalStat, BoardParticipant, Goal, GoalCategory
 
 
 @pytest.fixture
@@ -41,6 +49,81 @@ class TestListBoardView:
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
+    def test_list_board_cached(self, auth_client: APIClient, board_participant: Any) -> None:
+        """
+        Тест, что повторный запрос списка досок берет доски пользователя из кеша
+        """
+        auth_client.get(self.url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(self.url)
+
+        assert [board['id'] for board in response.json()] == [board_participant.board_id]
+        assert not [query for query in queries if 'goals_boardparticipant' in query['sql']]
+        assert get_stats() == {'hits': 3, 'misses': 1}
+
+    def test_list_board_invalidated_on_participants_update(
+        self, client: APIClient, user: Any, user_factory: Any, board_participant: Any
+    ) -> None:
+        """
+        Тест, что кеш досок сбрасывается, когда пользователя добавляют в участники или удаляют из них
+        """
+        reader = user_factory.create()
+        client.force_login(reader)
+        assert client.get(self.url).json() == []
+        board_url = reverse('goals:board_detail', kwargs={'pk': board_participant.board_id})
+        participants = [{'user': reader.username, 'role': BoardParticipant.Role.reader}]
+
+        client.force_login(user)
+        client.put(board_url, data={'title': 'board', 'participants': participants}, format='json')
+        client.force_login(reader)
+        assert [board['id'] for board in client.get(self.url).json()] == [board_participant.board_id]
+
+        client.force_login(user)
+        client.put(board_url, data={'title': 'board', 'participants': []}, format='json')
+        client.force_login(reader)
+        assert client.get(self.url).json() == []
+
+    def test_stale_fill_not_cached(self, user: Any, board_participant: Any) -> None:
+        """
+        Тест, что состав досок, загруженный до удаления участника, не попадает в кеш после сброса
+        """
+        cache = board_cache()
+        cache_set = cache.set
+
+        def set_after_removal(key: str, *args: Any, **kwargs: Any) -> None:
+            if key.startswith('boards:user:'):
+                board_participant.delete()
+            cache_set(key, *args, **kwargs)
+
+        with patch.object(cache, 'set', side_effect=set_after_removal):
+            assert get_board_ids(user.id) == [board_participant.board_id]
+
+        assert get_board_ids(user.id) == []
+
+    def test_cache_stats_staff_only(self, auth_client: APIClient, user: Any) -> None:
+        """
+        Тест, что счетчики кеша досок доступны только персоналу
+        """
+        url = reverse('goals:board_cache_stats')
+        assert auth_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+        user.is_staff = True
+        user.save(update_fields=['is_staff'])
+        response = auth_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'hits': 0, 'misses': 0}
+
+    def test_local_cache_rejected(self, settings: Any) -> None:
+        """
+        Тест, что кеш досок, локальный для процесса, запрещен: по нему проверяются права доступа
+        """
+        settings.ALLOW_LOCAL_CACHES = False
+
+        with pytest.raises(ImproperlyConfigured, match=settings.BOARD_CACHE_ALIAS):
+            apps.get_app_config('goals').ready()
+
 
 @pytest.mark.django_db
 class TestBoardCreateView:
@@ -126,6 +209,76 @@ class TestRetrieveBoardView:
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
 
+@pytest.mark.django_db
+class TestUpdateBoardView:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_participant: Any, board_participant_factory: Any) -> None:
+        self.board = board_participant.board
+        self.url = reverse('goals:board_detail', kwargs={'pk': self.board.id})
+        self.reader = board_participant_factory.create(board=self.board, role=BoardParticipant.Role.reader)
+        self.writer = board_participant_factory.create(board=self.board, role=BoardParticipant.Role.writer)
+
+    def test_title_update_keeps_participants(self, auth_client: APIClient) -> None:
+        """
+        Тест, что изменение только названия доски не трогает участников
+        """
+        participants = set(BoardParticipant.objects.values_list('id', 'role', 'updated'))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.patch(self.url, data={'title': 'new title'}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(BoardParticipant.objects.values_list('id', 'role', 'updated')) == participants
+        assert not [query for query in queries if query['sql'].startswith(('DELETE', 'INSERT'))]
+
+    def test_participants_diff(self, auth_client: APIClient, user: Any, user_factory: Any) -> None:
+        """
+        Тест, что изменяются только участники из разницы: роль меняется на месте,
+        отсутствующие в запросе удаляются, новые добавляются
+        """
+        new_user = user_factory.create()
+        participants = [
+            {'user': self.reader.user.username, 'role': BoardParticipant.Role.writer},
+            {'user': new_user.username, 'role': BoardParticipant.Role.reader},
+        ]
+
+        response = auth_client.put(self.url, data={'title': 'board', 'participants': participants}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(BoardParticipant.objects.values_list('user_id', 'role')) == {
+            (user.id, BoardParticipant.Role.owner),
+            (self.reader.user_id, BoardParticipant.Role.writer),
+            (new_user.id, BoardParticipant.Role.reader),
+        }
+        assert BoardParticipant.objects.get(user=self.reader.user).id == self.reader.id
+
+    def test_usernames_resolved_in_one_query(self, auth_client: APIClient, user_factory: Any) -> None:
+        """
+        Тест, что пользователи всех участников загружаются одним запросом
+        """
+        participants = [
+            {'user': new_user.username, 'role': BoardParticipant.Role.reader} for new_user in user_factory.create_batch(5)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.put(self.url, data={'title': 'board', 'participants': participants}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len([query for query in queries if '"core_user"."username" IN' in query['sql']]) == 1
+
+    def test_unknown_username(self, auth_client: APIClient) -> None:
+        """
+        Тест, что неизвестный пользователь в списке участников приводит к ошибке 400
+        """
+        participants = [{'user': 'unknown', 'role': BoardParticipant.Role.reader}]
+
+        response = auth_client.put(self.url, data={'title': 'board', 'participants': participants}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert BoardParticipant.objects.count() == 3
+
+
 @pytest.mark.django_db
 class TestDestroyBoardView:
 
@@ -168,3 +321,283 @@ class TestDestroyBoardView:
         assert response.status_code == status.HTTP_204_NO_CONTENT
         board.refresh_from_db()
         assert board.is_deleted is True
+
+
+@pytest.mark.django_db
+class TestBoardArchiveJob:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_participant: Any, goal_category_factory: Any, goal_factory: Any) -> None:
+        self.board = board_participant.board
+        self.categories = goal_category_factory.create_batch(2, board=self.board)
+        self.goals = [goal_factory.create(category=category) for category in self.categories for _ in range(3)]
+
+    def test_delete_board_schedules_archive(self, auth_client: APIClient) -> None:
+        """
+        Тест, что удаление доски сразу скрывает ее цели, а архивирование выполняется в фоне
+        """
+        response = auth_client.delete(reverse('goals:board_detail', kwargs={'pk': self.board.id}))
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        job = ArchiveJob.objects.get(board=self.board)
+        assert response['Location'].endswith(reverse('goals:archive_job', kwargs={'pk': job.id}))
+        assert Goal.objects.exclude(status=Goal.Status.archived).count() == 6
+        assert auth_client.get(reverse('goals:goal_list')).json() == []
+        assert auth_client.get(reverse('goals:category_list')).json() == []
+
+        response = auth_client.get(response['Location'])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['status'] == ArchiveJob.Status.pending
+        assert response.json()['goals_total'] == 6
+
+    def test_worker_archives_in_batches(self, auth_client: APIClient) -> None:
+        """
+        Тест, что обработчик архивирует цели и удаляет категории партиями и завершает задание
+        """
+        auth_client.delete(reverse('goals:board_detail', kwargs={'pk': self.board.id}))
+
+        assert ArchiveWorker(batch_size=4).run_pending() == 1
+
+        job = ArchiveJob.objects.get(board=self.board)
+        assert job.status == ArchiveJob.Status.done
+        assert job.goals_archived == 6
+        assert job.categories_deleted == 2
+        assert job.locked_until is None
+        assert not Goal.objects.exclude(status=Goal.Status.archived).exists()
+        assert not GoalCategory.objects.filter(is_deleted=False).exists()
+
+    def test_worker_resumes_expired_job(self, auth_client: APIClient) -> None:
+        """
+        Тест, что задание упавшего обработчика подхватывается после истечения аренды
+        и продолжается с последней обработанной цели
+        """
+        auth_client.delete(reverse('goals:board_detail', kwargs={'pk': self.board.id}))
+        crashed = ArchiveWorker(batch_size=4, lease=0)
+        job = crashed.claim()
+        crashed._archive_goals(job)
+
+        assert ArchiveWorker(batch_size=4).claim() is not None
+        with pytest.raises(LeaseLost):
+            crashed._archive_goals(job)
+
+        ArchiveWorker(batch_size=4).run(ArchiveJob.objects.get(id=job.id))
+        job.refresh_from_db()
+        assert job.attempts == 2
+        assert job.goals_archived == 6
+        assert not Goal.objects.exclude(status=Goal.Status.archived).exists()
+
+    def test_archive_job_foreign_user(self, client: APIClient, user_factory: Any, auth_client: APIClient) -> None:
+        """
+        Тест, что прогресс задания недоступен пользователю, который не участник доски
+        """
+        response = auth_client.delete(reverse('goals:board_detail', kwargs={'pk': self.board.id}))
+        client.force_login(user_factory.create())
+
+        assert client.get(response['Location']).status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestBoardConditionalGet:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_participant: Any, goal_category_factory: Any, goal_factory: Any) -> None:
+        self.board = board_participant.board
+        self.category = goal_category_factory.create(board=self.board)
+        self.goal = goal_factory.create(category=self.category)
+
+    @pytest.mark.parametrize('url_name', ['goals:board_list', 'goals:category_list', 'goals:goal_list'])
+    def test_list_not_modified(self, auth_client: APIClient, url_name: str) -> None:
+        """
+        Тест, что список с актуальным ETag возвращает 304 без выполнения запроса списка
+        """
+        url = reverse(url_name)
+        etag = auth_client.get(url)['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not [query for query in queries if 'goals_goal"' in query['sql']]
+        assert len([query for query in queries if 'goals_board' in query['sql']]) == 1
+
+    def test_list_modified_after_write(self, auth_client: APIClient, goal_factory: Any) -> None:
+        """
+        Тест, что запись на доске меняет ETag списков
+        """
+        url = reverse('goals:goal_list')
+        etag = auth_client.get(url)['ETag']
+        self.goal.title = 'changed'
+        self.goal.save()
+
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+        assert response.json()[0]['title'] == 'changed'
+
+    def test_detail_not_modified(self, auth_client: APIClient, goal_comment_factory: Any) -> None:
+        """
+        Тест, что доска отдает 304, пока на ней ничего не менялось
+        """
+        url = reverse('goals:board_detail', kwargs={'pk': self.board.id})
+        response = auth_client.get(url)
+        etag = response['ETag']
+        assert not response.has_header('Last-Modified')
+
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+        goal_comment_factory.create(goal=self.goal)
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+    def test_if_modified_since_ignored(self, auth_client: APIClient) -> None:
+        """
+        Тест, что If-Modified-Since не дает 304: по времени с точностью до секунды изменения не отследить
+        """
+        url = reverse('goals:goal_list')
+        auth_client.get(url)
+        self.goal.title = 'changed'
+        self.goal.save()
+
+        response = auth_client.get(url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_version_bumps_once_per_write(self) -> None:
+        """
+        Тест, что версия доски растет на единицу при каждом изменении, в том числе при save() устаревшего объекта
+        """
+        version = Board.objects.get(id=self.board.id).version
+        Goal.objects.filter(category=self.category).update(priority=Goal.Priority.high)
+        self.board.title = 'stale save'
+        self.board.save()
+
+        assert Board.objects.get(id=self.board.id).version == version + 2
+
+    def test_child_writes_keep_board_updated(self) -> None:
+        """
+        Тест, что запись целей меняет только версию доски, а не время ее изменения
+        """
+        board = Board.objects.get(id=self.board.id)
+        self.goal.title = 'changed'
+        self.goal.save()
+
+        changed = Board.objects.get(id=self.board.id)
+        assert changed.version == board.version + 1
+        assert changed.updated == board.updated
+
+    @pytest.mark.parametrize('url_name', ['goals:category_list', 'goals:goal_list'])
+    def test_list_modified_after_author_profile_change(self, auth_client: APIClient, url_name: str) -> None:
+        """
+        Тест, что изменение профиля автора меняет ETag списков, которые встраивают автора,
+        а вход пользователя - нет
+        """
+        url = reverse(url_name)
+        etag = auth_client.get(url)['ETag']
+        author = self.goal.user if url_name == 'goals:goal_list' else self.category.user
+        author.last_login = timezone.now()
+        author.save(update_fields=['last_login'])
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+        author.first_name = 'renamed'
+        author.save()
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()[0]['user']['first_name'] == 'renamed'
+
+    def test_foreign_board_not_answered_with_304(self, auth_client: APIClient, user_factory: Any) -> None:
+        """
+        Тест, что пользователь, который не участник доски, не получает 304 по чужому ETag
+        """
+        url = reverse('goals:board_detail', kwargs={'pk': self.board.id})
+        etag = auth_client.get(url)['ETag']
+        auth_client.force_login(user_factory.create())
+
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestBoardStatsView:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, board_participant: Any, goal_category_factory: Any, goal_factory: Any) -> None:
+        self.board = board_participant.board
+        self.url = reverse('goals:board_stats', kwargs={'pk': self.board.id})
+        self.category = goal_category_factory.create(board=self.board)
+        self.goals = [
+            goal_factory.create(category=self.category, status=Goal.Status.to_do, priority=Goal.Priority.high),
+            goal_factory.create(category=self.category, status=Goal.Status.to_do, priority=Goal.Priority.low),
+            goal_factory.create(category=self.category, status=Goal.Status.done, priority=Goal.Priority.high),
+        ]
+
+    def test_authorization_required(self, client: APIClient) -> None:
+        """
+        Тест, что неавторизованный пользователь не получает статистику доски
+        """
+        response = client.get(self.url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_stats_follow_goal_changes(self, auth_client: APIClient) -> None:
+        """
+        Тест, что счетчики учитывают создание, изменение статуса и архивирование целей
+        """
+        self.goals[0].status = Goal.Status.in_progress
+        self.goals[0].save()
+        Goal.objects.filter(id=self.goals[1].id).update(status=Goal.Status.archived)
+
+        response = auth_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'board': self.board.id,
+            'total': 2,
+            'by_status': {'1': 0, '2': 1, '3': 1, '4': 1},
+            'by_priority': {'1': 0, '2': 0, '3': 2, '4': 0},
+        }
+
+    def test_stats_after_category_deleted(self, auth_client: APIClient) -> None:
+        """
+        Тест, что счетчики учитывают массовое архивирование целей при удалении категории
+        """
+        auth_client.delete(reverse('goals:category_detail', kwargs={'pk': self.category.id}))
+        call_command('archive_worker', '--once')
+
+        response = auth_client.get(self.url)
+
+        assert response.json()['total'] == 0
+        assert response.json()['by_status']['4'] == 3
+
+    def test_rebuild_board_stats(self) -> None:
+        """
+        Тест, что команда rebuild_board_stats находит и исправляет рассинхронизацию счетчиков
+        """
+        call_command('rebuild_board_stats', '--check')
+        BoardGoalStat.objects.filter(board=self.board, status=Goal.Status.done).update(goals_count=10)
+
+        with pytest.raises(CommandError):
+            call_command('rebuild_board_stats', '--check')
+
+        call_command('rebuild_board_stats')
+        call_command('rebuild_board_stats', '--check')
+        assert BoardGoalStat.objects.get(board=self.board, status=Goal.Status.done).goals_count == 1
+
+    @pytest.mark.parametrize('tables', [
+        ['goals_boardgoalstat', 'goals_goal', 'goals_goalcategory', 'goals_boardparticipant', 'goals_board'],
+        ['goals_board', 'goals_boardparticipant', 'goals_goal', 'goals_goalcategory'],
+    ], ids=['goals_first', 'board_first'])
+    def test_board_hard_delete(self, tables: list[str]) -> None:
+        """
+        Тест, что доску с целями можно удалить из базы в любом порядке: удаление целей
+        не создает счетчики доски, которой нет или которая удаляется в той же транзакции
+        """
+        with connection.cursor() as cursor:
+            for table in tables:
+                column = 'id' if table == 'goals_board' else 'board_id'
+                cursor.execute(f'DELETE FROM {table} WHERE {column} = %s', [self.board.id])
+
+        connection.check_constraints()
+        assert not BoardGoalStat.objects.filter(board_id=self.board.id).exists()
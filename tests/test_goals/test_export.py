@@ -0,0 +1,99 @@
+import gzip
+import json
+import threading
+from typing import Any
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from goals.export import export_records
+from goals.models import BoardParticipant
+
+
+@pytest.mark.django_db
+class TestExportView:
+    url = reverse('goals:export')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user: Any, board_participant_factory: Any, goal_category_factory: Any,
+              goal_factory: Any, goal_comment_factory: Any) -> None:
+        self.board = board_participant_factory.create(user=user, role=BoardParticipant.Role.reader).board
+        self.category = goal_category_factory.create(board=self.board)
+        self.goals = goal_factory.create_batch(3, category=self.category)
+        self.comment = goal_comment_factory.create(goal=self.goals[0])
+        goal_category_factory.create(board=self.board, is_deleted=True)
+        goal_comment_factory.create()
+
+    @staticmethod
+    def parse(content: bytes) -> list[tuple[str, int]]:
+        return [(record['type'], record['id']) for record in map(json.loads, gzip.decompress(content).splitlines())]
+
+    def expected(self) -> list[tuple[str, int]]:
+        return [
+            ('board', self.board.id),
+            ('category', self.category.id),
+            *[('goal', goal.id) for goal in self.goals],
+            ('comment', self.comment.id),
+        ]
+
+    def test_authorization_required(self, client: APIClient) -> None:
+        """
+        Тест, что неавторизованный пользователь не может выгрузить данные
+        """
+        response = client.get(self.url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_export_stream(self, auth_client: APIClient) -> None:
+        """
+        Тест, что выгрузка отдается сжатым потоком и содержит только доступные пользователю данные
+        """
+        response = auth_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['Content-Type'] == 'application/gzip'
+        assert self.parse(b''.join(response.streaming_content)) == self.expected()
+
+    def test_export_command(self, user: Any, tmp_path: Any) -> None:
+        """
+        Тест, что команда export_goals записывает ту же выгрузку в файл
+        """
+        output = tmp_path / 'export.jsonl.gz'
+
+        call_command('export_goals', user.username, '--output', str(output), '--chunk-size', '1')
+
+        assert self.parse(output.read_bytes()) == self.expected()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestExportSnapshot:
+
+    def test_export_is_consistent_snapshot(self, user: Any, board_participant_factory: Any,
+                                           goal_category_factory: Any, goal_factory: Any) -> None:
+        """
+        Тест, что выгрузка читает все таблицы в одном снимке: записи, зафиксированные
+        во время выгрузки, в нее не попадают
+        """
+        board = board_participant_factory.create(user=user, role=BoardParticipant.Role.owner).board
+        category = goal_category_factory.create(board=board)
+        goal = goal_factory.create(category=category)
+
+        records = export_records(user.id)
+        assert next(records) == {'type': 'board', 'id': board.id, 'title': board.title,
+                                 'created': board.created, 'updated': board.updated}
+
+        def write() -> None:
+            goal_factory.create(category=category)
+            goal_category_factory.create(board=board)
+            connection.close()
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        thread.join()
+
+        assert [(record['type'], record['id']) for record in records] == [('category', category.id), ('goal', goal.id)]
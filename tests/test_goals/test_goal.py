@@ -1,12 +1,20 @@
+import base64
+import io
+import json
+from urllib.parse import urlencode
+
 import pytest
 from typing import Any
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.fields import DateTimeField
 from rest_framework.response import Response
 from rest_framework.test import APIClient
 
-from goals.models import BoardParticipant, Goal
+from goals.models import BoardParticipant, Goal, GoalCategory, GoalComment
 from tests.factories import CreateGoalRequest
 
 
@@ -123,6 +131,139 @@ class TestListGoalView:
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
+    @pytest.mark.parametrize('ordering', ['title', '-created'])
+    def test_list_goals_cursor_pagination(self, auth_client: APIClient, user: Any, board_participant_factory: Any,
+                                          goal_category_factory: Any, goal_factory: Any, ordering: str) -> None:
+        """
+        Тест, что курсорная пагинация обходит все цели без пропусков и повторов с учетом сортировки
+        """
+        board_participant = board_participant_factory.create(role=BoardParticipant.Role.owner, user=user)
+        goal_category = goal_category_factory.create(board=board_participant.board, user=user)
+        goals = goal_factory.create_batch(5, category=goal_category, user=user, title='same title')
+
+        url = f"{self.url}?pagination=cursor&limit=2&ordering={ordering}"
+        ids = []
+        while url:
+            response = auth_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert 'count' not in response.json()
+            ids += [goal['id'] for goal in response.json()['results']]
+            url = response.json()['next']
+
+        expected = sorted(goals, key=lambda goal: (goal.created, goal.id), reverse=ordering.startswith('-'))
+        assert ids == [goal.id for goal in expected]
+
+    def test_list_goals_cursor_pagination_stable_on_insert(self, auth_client: APIClient, user: Any,
+                                                           board_participant_factory: Any,
+                                                           goal_category_factory: Any, goal_factory: Any) -> None:
+        """
+        Тест, что при одинаковых значениях поля сортировки вставка новой цели между страницами
+        не приводит к повторам и пропускам, а ссылка previous возвращает предыдущую страницу
+        """
+        board_participant = board_participant_factory.create(role=BoardParticipant.Role.owner, user=user)
+        goal_category = goal_category_factory.create(board=board_participant.board, user=user)
+        goals = goal_factory.create_batch(5, category=goal_category, user=user, title='b')
+
+        first = auth_client.get(self.url, {'pagination': 'cursor', 'limit': 2, 'ordering': 'title'}).json()
+        goal_factory.create(category=goal_category, user=user, title='a')
+        second = auth_client.get(first['next']).json()
+        third = auth_client.get(second['next']).json()
+
+        ids = [goal['id'] for page in (first, second, third) for goal in page['results']]
+        assert ids == [goal.id for goal in goals]
+        assert third['next'] is None
+        assert auth_client.get(third['previous']).json()['results'] == second['results']
+
+    @pytest.mark.parametrize('ordering, position', [
+        ('-created', ['abc', 'x']),
+        ('title', ['title', 'x']),
+        ('title', ['title', None]),
+        ('-created', ['2026-10-18T00:00:00+00:00', 10 ** 30]),
+    ])
+    def test_list_goals_tampered_cursor(self, auth_client: APIClient, ordering: str, position: list) -> None:
+        """
+        Тест, что курсор с поврежденной позицией отклоняется как недействительный, а не вызывает ошибку
+        """
+        cursor = base64.b64encode(urlencode({'p': json.dumps(position)}).encode()).decode()
+
+        response = auth_client.get(self.url, {'cursor': cursor, 'ordering': ordering})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json() == {'detail': 'Invalid cursor'}
+
+    def test_list_goals_cursor_pagination_with_filter(self, auth_client: APIClient, user: Any,
+                                                      board_participant_factory: Any, goal_category_factory: Any,
+                                                      goal_factory: Any) -> None:
+        """
+        Тест, что курсорная пагинация учитывает фильтры GoalListFilter
+        """
+        board_participant = board_participant_factory.create(role=BoardParticipant.Role.owner, user=user)
+        goal_category = goal_category_factory.create(board=board_participant.board, user=user)
+        goal_factory.create_batch(3, category=goal_category, user=user, status=Goal.Status.to_do)
+        done = goal_factory.create_batch(2, category=goal_category, user=user, status=Goal.Status.done)
+
+        response = auth_client.get(self.url, {'pagination': 'cursor', 'status__in': Goal.Status.done})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert {goal['id'] for goal in response.json()['results']} == {goal.id for goal in done}
+        assert response.json()['next'] is None
+
+    def test_list_goals_queries_independent_of_page_size(self, auth_client: APIClient, user: Any,
+                                                        board_participant_factory: Any, goal_category_factory: Any,
+                                                        goal_factory: Any) -> None:
+        """
+        Тест, что число запросов к базе не растет вместе с количеством целей на странице
+        """
+        board_participant = board_participant_factory.create(role=BoardParticipant.Role.owner, user=user)
+        goal_category = goal_category_factory.create(board=board_participant.board, user=user)
+        goal_factory.create(category=goal_category)
+        auth_client.get(self.url)  # заполняет кеш досок пользователя
+        with CaptureQueriesContext(connection) as single_page:
+            auth_client.get(self.url)
+
+        goal_factory.create_batch(10, category=goal_category)
+        with CaptureQueriesContext(connection) as full_page:
+            response = auth_client.get(self.url)
+
+        assert len(response.json()) == 11
+        assert len(full_page) == len(single_page)
+
+    def test_search_goals_ranked(self, auth_client: APIClient, user: Any, board_participant_factory: Any,
+                                 goal_category_factory: Any, goal_factory: Any) -> None:
+        """
+        Тест, что полнотекстовый поиск находит цели по словоформам и ставит совпадения
+        в названии выше совпадений в описании
+        """
+        board_participant = board_participant_factory.create(role=BoardParticipant.Role.owner, user=user)
+        goal_category = goal_category_factory.create(board=board_participant.board, user=user)
+        in_description = goal_factory.create(category=goal_category, title='Quarter', description='Write reports')
+        in_title = goal_factory.create(category=goal_category, title='Reporting', description='Quarter')
+        goal_factory.create(category=goal_category, title='Unrelated', description='Nothing here')
+        goal_factory.create(category=goal_category, title='Report', status=Goal.Status.archived)
+
+        response = auth_client.get(self.url, {'search': 'report'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [goal['id'] for goal in response.json()] == [in_title.id, in_description.id]
+
+    def test_search_goals_with_filter(self, auth_client: APIClient, user: Any, board_participant_factory: Any,
+                                      goal_category_factory: Any, goal_factory: Any) -> None:
+        """
+        Тест, что поиск работает совместно с фильтрами GoalListFilter и отражает изменения цели
+        """
+        board_participant = board_participant_factory.create(role=BoardParticipant.Role.owner, user=user)
+        goal_category = goal_category_factory.create(board=board_participant.board, user=user)
+        goal_factory.create(category=goal_category, title='Планирование бюджета', priority=Goal.Priority.low)
+        goal = goal_factory.create(category=goal_category, title='Планирование отпуска', priority=Goal.Priority.high)
+
+        response = auth_client.get(self.url, {'search': 'планированию', 'priority__in': Goal.Priority.high})
+        assert [item['id'] for item in response.json()] == [goal.id]
+
+        goal.title = 'Отпуск'
+        goal.save()
+        response = auth_client.get(self.url, {'search': 'планированию', 'priority__in': Goal.Priority.high})
+        assert response.json() == []
+
 
 @pytest.mark.django_db
 class TestRetrieveGoalView:
@@ -169,3 +310,237 @@ class TestRetrieveGoalView:
         response = client.delete(self.url)
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_update_goal_checks_membership_once(self, auth_client: APIClient) -> None:
+        """
+        Тест, что при обновлении цели роли пользователя загружаются одним запросом
+        на все проверки (permission-класс и валидация категории)
+        """
+        goal = Goal.objects.get()
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.put(self.url, data={'title': 'new title', 'category': goal.category_id})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len([query for query in queries if 'goals_boardparticipant' in query['sql']]) == 1
+
+
+@pytest.mark.django_db
+class TestGoalBulkView:
+    url = reverse('goals:goal_bulk')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user: Any, board_participant_factory: Any, goal_category_factory: Any, goal_factory: Any) -> None:
+        board_participant = board_participant_factory.create(role=BoardParticipant.Role.writer, user=user)
+        self.category = goal_category_factory.create(board=board_participant.board, user=user)
+        self.goals = goal_factory.create_batch(2, category=self.category, user=user)
+        self.foreign_goal = goal_factory.create()
+
+    def test_authorization_required(self, client: APIClient) -> None:
+        """
+        Тест, что неавторизованный пользователь не может выполнять пакетные операции
+        """
+        response = client.post(self.url, data={'operations': []}, format='json')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_bulk_operations_results(self, auth_client: APIClient) -> None:
+        """
+        Тест, что пакет применяет корректные операции и возвращает результат по каждой из них
+        """
+        operations = [
+            {'action': 'create', 'title': 'new goal', 'category': self.category.id},
+            {'action': 'update', 'id': self.goals[0].id, 'status': Goal.Status.done},
+            {'action': 'archive', 'id': self.goals[1].id},
+            {'action': 'create', 'category': self.category.id},
+            {'action': 'archive', 'id': self.foreign_goal.id},
+            {'action': 'update', 'id': 0, 'title': 'missing'},
+            {'action': 'delete', 'id': self.goals[0].id},
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.post(self.url, data={'operations': operations}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()['results']
+        assert [result['status'] for result in results] == [201, 200, 200, 400, 403, 404, 400]
+        assert results[3]['errors'] == {'title': ['This field is required.']}
+        assert Goal.objects.get(id=results[0]['id']).title == 'new goal'
+        self.goals[0].refresh_from_db()
+        self.goals[1].refresh_from_db()
+        self.foreign_goal.refresh_from_db()
+        assert self.goals[0].status == Goal.Status.done
+        assert self.goals[1].status == Goal.Status.archived
+        assert self.foreign_goal.status != Goal.Status.archived
+        assert len([query for query in queries if 'goals_boardparticipant' in query['sql']]) == 1
+
+    def test_bulk_queries_independent_of_size(self, auth_client: APIClient) -> None:
+        """
+        Тест, что число запросов не зависит от количества операций в пакете
+        """
+        def operations(count: int) -> list[dict]:
+            return [{'action': 'create', 'title': f'goal {i}', 'category': self.category.id} for i in range(count)] + [
+                {'action': 'update', 'id': goal.id, 'priority': Goal.Priority.high} for goal in self.goals
+            ]
+
+        auth_client.get(reverse('core:profile'))  # заполняет кеш сессии и пользователя
+        with CaptureQueriesContext(connection) as small:
+            auth_client.post(self.url, data={'operations': operations(1)}, format='json')
+        with CaptureQueriesContext(connection) as large:
+            auth_client.post(self.url, data={'operations': operations(20)}, format='json')
+
+        assert Goal.objects.filter(category=self.category).count() == 23
+        assert len(large) == len(small)
+
+
+@pytest.mark.django_db
+class TestGoalImportView:
+    url = reverse('goals:goal_import')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user: Any, board_participant_factory: Any, goal_category_factory: Any) -> None:
+        board_participant = board_participant_factory.create(role=BoardParticipant.Role.writer, user=user)
+        self.category = goal_category_factory.create(board=board_participant.board, user=user)
+        self.foreign_category = goal_category_factory.create()
+
+    def post(self, client: APIClient, body: str, content_type: str = 'text/csv', **params: Any) -> list[dict]:
+        url = self.url + ('?' + '&'.join(f'{key}={value}' for key, value in params.items()) if params else '')
+        response = client.generic('POST', url, data=body.encode(), content_type=content_type)
+        assert response.status_code == status.HTTP_200_OK
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    def csv(self, titles: list[str]) -> str:
+        return 'title,category,priority,due_date\n' + ''.join(f'{title},{self.category.id},3,\n' for title in titles)
+
+    def test_authorization_required(self, client: APIClient) -> None:
+        """
+        Тест, что неавторизованный пользователь не может импортировать цели
+        """
+        response = client.generic('POST', self.url, data=b'', content_type='text/csv')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_import_csv_reports_row_errors(self, auth_client: APIClient) -> None:
+        """
+        Тест, что импорт CSV создает корректные цели и сообщает об ошибках по номеру строки
+        """
+        body = self.csv(['first', 'second']) + f',{self.category.id},,\nforeign,{self.foreign_category.id},,\n'
+
+        reports = self.post(auth_client, body)
+
+        assert reports[0]['processed'] == 4
+        assert reports[0]['created'] == 2
+        assert [(error['index'], error['status']) for error in reports[0]['errors']] == [(2, 400), (3, 403)]
+        assert reports[-1] == {'processed': 4, 'created_total': 2, 'done': True}
+        assert list(Goal.objects.filter(category=self.category).values_list('title', 'priority')) == [
+            ('first', Goal.Priority.high), ('second', Goal.Priority.high),
+        ]
+
+    def test_import_jsonl_resume(self, auth_client: APIClient) -> None:
+        """
+        Тест, что импорт JSON Lines продолжается с offset и не создает уже импортированные цели повторно
+        """
+        lines = [json.dumps({'title': f'goal {i}', 'category': self.category.id}) for i in range(3)]
+        body = '\n'.join(lines[:2] + ['{broken'] + lines[2:]) + '\n'
+
+        reports = self.post(auth_client, body, content_type='application/x-ndjson', offset=2)
+
+        assert reports[0]['errors'] == [{'index': 2, 'status': 400, 'errors': {'detail': ['Invalid JSON']}}]
+        assert list(Goal.objects.values_list('title', flat=True)) == ['goal 2']
+
+    def test_import_queries_independent_of_size(self, auth_client: APIClient) -> None:
+        """
+        Тест, что число запросов на партию не зависит от количества строк
+        """
+        auth_client.get(reverse('core:profile'))  # заполняет кеш сессии и пользователя
+        with CaptureQueriesContext(connection) as small:
+            self.post(auth_client, self.csv(['goal']))
+        with CaptureQueriesContext(connection) as large:
+            self.post(auth_client, self.csv([f'goal {i}' for i in range(50)]))
+
+        assert Goal.objects.count() == 51
+        assert len(large) == len(small)
+
+    def test_unsupported_content_type(self, auth_client: APIClient) -> None:
+        """
+        Тест, что импорт отклоняет неизвестный формат
+        """
+        response = auth_client.generic('POST', self.url, data=b'{}', content_type='application/xml')
+
+        assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+    def test_empty_body(self, auth_client: APIClient) -> None:
+        """
+        Тест, что импорт без тела запроса отклоняется с ошибкой 400
+        """
+        response = auth_client.generic('POST', self.url, data=b'', content_type='text/csv')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.parametrize('broken_line, error', [
+        (b'\xff\xfe,1,,\n', 'Invalid UTF-8'),
+        (b'"' + b'x' * 200_000 + b'",1,,\n', 'Invalid CSV'),
+    ], ids=['encoding', 'csv'])
+    def test_stream_error_reported(self, auth_client: APIClient, broken_line: bytes, error: str) -> None:
+        """
+        Тест, что ошибка чтения файла посередине потока попадает в итоговый отчет,
+        а строки до нее импортируются
+        """
+        body = self.csv(['first', 'second']).encode() + broken_line + self.csv(['third']).encode()
+        response = auth_client.generic('POST', self.url, data=body, content_type='text/csv')
+
+        reports = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        assert reports[0] == {'processed': 2, 'created': 2, 'errors': []}
+        assert reports[-1]['done'] is False
+        assert reports[-1]['processed'] == 2
+        assert reports[-1]['error'].startswith(error)
+        assert Goal.objects.count() == 2
+
+    def test_import_command(self, user: Any, tmp_path: Any) -> None:
+        """
+        Тест, что команда import_goals импортирует файл партиями и печатает отчет по каждой
+        """
+        path = tmp_path / 'goals.csv'
+        path.write_text(self.csv(['a', 'b', 'c']))
+        out = io.StringIO()
+
+        call_command('import_goals', user.username, str(path), '--batch-size', '2', stdout=out)
+
+        reports = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [report['processed'] for report in reports] == [2, 3, 3]
+        assert Goal.objects.count() == 3
+
+
+@pytest.mark.django_db
+class TestGoalBoard:
+
+    def test_board_set_on_create(self, goal_comment_factory: Any) -> None:
+        """
+        Тест, что доска цели и комментария заполняется при создании, в том числе через bulk_create
+        """
+        comment = goal_comment_factory.create()
+        goal = comment.goal
+        Goal.objects.bulk_create([Goal(title='bulk', category=goal.category, user=goal.user)])
+
+        assert Goal.objects.get(id=goal.id).board_id == goal.category.board_id
+        assert Goal.objects.get(title='bulk').board_id == goal.category.board_id
+        assert GoalComment.objects.get(id=comment.id).board_id == goal.category.board_id
+
+    def test_board_follows_category_moves(self, goal_comment_factory: Any, goal_category_factory: Any,
+                                          board_factory: Any) -> None:
+        """
+        Тест, что при смене категории цели и переносе категории на другую доску
+        доска цели и ее комментариев обновляется
+        """
+        comment = goal_comment_factory.create()
+        goal = comment.goal
+        other_category = goal_category_factory.create()
+
+        goal.category = other_category
+        goal.save()
+        assert Goal.objects.get(id=goal.id).board_id == other_category.board_id
+        assert GoalComment.objects.get(id=comment.id).board_id == other_category.board_id
+
+        new_board = board_factory.create()
+        GoalCategory.objects.filter(id=other_category.id).update(board=new_board)
+        assert Goal.objects.get(id=goal.id).board_id == new_board.id
+        assert GoalComment.objects.get(id=comment.id).board_id == new_board.id
@@ -1,6 +1,8 @@
 from typing import Any
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.response import Response
 from rest_framework import status
@@ -31,6 +33,53 @@ class TestListGoalCategoryView:
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
+    def test_list_category_queries_independent_of_page_size(self, auth_client: APIClient, user: Any,
+                                                           board_participant_factory: Any,
+                                                           goal_category_factory: Any) -> None:
+        """
+        Тест, что число запросов к базе не растет вместе с количеством категорий на странице
+        """
+        board_participant = board_participant_factory.create(role=BoardParticipant.Role.owner, user=user)
+        goal_category_factory.create(board=board_participant.board)
+        auth_client.get(self.url)  # заполняет кеш досок пользователя
+        with CaptureQueriesContext(connection) as single_page:
+            auth_client.get(self.url)
+
+        goal_category_factory.create_batch(10, board=board_participant.board)
+        with CaptureQueriesContext(connection) as full_page:
+            response = auth_client.get(self.url)
+
+        assert len(response.json()) == 11
+        assert len(full_page) == len(single_page)
+
+    def test_search_category_typo_tolerant(self, auth_client: APIClient, user: Any, board_participant_factory: Any,
+                                           goal_category_factory: Any) -> None:
+        """
+        Тест, что поиск категорий находит названия с опечатками и упорядочивает их по схожести
+        """
+        board_participant = board_participant_factory.create(role=BoardParticipant.Role.owner, user=user)
+        exact = goal_category_factory.create(board=board_participant.board, title='Marketing plan')
+        typo = goal_category_factory.create(board=board_participant.board, title='Marketng ideas')
+        goal_category_factory.create(board=board_participant.board, title='Personal')
+
+        response = auth_client.get(self.url, {'search': 'marketing'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [category['id'] for category in response.json()] == [exact.id, typo.id]
+
+    def test_search_category_explicit_ordering(self, auth_client: APIClient, user: Any,
+                                               board_participant_factory: Any, goal_category_factory: Any) -> None:
+        """
+        Тест, что явно заданная сортировка имеет приоритет над сортировкой по схожести
+        """
+        board_participant = board_participant_factory.create(role=BoardParticipant.Role.owner, user=user)
+        first = goal_category_factory.create(board=board_participant.board, title='Marketng A')
+        second = goal_category_factory.create(board=board_participant.board, title='Marketing B')
+
+        response = auth_client.get(self.url, {'search': 'marketing', 'ordering': 'title'})
+
+        assert [category['id'] for category in response.json()] == [second.id, first.id]
+
 
 @pytest.mark.django_db
 class TestCreateGoalCategoryView:
@@ -1,8 +1,50 @@
+from typing import Any
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from goals.models import BoardParticipant
+
+
+@pytest.mark.django_db
+class TestCreateGoalCommentView:
+    url = reverse('goals:comment_create')
+
+    def test_create_comment_checks_membership_once(self, auth_client: APIClient, user: Any,
+                                                   board_participant_factory: Any, goal_category_factory: Any,
+                                                   goal_factory: Any) -> None:
+        """
+        Тест, что при создании комментария роль проверяется одним запросом, а категория
+        цели не подгружается отдельным запросом
+        """
+        board_participant = board_participant_factory.create(role=BoardParticipant.Role.writer, user=user)
+        goal_category = goal_category_factory.create(board=board_participant.board, user=user)
+        goal = goal_factory.create(category=goal_category, user=user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = auth_client.post(self.url, data={'text': 'comment', 'goal': goal.id})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len([query for query in queries if 'goals_boardparticipant' in query['sql']]) == 1
+        assert not [query for query in queries if query['sql'].startswith('SELECT "goals_goalcategory"')]
+
+    def test_create_comment_reader_forbidden(self, auth_client: APIClient, user: Any, board_participant_factory: Any,
+                                             goal_category_factory: Any, goal_factory: Any) -> None:
+        """
+        Тест, что читатель доски не может комментировать цели
+        """
+        board_participant = board_participant_factory.create(role=BoardParticipant.Role.reader, user=user)
+        goal_category = goal_category_factory.create(board=board_participant.board, user=user)
+        goal = goal_factory.create(category=goal_category, user=user)
+
+        response = auth_client.post(self.url, data={'text': 'comment', 'goal': goal.id})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
 
 @pytest.mark.django_db
 class TestListGoalCommentView:
@@ -23,3 +65,34 @@ class TestListGoalCommentView:
         response = client.get(self.url)
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_list_comments_queries_independent_of_page_size(self, auth_client: APIClient, user: Any,
+                                                           board_participant_factory: Any, goal_category_factory: Any,
+                                                           goal_factory: Any, goal_comment_factory: Any) -> None:
+        """
+        Тест, что число запросов к базе не растет вместе с количеством комментариев на странице
+        """
+        board_participant = board_participant_factory.create(role=BoardParticipant.Role.owner, user=user)
+        goal_category = goal_category_factory.create(board=board_participant.board, user=user)
+        goal = goal_factory.create(category=goal_category, user=user)
+        goal_comment_factory.create(goal=goal)
+        auth_client.get(self.url)  # заполняет кеш досок пользователя
+        with CaptureQueriesContext(connection) as single_page:
+            auth_client.get(self.url)
+
+        goal_comment_factory.create_batch(10, goal=goal)
+        with CaptureQueriesContext(connection) as full_page:
+            response = auth_client.get(self.url)
+
+        assert len(response.json()) == 11
+        assert len(full_page) == len(single_page)
+
+    @pytest.mark.parametrize('ordering', ['user', 'created,text'])
+    def test_cursor_pagination_unsupported_ordering(self, auth_client: APIClient, ordering: str) -> None:
+        """
+        Тест, что курсорная пагинация отклоняет сортировку, для которой нельзя построить ключ курсора
+        """
+        response = auth_client.get(self.url, {'pagination': 'cursor', 'ordering': ordering})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'ordering' in response.json()
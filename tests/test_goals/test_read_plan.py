@@ -0,0 +1,47 @@
+from typing import Any
+
+import pytest
+from django.core.management import call_command
+from rest_framework.renderers import JSONRenderer
+
+from goals.models import Board, Goal, GoalCategory, GoalComment
+from goals.read_plan import plan_for
+from goals.serializers import BoardCreateSerializer, GoalCategorySerializer, GoalCommentSerializer, GoalUserSerializer
+
+
+@pytest.mark.django_db
+class TestValuesPlan:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, goal_factory: Any, goal_comment_factory: Any) -> None:
+        goals = goal_factory.create_batch(3, description='описание')
+        goals[0].due_date = '2026-10-18'
+        goals[0].save()
+        goal_comment_factory.create_batch(2, goal=goals[0])
+
+    @pytest.mark.parametrize('serializer_class, model', [
+        (GoalUserSerializer, Goal),
+        (GoalCategorySerializer, GoalCategory),
+        (GoalCommentSerializer, GoalComment),
+        (BoardCreateSerializer, Board),
+    ], ids=['goal', 'category', 'comment', 'board'])
+    def test_output_matches_serializer(self, serializer_class: Any, model: Any) -> None:
+        """
+        Тест, что план сериализации дает тот же JSON, что и сериализатор, байт в байт
+        """
+        queryset = model.objects.order_by('id')
+        plan = plan_for(serializer_class)
+
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+
+        assert JSONRenderer().render(plan.render(plan.values(queryset))) == expected
+
+    def test_benchmark_command(self) -> None:
+        """
+        Тест, что команда сравнения скорости выполняется и не оставляет данных
+        """
+        goals_count = Goal.objects.count()
+
+        call_command('benchmark_serializers', '--rows', '10', '--repeat', '1')
+
+        assert Goal.objects.count() == goals_count
@@ -0,0 +1,186 @@
+from typing import Any
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from goals.models import BoardParticipant
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSyncView:
+    url = reverse('goals:sync')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user: Any, board_participant_factory: Any, goal_category_factory: Any,
+              goal_factory: Any, goal_comment_factory: Any) -> None:
+        board_participant = board_participant_factory.create(user=user, role=BoardParticipant.Role.owner)
+        self.category = goal_category_factory.create(board=board_participant.board, user=user)
+        self.goals = goal_factory.create_batch(2, category=self.category, user=user)
+        self.comment = goal_comment_factory.create(goal=self.goals[0], user=user)
+        self.other_goal = goal_factory.create()
+        self.other_comment = goal_comment_factory.create(goal=self.other_goal)
+
+    def sync(self, client: APIClient, **params: Any) -> dict:
+        response = client.get(self.url, data=params)
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()
+
+    def test_authorization_required(self, client: APIClient) -> None:
+        """
+        Тест, что неавторизованный пользователь не может синхронизироваться
+        """
+        response = client.get(self.url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_initial_sync(self, auth_client: APIClient) -> None:
+        """
+        Тест, что первая синхронизация отдает все данные досок пользователя, а повторная - ничего
+        """
+        data = self.sync(auth_client)
+
+        assert data['has_more'] is False
+        assert [goal['id'] for goal in data['goals']] == [goal.id for goal in self.goals]
+        assert [category['id'] for category in data['categories']] == [self.category.id]
+        assert [comment['id'] for comment in data['comments']] == [self.comment.id]
+        assert data['deleted'] == {'boards': [], 'goals': [], 'categories': [], 'comments': []}
+
+        data = self.sync(auth_client, cursor=data['cursor'])
+
+        assert data['goals'] == data['categories'] == data['comments'] == []
+
+    def test_changes_and_tombstones(self, auth_client: APIClient) -> None:
+        """
+        Тест, что синхронизация отдает только измененные строки, а архивирование и удаление - как tombstone
+        """
+        cursor = self.sync(auth_client)['cursor']
+        self.goals[0].title = 'changed'
+        self.goals[0].save()
+        auth_client.delete(reverse('goals:goal_detail', kwargs={'pk': self.goals[1].id}))
+        auth_client.delete(reverse('goals:comment_detail', kwargs={'pk': self.comment.id}))
+
+        data = self.sync(auth_client, cursor=cursor)
+
+        assert [goal['title'] for goal in data['goals']] == ['changed']
+        assert data['categories'] == data['comments'] == []
+        assert data['deleted'] == {
+            'boards': [], 'goals': [self.goals[1].id], 'categories': [], 'comments': [self.comment.id],
+        }
+
+    def test_paginated_sync(self, auth_client: APIClient) -> None:
+        """
+        Тест, что при limit синхронизация продолжается по курсору, пока has_more равен true
+        """
+        goal_ids = []
+        data = {'cursor': '', 'has_more': True}
+        while data['has_more']:
+            data = self.sync(auth_client, cursor=data['cursor'], limit=1)
+            goal_ids += [goal['id'] for goal in data['goals']]
+
+        assert goal_ids == [goal.id for goal in self.goals]
+
+    def sync_all(self, client: APIClient, cursor: str, **params: Any) -> dict:
+        """
+        Синхронизация по курсору, пока has_more равен true: данные всех страниц объединяются
+        """
+        result = {'goals': [], 'categories': [], 'comments': [], 'deleted': {}}
+        data = {'cursor': cursor, 'has_more': True}
+        while data['has_more']:
+            data = self.sync(client, cursor=data['cursor'], **params)
+            for key in ('goals', 'categories', 'comments'):
+                result[key] += [row['id'] for row in data[key]]
+            for key, ids in data['deleted'].items():
+                result['deleted'][key] = result['deleted'].get(key, []) + ids
+        result['cursor'] = data['cursor']
+        return result
+
+    def test_board_joined(self, auth_client: APIClient, user: Any, board_participant_factory: Any) -> None:
+        """
+        Тест, что после получения доступа к доске клиент получает все ее данные, а не только новые изменения
+        """
+        cursor = self.sync(auth_client)['cursor']
+        board_participant_factory.create(
+            user=user, board=self.other_goal.category.board, role=BoardParticipant.Role.reader
+        )
+
+        data = self.sync_all(auth_client, cursor, limit=1)
+
+        assert data['goals'] == [self.other_goal.id]
+        assert data['categories'] == [self.other_goal.category_id]
+        assert data['comments'] == [self.other_comment.id]
+        assert data['deleted'] == {'boards': [], 'goals': [], 'categories': [], 'comments': []}
+
+        data = self.sync(auth_client, cursor=data['cursor'])
+        assert data['goals'] == data['categories'] == data['comments'] == []
+
+    def test_board_left(self, auth_client: APIClient, user: Any) -> None:
+        """
+        Тест, что после потери доступа к доске клиент один раз получает tombstone доски
+        """
+        cursor = self.sync(auth_client)['cursor']
+        BoardParticipant.objects.filter(user=user, board=self.category.board).delete()
+
+        data = self.sync(auth_client, cursor=cursor)
+
+        assert data['deleted']['boards'] == [self.category.board_id]
+        assert self.sync(auth_client, cursor=data['cursor'])['deleted']['boards'] == []
+
+    def test_category_moved_to_foreign_board(self, auth_client: APIClient) -> None:
+        """
+        Тест, что перенос категории на доску без доступа приходит как tombstone категории, ее целей
+        и комментариев
+        """
+        cursor = self.sync(auth_client)['cursor']
+        self.category.board = self.other_goal.category.board
+        self.category.save()
+
+        data = self.sync(auth_client, cursor=cursor)
+
+        assert data['categories'] == data['goals'] == data['comments'] == []
+        assert data['deleted']['categories'] == [self.category.id]
+        assert sorted(data['deleted']['goals']) == [goal.id for goal in self.goals]
+        assert data['deleted']['comments'] == [self.comment.id]
+
+    def test_category_moved_between_own_boards(
+        self, auth_client: APIClient, user: Any, board_participant_factory: Any
+    ) -> None:
+        """
+        Тест, что перенос категории между досками пользователя приходит как изменение, без tombstone
+        """
+        board = board_participant_factory.create(user=user, role=BoardParticipant.Role.owner).board
+        cursor = self.sync(auth_client)['cursor']
+        self.category.board = board
+        self.category.save()
+
+        data = self.sync(auth_client, cursor=cursor)
+
+        assert [category['board'] for category in data['categories']] == [board.id]
+        assert sorted(goal['id'] for goal in data['goals']) == [goal.id for goal in self.goals]
+        assert [comment['id'] for comment in data['comments']] == [self.comment.id]
+        assert data['deleted'] == {'boards': [], 'goals': [], 'categories': [], 'comments': []}
+
+    def test_invalid_cursor(self, auth_client: APIClient) -> None:
+        """
+        Тест, что поврежденный курсор отклоняется
+        """
+        response = auth_client.get(self.url, data={'cursor': 'broken'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {'cursor': ['Invalid cursor']}
+
+    def test_archive_sync_by_category(self, auth_client: APIClient) -> None:
+        """
+        Тест, что удаление категории приходит как tombstone категории и ее целей
+        """
+        cursor = self.sync(auth_client)['cursor']
+        auth_client.delete(reverse('goals:category_detail', kwargs={'pk': self.category.id}))
+        data = self.sync(auth_client, cursor=cursor)
+        assert data['deleted']['categories'] == [self.category.id]
+
+        call_command('archive_worker', '--once')
+        data = self.sync(auth_client, cursor=data['cursor'])
+
+        assert sorted(data['deleted']['goals']) == [goal.id for goal in self.goals]
@@ -0,0 +1,37 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from todolist.caches import require_shared_cache
+
+
+class TestRequireSharedCache:
+
+    def test_local_cache_rejected(self, settings) -> None:
+        """
+        Тест, что локальный для процесса кеш запрещен без ALLOW_LOCAL_CACHES
+        """
+        settings.ALLOW_LOCAL_CACHES = False
+
+        with pytest.raises(ImproperlyConfigured, match=settings.JWT_REVOCATION_CACHE_ALIAS):
+            require_shared_cache(settings.JWT_REVOCATION_CACHE_ALIAS, 'revoked tokens')
+
+    def test_local_cache_allowed(self, settings) -> None:
+        """
+        Тест, что ALLOW_LOCAL_CACHES разрешает локальный кеш
+        """
+        settings.ALLOW_LOCAL_CACHES = True
+
+        require_shared_cache(settings.JWT_REVOCATION_CACHE_ALIAS, 'revoked tokens')
+
+    def test_shared_cache_accepted(self, settings) -> None:
+        """
+        Тест, что общий кеш проходит проверку
+        """
+        settings.ALLOW_LOCAL_CACHES = False
+        settings.CACHES = settings.CACHES | {
+            settings.JWT_REVOCATION_CACHE_ALIAS: {
+                'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://localhost:6379/1',
+            },
+        }
+
+        require_shared_cache(settings.JWT_REVOCATION_CACHE_ALIAS, 'revoked tokens')
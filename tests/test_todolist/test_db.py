@@ -0,0 +1,65 @@
+from typing import Any
+from unittest import mock
+
+import pytest
+from django.db import connections
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from todolist.db.base import get_stats
+
+
+@pytest.mark.django_db
+class TestConnectionMetrics:
+
+    @pytest.fixture()
+    def connection(self) -> Any:
+        connection = connections.create_connection('default')
+        yield connection
+        connection.close()
+
+    def test_open_close_reconnect(self, connection: Any) -> None:
+        """
+        Тест подсчета открытых, закрытых соединений и переподключений
+        """
+        connection.ensure_connection()
+        connection.close()
+        connection.ensure_connection()
+
+        stats = get_stats('default')
+        assert stats['opened'] == 2
+        assert stats['closed'] == 1
+        assert stats['open'] == 1
+        assert stats['reconnects'] == 1
+        assert stats['avg_connect_ms'] > 0
+
+    def test_health_check_failure(self, connection: Any) -> None:
+        """
+        Тест, что соединение, не прошедшее проверку, закрывается и учитывается в метриках
+        """
+        connection.ensure_connection()
+        connection.health_check_enabled = True
+        connection.health_check_done = False
+
+        with mock.patch.object(connection, 'is_usable', return_value=False):
+            connection.close_if_health_check_failed()
+
+        assert connection.connection is None
+        assert get_stats('default')['health_check_failures'] == 1
+
+    def test_stats_staff_only(self, auth_client: APIClient, user: Any) -> None:
+        """
+        Тест, что метрики соединений доступны только персоналу
+        """
+        url = reverse('db_stats')
+        assert auth_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+        user.is_staff = True
+        user.save(update_fields=['is_staff'])
+        response = auth_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.json()['default']) == {
+            'opened', 'closed', 'open', 'reconnects', 'connect_failures', 'health_check_failures', 'avg_connect_ms',
+        }
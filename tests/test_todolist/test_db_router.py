@@ -0,0 +1,111 @@
+import time
+from typing import Any
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from goals.models import Goal
+from todolist import db_router
+from todolist.db_router import PIN_COOKIE, ReplicaRouter, use_replica
+
+
+class TestReplicaRouter:
+
+    @override_settings(DATABASE_REPLICAS=['replica_0'])
+    def test_reads_inside_use_replica(self) -> None:
+        """
+        Тест, что внутри use_replica чтения направляются на реплику, а запись - в основную базу
+        """
+        router = ReplicaRouter()
+
+        assert router.db_for_read(Goal) == 'default'
+        with use_replica():
+            assert router.db_for_read(Goal) == 'replica_0'
+            assert router.db_for_write(Goal) == 'default'
+            with use_replica(False):
+                assert router.db_for_read(Goal) == 'default'
+        assert router.db_for_read(Goal) == 'default'
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self) -> None:
+        """
+        Тест, что без настроенных реплик все запросы идут в основную базу
+        """
+        with use_replica():
+            assert ReplicaRouter().db_for_read(Goal) == 'default'
+
+    def test_migrations_only_on_primary(self) -> None:
+        """
+        Тест, что миграции применяются только к основной базе
+        """
+        assert ReplicaRouter().allow_migrate('default', 'goals')
+        assert not ReplicaRouter().allow_migrate('replica_0', 'goals')
+
+
+@pytest.mark.django_db
+class TestReplicaReads:
+    """
+    Реплика в тестах - сама основная база, проверяется только то, на какую базу роутер направил чтения
+    """
+    url = reverse('goals:board_list')
+
+    @pytest.fixture(autouse=True)
+    def routed(self, settings: Any) -> Any:
+        settings.DATABASE_REPLICAS = ['default']
+        settings.REPLICA_PIN_SECONDS = 5
+        self.replica_reads = []
+
+        def db_for_read(router: ReplicaRouter, model: Any, **hints: Any) -> str:
+            self.replica_reads.append(db_router._replica_reads.get())
+            return 'default'
+
+        with mock.patch.object(ReplicaRouter, 'db_for_read', autospec=True, side_effect=db_for_read):
+            yield
+
+    def test_list_reads_from_replica(self, auth_client: APIClient, board_participant: Any) -> None:
+        """
+        Тест, что GET списка читает с реплики и не закрепляет клиента за основной базой
+        """
+        response = auth_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert any(self.replica_reads)
+        assert PIN_COOKIE not in response.cookies
+
+    def test_write_pins_to_primary(self, auth_client: APIClient) -> None:
+        """
+        Тест, что после записи клиент получает cookie и его чтения идут в основную базу
+        """
+        response = auth_client.post(reverse('goals:create_board'), data={'title': 'board'})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.cookies[PIN_COOKIE]['max-age'] == 5
+
+        self.replica_reads.clear()
+        response = auth_client.get(self.url)
+
+        assert [board['title'] for board in response.json()] == ['board']
+        assert self.replica_reads and not any(self.replica_reads)
+
+    def test_expired_pin(self, auth_client: APIClient) -> None:
+        """
+        Тест, что истекшее закрепление не мешает чтению с реплики
+        """
+        auth_client.cookies[PIN_COOKIE] = str(time.time() - 1)
+
+        auth_client.get(self.url)
+
+        assert any(self.replica_reads)
+
+    def test_failed_write_not_pinned(self, auth_client: APIClient) -> None:
+        """
+        Тест, что неуспешный запрос на запись не закрепляет клиента
+        """
+        response = auth_client.post(reverse('goals:create_board'), data={})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert PIN_COOKIE not in response.cookies
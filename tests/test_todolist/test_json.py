@@ -0,0 +1,99 @@
+import io
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any
+from unittest import mock
+from uuid import UUID
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from todolist import parsers, renderers
+from todolist.parsers import FastJSONParser
+from todolist.renderers import FastJSONRenderer
+
+DATA = {
+    'id': 1,
+    'title': 'Цель\u2028с разделителем\u2029',
+    'created': datetime(2026, 10, 18, 12, 30, 15, 123456, tzinfo=timezone.utc),
+    'due_date': date(2026, 10, 18),
+    'amount': Decimal('1.50'),
+    'uuid': UUID('12345678-1234-5678-1234-567812345678'),
+    'stats': {1: 2, 3: None},
+    'items': [1.5, True, None, 'text'],
+}
+
+
+class TestFastJSONRenderer:
+
+    def test_output_matches_json_renderer(self) -> None:
+        """
+        Тест, что FastJSONRenderer дает тот же результат, что и JSONRenderer, байт в байт
+        """
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+    def test_indent_falls_back(self) -> None:
+        """
+        Тест, что при запросе с отступами используется стандартный рендерер
+        """
+        media_type = 'application/json; indent=2'
+
+        assert FastJSONRenderer().render(DATA, media_type) == JSONRenderer().render(DATA, media_type)
+
+    def test_without_orjson(self) -> None:
+        """
+        Тест, что без orjson рендерер и парсер работают через стандартный json
+        """
+        with mock.patch.object(renderers, 'orjson', None), mock.patch.object(parsers, 'orjson', None):
+            body = FastJSONRenderer().render(DATA)
+            assert body == JSONRenderer().render(DATA)
+            assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+    def test_none(self) -> None:
+        """
+        Тест, что пустой ответ рендерится в пустое тело
+        """
+        assert FastJSONRenderer().render(None) == b''
+
+
+class TestFastJSONParser:
+
+    def test_parse(self) -> None:
+        """
+        Тест разбора тела запроса
+        """
+        body = JSONRenderer().render(DATA)
+
+        assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+    def test_invalid_json(self) -> None:
+        """
+        Тест, что некорректный JSON приводит к ParseError
+        """
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"title": '))
+
+    @pytest.mark.django_db
+    def test_invalid_json_response(self, auth_client: Any) -> None:
+        """
+        Тест, что некорректный JSON в запросе к API возвращает ошибку 400
+        """
+        response = auth_client.post(reverse('goals:create_board'), data='{"title": ', content_type='application/json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()['detail'].startswith('JSON parse error')
+
+    def test_benchmark_command(self) -> None:
+        """
+        Тест запуска команды сравнения скорости JSON
+        """
+        out = io.StringIO()
+
+        call_command('benchmark_json', '--rows', '20', '--repeat', '1', stdout=out)
+
+        assert 'render 20 goals' in out.getvalue()
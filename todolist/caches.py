@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+# Бэкенды, данные которых видны только процессу, который их записал
+LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def require_shared_cache(alias: str, purpose: str) -> None:
+    """
+    Запрещает запуск, если кеш alias локальный для процесса: хранящиеся в нем данные
+    (отзыв токенов, сессии, права доступа) должны быть одинаковыми во всех воркерах.
+    Для разработки и тестов в одном процессе проверку отключает ALLOW_LOCAL_CACHES=True
+    """
+    if settings.ALLOW_LOCAL_CACHES:
+        return
+    backend = settings.CACHES[alias]['BACKEND']
+    if backend in LOCAL_BACKENDS:
+        raise ImproperlyConfigured(
+            f'Cache "{alias}" stores {purpose} and must be shared between processes (e.g. redis://), '
+            f'got {backend}. Set ALLOW_LOCAL_CACHES=True only for single-process development'
+        )
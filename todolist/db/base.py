@@ -0,0 +1,61 @@
+import time
+
+from django.db.backends.postgresql import base
+
+from todolist import metrics
+
+COUNTERS = ('opened', 'closed', 'reconnects', 'connect_failures', 'health_check_failures', 'connect_time_us')
+
+
+def _key(alias: str, counter: str) -> str:
+    return f'db:{alias}:{counter}'
+
+
+def get_stats(alias: str) -> dict[str, int | float]:
+    """
+    Метрики соединений с базой alias: сколько соединений открыто сейчас (размер пула
+    постоянных соединений всех процессов), среднее время установки соединения
+    и количество переподключений
+    """
+    values = metrics.read([_key(alias, counter) for counter in COUNTERS])
+    stats = {counter: values[_key(alias, counter)] for counter in COUNTERS}
+    connect_time_us = stats.pop('connect_time_us')
+    stats['open'] = stats['opened'] - stats['closed']
+    stats['avg_connect_ms'] = round(connect_time_us / stats['opened'] / 1000, 2) if stats['opened'] else 0
+    return stats
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Бэкенд PostgreSQL, который считает открытые и закрытые соединения, время их установки,
+    переподключения и соединения, закрытые проверкой CONN_HEALTH_CHECKS
+    """
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.connections_opened = 0
+
+    def get_new_connection(self, conn_params):
+        started = time.perf_counter()
+        try:
+            connection = super().get_new_connection(conn_params)
+        except Exception:
+            metrics.count(_key(self.alias, 'connect_failures'))
+            raise
+
+        metrics.count(_key(self.alias, 'opened'))
+        metrics.count(_key(self.alias, 'connect_time_us'), int((time.perf_counter() - started) * 1_000_000))
+        if self.connections_opened:
+            metrics.count(_key(self.alias, 'reconnects'))
+        self.connections_opened += 1
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            metrics.count(_key(self.alias, 'closed'))
+        return super()._close()
+
+    def close_if_health_check_failed(self):
+        connected = self.connection is not None
+        super().close_if_health_check_failed()
+        if connected and self.connection is None:
+            metrics.count(_key(self.alias, 'health_check_failures'))
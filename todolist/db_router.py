@@ -0,0 +1,93 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Iterator
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+_replica_reads: ContextVar[bool] = ContextVar('replica_reads', default=False)
+
+PIN_COOKIE = 'db_primary_until'
+
+
+@contextmanager
+def use_replica(enabled: bool = True) -> Iterator[None]:
+    """
+    Направляет чтения внутри блока на реплики из DATABASE_REPLICAS (если они настроены).
+    Запись всегда выполняется в основную базу
+    """
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Роутер баз данных: чтения внутри use_replica() уходят на случайную реплику,
+    все остальные запросы и миграции - в основную базу (default)
+    """
+    def db_for_read(self, model, **hints) -> str:
+        if _replica_reads.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return 'default'
+
+    def db_for_write(self, model, **hints) -> str:
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # Реплики содержат те же данные, что и основная база
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, model_name: str | None = None, **hints) -> bool:
+        return db == 'default'
+
+
+def is_pinned(request: HttpRequest) -> bool:
+    """
+    Пользователь недавно выполнял запись, его чтения должны идти в основную базу
+    """
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def replica_reads(view: Callable[..., HttpResponse]) -> Callable[..., HttpResponse]:
+    """
+    Декоратор представления: чтения выполняются на репликах, кроме случаев, когда
+    пользователь недавно выполнял запись (см. ReplicaPinMiddleware)
+    """
+    @wraps(view)
+    def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        with use_replica(not is_pinned(request)):
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaPinMiddleware:
+    """
+    После успешного изменяющего запроса (POST, PUT, PATCH, DELETE) закрепляет клиента за основной
+    базой на REPLICA_PIN_SECONDS секунд через cookie, чтобы его следующие чтения видели
+    собственные изменения, пока они не дошли до реплик
+    """
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
+        if not settings.DATABASE_REPLICAS or request.method in ('GET', 'HEAD', 'OPTIONS'):
+            return response
+        if response.status_code < 400:
+            response.set_cookie(
+                PIN_COOKIE,
+                str(time.time() + settings.REPLICA_PIN_SECONDS),
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
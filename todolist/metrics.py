@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+
+
+def metrics_cache() -> BaseCache:
+    return caches[settings.METRICS_CACHE_ALIAS]
+
+
+def count(key: str, delta: int = 1) -> None:
+    """
+    Увеличивает счетчик в кеше метрик. С общим кешем (например, Redis)
+    счетчики суммируются по всем процессам
+    """
+    cache = metrics_cache()
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        if not cache.add(key, delta, timeout=None):
+            cache.incr(key, delta)
+
+
+def read(keys: list[str]) -> dict[str, int]:
+    values = metrics_cache().get_many(keys)
+    return {key: values.get(key, 0) for key in keys}
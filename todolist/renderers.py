@@ -0,0 +1,41 @@
+import json
+from typing import Any, Callable
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson необязателен
+    orjson = None
+
+ORJSON_OPTIONS = 0 if orjson is None else orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def dumps(data: Any, default: Callable[[Any], Any]) -> bytes:
+    """
+    Компактный JSON в UTF-8: через orjson, если он установлен, иначе через стандартный json.
+    Даты и неизвестные orjson типы кодируются функцией default
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
+    return json.dumps(data, default=default, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson с тем же результатом, что и у стандартного рендерера DRF
+    (даты, Decimal и прочие типы кодируются его JSONEncoder). Без orjson, при запросе
+    с отступами (indent) или при некомпактных настройках COMPACT_JSON/UNICODE_JSON
+    используется стандартный рендерер
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = dumps(data, default=self.encoder_class().default)
+        # Как и JSONRenderer, экранируем U+2028 и U+2029, чтобы ответ оставался корректным JavaScript
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
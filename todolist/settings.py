@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'django_filters',
     'rest_framework',
@@ -62,9 +63,11 @@ MIDDLEWARE = [
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'todolist.db_router.ReplicaPinMiddleware',
+    'core.middleware.RateLimitHeadersMiddleware',
 ]
 
 ROOT_URLCONF = 'todolist.urls'
@@ -92,17 +95,95 @@ WSGI_APPLICATION = 'todolist.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
 
+# Соединения с базой постоянные: живут DB_CONN_MAX_AGE секунд (0 - отдельное соединение
+# на каждый запрос) и проверяются перед повторным использованием (DB_CONN_HEALTH_CHECKS).
+# Бэкенд todolist.db считает метрики соединений (см. todolist/db/base.py). При работе через
+# PgBouncer в режиме transaction нужно указать его порт и DB_DISABLE_SERVER_SIDE_CURSORS=True
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'todolist.db',
         'NAME': env('DB_NAME'),
         'USER': env('DB_USER'),
         'PASSWORD': env('DB_PASSWORD'),
         'HOST': env('DB_HOST', default='127.0.0.1'),
-        'PORT': '5432',
+        'PORT': env.int('DB_PORT', default=5432),
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=60),
+        'CONN_HEALTH_CHECKS': env.bool('DB_CONN_HEALTH_CHECKS', default=True),
+        'DISABLE_SERVER_SIDE_CURSORS': env.bool('DB_DISABLE_SERVER_SIDE_CURSORS', default=False),
+        'OPTIONS': {
+            # Порог нечеткого поиска (pg_trgm) для операторов <% / %>, которые используют GIN-индекс
+            'options': f"-c pg_trgm.word_similarity_threshold={env.float('TRIGRAM_SIMILARITY_THRESHOLD', default=0.4)}",
+        },
     }
 }
 
+# Реплики для чтения (хосты потоковых реплик основной базы с теми же учетными данными).
+# Чтения представлений с replica_reads и бота направляются на них роутером ReplicaRouter,
+# после записи клиент на REPLICA_PIN_SECONDS секунд закрепляется за основной базой
+for index, host in enumerate(env.list('DB_REPLICA_HOSTS', default=[])):
+    DATABASES[f'replica_{index}'] = {**DATABASES['default'], 'HOST': host, 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['todolist.db_router.ReplicaRouter']
+REPLICA_PIN_SECONDS = env.int('REPLICA_PIN_SECONDS', default=5)
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+# Кеши, данные которых должны совпадать во всех процессах (todolist/caches.py), не могут быть
+# локальными (locmemcache://, dummycache://): иначе приложение не запустится. Для разработки
+# и тестов в одном процессе проверку отключает ALLOW_LOCAL_CACHES=True
+ALLOW_LOCAL_CACHES = env.bool('ALLOW_LOCAL_CACHES', default=False)
+
+# Кеш досок пользователей (goals/cache.py): бэкенд задается BOARD_CACHE_URL (например redis://...),
+# для локальных бэкендов размер ограничен MAX_ENTRIES, для Redis - настройкой maxmemory сервера.
+# По нему проверяются права доступа, поэтому кеш должен быть общим для всех процессов
+BOARD_CACHE_ALIAS = 'boards'
+BOARD_CACHE = env.cache('BOARD_CACHE_URL', default='locmemcache://boards')
+BOARD_CACHE['TIMEOUT'] = env.int('BOARD_CACHE_TTL', default=300)
+if BOARD_CACHE['BACKEND'].rsplit('.', 1)[-1] in ('LocMemCache', 'FileBasedCache', 'DatabaseCache'):
+    BOARD_CACHE.setdefault('OPTIONS', {})['MAX_ENTRIES'] = env.int('BOARD_CACHE_MAX_ENTRIES', default=10000)
+
+# Счетчики метрик (todolist/metrics.py). С локальным бэкендом они считаются отдельно в каждом процессе,
+# с общим (METRICS_CACHE_URL=redis://...) - суммарно по всем процессам
+METRICS_CACHE_ALIAS = 'metrics'
+
+# Сессии и пользователи сессий (core/cache.py) кешируются в AUTH_CACHE_ALIAS, поэтому запрос
+# авторизованного пользователя не обращается к базе. Сессия хранится в кеше весь срок ее действия
+# (SESSION_COOKIE_AGE), и выход в одном процессе должен удалить ее во всех, поэтому с кеширующим
+# SESSION_ENGINE кеш должен быть общим (AUTH_CACHE_URL=redis://...), иначе приложение не запустится
+# (todolist/caches.py). Без общего кеша используйте SESSION_ENGINE=django.contrib.sessions.backends.db
+AUTH_CACHE_ALIAS = 'auth'
+AUTH_CACHE = env.cache('AUTH_CACHE_URL', default='locmemcache://auth')
+AUTH_CACHE['TIMEOUT'] = env.int('USER_CACHE_TTL', default=60)
+SESSION_ENGINE = env.str('SESSION_ENGINE', default='django.contrib.sessions.backends.cached_db')
+SESSION_CACHE_ALIAS = AUTH_CACHE_ALIAS
+
+# Корзины ограничения частоты запросов (core/throttling.py). С локальным кешем каждый процесс
+# считал бы лимиты отдельно, поэтому кеш должен быть общим (THROTTLE_CACHE_URL=redis://...),
+# иначе приложение не запустится (todolist/caches.py). Корзины можно вытеснять, поэтому для Redis
+# лучше отдельный сервер с allkeys-lru: в общем с noeviction после заполнения памяти запись корзин
+# завершалась бы ошибкой
+THROTTLE_CACHE_ALIAS = 'throttle'
+
+# Отозванные JWT (core/tokens.py) хранятся в отдельном общем кеше: записи не должны вытесняться,
+# иначе отозванные токены снова станут действительными. Для Redis нужна политика
+# maxmemory-policy noeviction (или volatile-ttl на отдельном сервере)
+JWT_REVOCATION_CACHE_ALIAS = 'jwt_revocations'
+JWT_REVOCATION_CACHE = env.cache('JWT_REVOCATION_CACHE_URL', default='locmemcache://jwt_revocations')
+if JWT_REVOCATION_CACHE['BACKEND'].rsplit('.', 1)[-1] in ('LocMemCache', 'FileBasedCache', 'DatabaseCache'):
+    # Записи удаляются только по истечении срока токена
+    JWT_REVOCATION_CACHE.setdefault('OPTIONS', {})['MAX_ENTRIES'] = 10 ** 9
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+    BOARD_CACHE_ALIAS: BOARD_CACHE,
+    METRICS_CACHE_ALIAS: env.cache('METRICS_CACHE_URL', default='locmemcache://metrics'),
+    AUTH_CACHE_ALIAS: AUTH_CACHE,
+    THROTTLE_CACHE_ALIAS: env.cache('THROTTLE_CACHE_URL', default='locmemcache://throttle'),
+    JWT_REVOCATION_CACHE_ALIAS: JWT_REVOCATION_CACHE,
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -148,11 +229,56 @@ STATIC_ROOT = BASE_DIR.joinpath('static')
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination'
+    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+        'core.authentication.JWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'todolist.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'todolist.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Число доверенных прокси перед приложением: адрес клиента для ограничений по IP берется
+    # из X-Forwarded-For на этой позиции с конца, подставленные клиентом значения игнорируются
+    'NUM_PROXIES': env.int('NUM_PROXIES', default=1),
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.ScopedUserThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'read': env.str('READ_THROTTLE_RATE', default='600/min'),
+        'write': env.str('WRITE_THROTTLE_RATE', default='120/min'),
+        'auth': env.str('AUTH_THROTTLE_RATE', default='30/min'),
+        'bot_verify': env.str('BOT_VERIFY_THROTTLE_RATE', default='10/min'),
+        'auth_ip': env.str('AUTH_IP_THROTTLE_RATE', default='20/min'),
+        'auth_username': env.str('AUTH_USERNAME_THROTTLE_RATE', default='5/min'),
+    },
 }
 
+# Хеширование паролей (core/hashing.py) выполняется в пуле из PASSWORD_HASH_WORKERS потоков.
+# Еще PASSWORD_HASH_QUEUE_SIZE операций могут ждать в очереди, остальные отклоняются с ответом 429
+# и заголовком Retry-After: PASSWORD_HASH_RETRY_AFTER секунд
+PASSWORD_HASH_WORKERS = env.int('PASSWORD_HASH_WORKERS', default=2)
+PASSWORD_HASH_QUEUE_SIZE = env.int('PASSWORD_HASH_QUEUE_SIZE', default=8)
+PASSWORD_HASH_RETRY_AFTER = env.int('PASSWORD_HASH_RETRY_AFTER', default=1)
+
+# JWT (core/tokens.py): ключи подписи задаются как JWT_SIGNING_KEYS=kid1=secret1,kid2=secret2.
+# Новые токены подписываются ключом JWT_ACTIVE_KEY, токены со старыми kid принимаются, пока ключ
+# остается в списке: для ротации добавьте новый ключ, сделайте его активным и удалите старый
+# через JWT_REFRESH_TTL. Список отозванных токенов хранится в JWT_REVOCATION_CACHE_ALIAS
+JWT_ALGORITHM = 'HS256'
+JWT_SIGNING_KEYS = env.dict('JWT_SIGNING_KEYS', default={}) or {'default': SECRET_KEY}
+JWT_ACTIVE_KEY = env.str('JWT_ACTIVE_KEY', default=next(iter(JWT_SIGNING_KEYS)))
+JWT_ACCESS_TTL = env.int('JWT_ACCESS_TTL', default=5 * 60)
+JWT_REFRESH_TTL = env.int('JWT_REFRESH_TTL', default=14 * 24 * 60 * 60)
+
 AUTHENTICATION_BACKENDS = [
-    'django.contrib.auth.backends.ModelBackend',
+    'core.backends.HashOffloadModelBackend',
     'social_core.backends.vk.VKOAuth2',
 ]
 
@@ -167,3 +293,10 @@ SOCIAL_AUTH_LOGIN_ERROR_URL = "/login-error/"
 SOCIAL_AUTH_USER_MODEL = 'core.User'
 
 BOT_TOKEN = env.str('BOT_TOKEN')
+# Адрес Bot API (можно указать локальный Bot API сервер или тестовую заглушку)
+TELEGRAM_API_URL = env.str('TELEGRAM_API_URL', default='https://api.telegram.org')
+# Бот (bot/runner.py) обрабатывает сообщения разных чатов параллельно в BOT_WORKERS потоках,
+# сообщения одного чата - по очереди. Получение обновлений приостанавливается,
+# пока в обработке больше BOT_MAX_PENDING сообщений
+BOT_WORKERS = env.int('BOT_WORKERS', default=8)
+BOT_MAX_PENDING = env.int('BOT_MAX_PENDING', default=100)
@@ -17,12 +17,15 @@ from django.contrib import admin
 from django.conf import settings
 from django.urls import path, include
 
+from todolist.views import DatabaseStatsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('oauth/', include('social_django.urls', namespace='social')),
     path('core/', include(('core.urls', 'core'), namespace="core")),
     path("goals/", include(('goals.urls', 'goals'), namespace="goals")),
     path("bot/", include(('bot.urls', 'bot'), namespace="bot")),
+    path('db_stats', DatabaseStatsView.as_view(), name='db_stats'),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,19 @@
+from typing import Any
+
+from django.conf import settings
+from rest_framework import generics, permissions
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from todolist.db.base import get_stats
+
+
+class DatabaseStatsView(generics.GenericAPIView):
+    """
+    Представление для отображения метрик соединений с базами данных: открытые соединения,
+    среднее время установки соединения, переподключения и неудачные проверки
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return Response({alias: get_stats(alias) for alias in settings.DATABASES})